@@ -0,0 +1,109 @@
+"""
+CLI script for measuring the authorization overhead of requests.
+
+the authorized GET endpoint is requested in-process (without the network)
+with the user resolved from the database on each request and with the
+cached user. the database and the cache must be available.
+
+Usage:
+    python -m scripts.benchmark_authorization --user-id 1
+    python -m scripts.benchmark_authorization --user-id 1 --requests 2000
+    python -m scripts.benchmark_authorization --user-id 1 --path /currencies
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+
+import httpx
+from fastapi import Depends
+from fastapi.security import HTTPAuthorizationCredentials
+
+from src import operational as op
+from src.domain import users
+from src.infrastructure import errors, security
+from src.main import app
+from src.operational.authentication import http_bearer
+
+
+async def _authorize_uncached(
+    creds: HTTPAuthorizationCredentials | None = Depends(http_bearer),
+) -> users.User:
+    """the previous behavior: the user is queried on each request."""
+
+    if creds is None:
+        raise errors.AuthenticationError(
+            "Authorization HTTP header is not specified"
+        )
+
+    payload = security.decode_token(creds.credentials)
+
+    return await op.user_retrieve(int(payload["sub"]))
+
+
+async def _measure(
+    client: httpx.AsyncClient, path: str, requests: int
+) -> float:
+    # warm up connections pools and the cache
+    await client.get(path)
+
+    started = time.perf_counter()
+    for _ in range(requests):
+        response = await client.get(path)
+        response.raise_for_status()
+
+    return (time.perf_counter() - started) / requests
+
+
+async def main() -> int:
+    parser = argparse.ArgumentParser(
+        description="Measure the authorization overhead of requests"
+    )
+    parser.add_argument(
+        "-u", "--user-id", type=int, required=True, help="Authorized user"
+    )
+    parser.add_argument(
+        "-p",
+        "--path",
+        default="/identity/users",
+        help="Authorized GET endpoint (default: /identity/users)",
+    )
+    parser.add_argument(
+        "-r",
+        "--requests",
+        type=int,
+        default=500,
+        help="Number of sequential requests (default: 500)",
+    )
+
+    args = parser.parse_args()
+    token = security.create_access_token(args.user_id)
+
+    async with httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=app),
+        base_url="http://benchmark",
+        headers={"Authorization": f"Bearer {token}"},
+    ) as client:
+        try:
+            app.dependency_overrides[op.authorize] = _authorize_uncached
+            uncached = await _measure(client, args.path, args.requests)
+
+            app.dependency_overrides.clear()
+            cached = await _measure(client, args.path, args.requests)
+        except Exception as e:
+            print(f"Error requesting {args.path}: {e}", file=sys.stderr)
+            return 1
+
+    print(f"\nGET {args.path}, {args.requests} requests")
+    print(f"  database  {uncached * 1e3:>8.3f}ms per request")
+    print(f"  cache     {cached * 1e3:>8.3f}ms per request")
+    print(f"  overhead  {(uncached - cached) * 1e3:>8.3f}ms saved")
+
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(asyncio.run(main()))
+else:
+    raise SystemExit("Sorry, this module can not be imported")
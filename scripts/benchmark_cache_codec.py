@@ -0,0 +1,127 @@
+"""
+CLI script for measuring the cache values encoding.
+
+the legacy ``str(dict)`` format is compared with the current codec
+on the typical cache payloads: notifications and analytics. payloads
+have no apostrophes since the legacy format can not decode them.
+
+Usage:
+    python -m scripts.benchmark_cache_codec
+    python -m scripts.benchmark_cache_codec --items 1000 --rounds 200
+"""
+
+import argparse
+import json
+import timeit
+from datetime import date, timedelta
+
+from src.config import settings
+from src.infrastructure.cache import codecs
+
+
+def _payloads(items: int) -> dict[str, dict]:
+    today = date.today()
+
+    return {
+        "notifications": {
+            "big_costs": [
+                {
+                    "message": f"Cost Dinner #{i} is 1200.00 UAH",
+                    "level": "info",
+                }
+                for i in range(items)
+            ],
+            "incomes": [],
+            "worker": [],
+        },
+        "analytics": {
+            "items": [
+                {
+                    "name": f"Subscription {i}",
+                    "value": 1000 + i,
+                    "period": 30,
+                    "occurrences": 12,
+                    "last_date": str(today - timedelta(days=i % 30)),
+                    "next_date": str(today + timedelta(days=i % 30)),
+                    "currency": {"id": 1, "name": "USD", "sign": "$"},
+                    "category": {"id": i % 10, "name": "Subscriptions"},
+                }
+                for i in range(items)
+            ]
+        },
+    }
+
+
+def _legacy_encode(value: dict) -> bytes:
+    return str(value).encode()
+
+
+def _legacy_decode(data: bytes) -> dict:
+    return json.loads(data.decode().replace("'", '"'))
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description="Measure the cache values encoding"
+    )
+    parser.add_argument(
+        "-i",
+        "--items",
+        type=int,
+        default=200,
+        help="Number of items in each payload (default: 200)",
+    )
+    parser.add_argument(
+        "-r",
+        "--rounds",
+        type=int,
+        default=500,
+        help="Number of encode/decode rounds (default: 500)",
+    )
+
+    args = parser.parse_args()
+    threshold = settings.cache.compression_threshold
+
+    for name, payload in _payloads(args.items).items():
+        print(f"\n{name}:")
+
+        legacy = _legacy_encode(payload)
+        encode = timeit.timeit(
+            lambda: _legacy_encode(payload), number=args.rounds
+        )
+        decode = timeit.timeit(
+            lambda: _legacy_decode(legacy), number=args.rounds
+        )
+        print(
+            f"  legacy       size={len(legacy):>8} "
+            f"encode={encode / args.rounds * 1e6:>9.1f}us "
+            f"decode={decode / args.rounds * 1e6:>9.1f}us"
+        )
+
+        for label, value in (
+            ("codec", len(legacy) + 1),
+            ("codec+zlib", 0),
+        ):
+            settings.cache.compression_threshold = value
+            data, flags = codecs.encode(payload)
+            encode = timeit.timeit(
+                lambda: codecs.encode(payload), number=args.rounds
+            )
+            decode = timeit.timeit(
+                lambda: codecs.decode(data, flags), number=args.rounds
+            )
+            print(
+                f"  {label:<12} size={len(data):>8} "
+                f"encode={encode / args.rounds * 1e6:>9.1f}us "
+                f"decode={decode / args.rounds * 1e6:>9.1f}us"
+            )
+
+        settings.cache.compression_threshold = threshold
+
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
+else:
+    raise SystemExit("Sorry, this module can not be imported")
@@ -0,0 +1,122 @@
+"""
+CLI script for measuring the login throughput under concurrent load.
+
+logins are performed in-process by the operational layer with the password
+verified in the event loop (the previous behavior) and in the hashing
+threads. the event loop lag shows how long other requests are stalled.
+the database and the user with the password must be available.
+
+Usage:
+    python -m scripts.benchmark_login --username john --password secret
+    python -m scripts.benchmark_login -u john -p secret --logins 100 -c 20
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+
+from src import operational as op
+from src.config import settings
+from src.infrastructure import security
+
+# seconds between the event loop lag probes
+LAG_PROBE_INTERVAL = 0.001
+
+
+async def _verify_inline(password: str, password_hash: str) -> bool:
+    return security.verify_password(password, password_hash)
+
+
+async def _lag_probe(lags: list[float]) -> None:
+    while True:
+        started = time.perf_counter()
+        await asyncio.sleep(LAG_PROBE_INTERVAL)
+        lags.append(time.perf_counter() - started - LAG_PROBE_INTERVAL)
+
+
+async def _measure(
+    username: str, password: str, logins: int, concurrency: int
+) -> tuple[float, float]:
+    """return logins per second and the max event loop lag."""
+
+    semaphore = asyncio.Semaphore(concurrency)
+    lags: list[float] = []
+
+    async def login() -> None:
+        async with semaphore:
+            await op.get_tokens_pair(username, password)
+
+    probe = asyncio.create_task(_lag_probe(lags))
+    started = time.perf_counter()
+    await asyncio.gather(*(login() for _ in range(logins)))
+    elapsed = time.perf_counter() - started
+    probe.cancel()
+
+    return logins / elapsed, max(lags, default=0.0)
+
+
+async def main() -> int:
+    parser = argparse.ArgumentParser(
+        description="Measure the login throughput under concurrent load"
+    )
+    parser.add_argument("-u", "--username", required=True, help="Username")
+    parser.add_argument("-p", "--password", required=True, help="Password")
+    parser.add_argument(
+        "-l",
+        "--logins",
+        type=int,
+        default=50,
+        help="Number of logins (default: 50)",
+    )
+    parser.add_argument(
+        "-c",
+        "--concurrency",
+        type=int,
+        default=10,
+        help="Number of concurrent logins (default: 10)",
+    )
+
+    args = parser.parse_args()
+    offloaded = security.verify_password_async
+
+    try:
+        # warm up the database connections pool
+        await op.get_tokens_pair(args.username, args.password)
+
+        setattr(security, "verify_password_async", _verify_inline)
+        inline = await _measure(
+            args.username, args.password, args.logins, args.concurrency
+        )
+
+        setattr(security, "verify_password_async", offloaded)
+        threads = await _measure(
+            args.username, args.password, args.logins, args.concurrency
+        )
+    except Exception as e:
+        print(f"Error logging in: {e}", file=sys.stderr)
+        return 1
+    finally:
+        security.shutdown_password_hashing()
+
+    print(
+        f"\n{args.logins} logins, {args.concurrency} concurrent, "
+        f"{settings.auth.hashing_workers} hashing threads"
+    )
+    for label, (throughput, lag) in (
+        ("event loop", inline),
+        ("threads", threads),
+    ):
+        print(
+            f"  {label:<12} {throughput:>8.1f} logins/s "
+            f"max_loop_lag={lag * 1e3:>8.1f}ms"
+        )
+    print(f"  {security.password_hashing_stats().model_dump()}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(asyncio.run(main()))
+else:
+    raise SystemExit("Sorry, this module can not be imported")
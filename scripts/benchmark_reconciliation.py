@@ -0,0 +1,137 @@
+"""
+CLI script for measuring the reconciliation of bank transactions.
+
+the bank transactions are matched with recorded costs by comparing all
+the pairs (the naive approach) and by the hash-bucket join that is used
+by the lookup of missing transactions. the data is generated.
+
+Usage:
+    python -m scripts.benchmark_reconciliation
+    python -m scripts.benchmark_reconciliation --transactions 10000
+"""
+
+import argparse
+import random
+import time
+from datetime import date, datetime, timedelta
+
+from src.domain.banks import (
+    TOLERANCE_DAYS,
+    BankTransaction,
+    CategorySuggestions,
+    LedgerEntry,
+    reconcile,
+)
+
+NAMES = ("Silpo", "ATB", "Uklon", "Aroma Kava", "Netflix", "Apteka")
+
+
+def _generate(
+    n: int, recorded: float
+) -> tuple[list[BankTransaction], list[LedgerEntry]]:
+    transactions: list[BankTransaction] = []
+    entries: list[LedgerEntry] = []
+    start = date(2025, 1, 1)
+
+    for index in range(n):
+        day = start + timedelta(days=random.randrange(365))
+        value = random.randrange(100, 500) * 100
+        name = random.choice(NAMES)
+        transactions.append(
+            BankTransaction(
+                id=str(index),
+                account_id="acc",
+                time=int(
+                    datetime.combine(day, datetime.min.time()).timestamp()
+                ),
+                amount=-value,
+                currency_code=980,
+                description=name,
+            )
+        )
+        if random.random() < recorded:
+            entries.append(
+                LedgerEntry(
+                    id=index,
+                    operation="cost",
+                    name=name.lower(),
+                    value=value,
+                    currency_id=1,
+                    timestamp=day + timedelta(days=random.randrange(3)),
+                    category_id=1,
+                )
+            )
+
+    return transactions, entries
+
+
+def _pairwise(
+    transactions: list[BankTransaction], entries: list[LedgerEntry]
+) -> int:
+    """the number of missing transactions. all the pairs are compared."""
+
+    matched: set[int] = set()
+    missing = 0
+
+    for item in transactions:
+        day = date.fromtimestamp(item.time)
+        for entry in entries:
+            if (
+                entry.id not in matched
+                and entry.value == -item.amount
+                and abs((entry.timestamp - day).days) <= TOLERANCE_DAYS
+            ):
+                matched.add(entry.id)
+                break
+        else:
+            missing += 1
+
+    return missing
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description="Measure the reconciliation of bank transactions"
+    )
+    parser.add_argument(
+        "-t",
+        "--transactions",
+        type=int,
+        default=5000,
+        help="Number of bank transactions (default: 5000)",
+    )
+    parser.add_argument(
+        "-r",
+        "--recorded",
+        type=float,
+        default=0.9,
+        help="Share of recorded transactions (default: 0.9)",
+    )
+
+    args = parser.parse_args()
+    transactions, entries = _generate(args.transactions, args.recorded)
+
+    started = time.perf_counter()
+    naive = _pairwise(transactions, entries)
+    pairwise = time.perf_counter() - started
+
+    started = time.perf_counter()
+    missing = reconcile(
+        transactions,
+        entries,
+        currencies={980: 1},
+        suggestions=CategorySuggestions(),
+    )
+    joined = time.perf_counter() - started
+
+    print(f"\n{len(transactions)} bank transactions, {len(entries)} recorded")
+    print(f"  pairwise     {pairwise * 1e3:>10.1f}ms missing={naive}")
+    print(f"  hash join    {joined * 1e3:>10.1f}ms missing={len(missing)}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
+else:
+    raise SystemExit("Sorry, this module can not be imported")
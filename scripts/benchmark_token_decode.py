@@ -0,0 +1,63 @@
+"""
+CLI script for measuring the access token decoding.
+
+the token is verified with ``jwt.decode`` on each call (the previous
+behavior) and with the verified claims cache of the worker.
+
+Usage:
+    python -m scripts.benchmark_token_decode
+    python -m scripts.benchmark_token_decode --rounds 100000
+"""
+
+import argparse
+import timeit
+
+import jwt
+
+from src.config import settings
+from src.infrastructure import security
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description="Measure the access token decoding"
+    )
+    parser.add_argument(
+        "-r",
+        "--rounds",
+        type=int,
+        default=20_000,
+        help="Number of decodes (default: 20000)",
+    )
+
+    args = parser.parse_args()
+    token = security.create_access_token(1, session=security.new_session_id())
+
+    verified = timeit.timeit(
+        lambda: jwt.decode(
+            token,
+            settings.auth.secret_key,
+            algorithms=[settings.auth.algorithm],
+        ),
+        number=args.rounds,
+    )
+    security.decode_token(token)
+    cached = timeit.timeit(
+        lambda: security.decode_token(token), number=args.rounds
+    )
+
+    print(f"\n{args.rounds} decodes of the same access token")
+    print(f"  jwt.decode  {verified / args.rounds * 1e6:>8.2f}us per call")
+    print(f"  cached      {cached / args.rounds * 1e6:>8.2f}us per call")
+    print(
+        f"  saved       {(verified - cached) / args.rounds * 1e6:>8.2f}us "
+        f"per call"
+    )
+
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
+else:
+    raise SystemExit("Sorry, this module can not be imported")
@@ -51,6 +51,7 @@ async def main() -> int:
         name=args.name,
         sign=args.sign,
         equity=args.equity,
+        opening_equity=args.equity,
     )
 
     try:
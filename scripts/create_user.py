@@ -27,8 +27,8 @@ async def main() -> int:
 
     args = parser.parse_args()
 
-    # Hash password with Argon2 (OWASP recommended)
-    password_hash = security.hash_password(args.password)
+    # Hash password with Argon2 (OWASP recommended) in the hashing threads
+    password_hash = await security.hash_password_async(args.password)
 
     # Create user
     user = database.User(name=args.username, password_hash=password_hash)
@@ -0,0 +1,69 @@
+"""
+CLI script for reconciling the equity with transactions.
+
+Usage:
+    python -m scripts.reconcile_equity
+    python -m scripts.reconcile_equity --chunk-size 5000
+    python -m scripts.reconcile_equity --fix
+"""
+
+import argparse
+import asyncio
+import sys
+
+from src import operational as op
+from src.domain import transactions
+
+
+async def main() -> int:
+    """Report the equity drift and optionally correct it."""
+    parser = argparse.ArgumentParser(
+        description="Reconcile the equity with all the transactions"
+    )
+    parser.add_argument(
+        "-c",
+        "--chunk-size",
+        type=int,
+        default=1000,
+        help="Number of transactions fetched at once (default: 1000)",
+    )
+    parser.add_argument(
+        "--fix",
+        action="store_true",
+        help="Correct the equity of drifted currencies",
+    )
+
+    args = parser.parse_args()
+
+    try:
+        items = await op.reconcile_equity(
+            fix=args.fix, chunk_size=args.chunk_size
+        )
+    except Exception as e:
+        print(f"Error reconciling equity: {e}", file=sys.stderr)
+        return 1
+
+    for item in items:
+        print(
+            f"\n{item.currency.name}: "
+            f"actual={transactions.pretty_money(item.actual)} "
+            f"expected={transactions.pretty_money(item.expected)} "
+            f"difference={transactions.pretty_money(item.difference)}"
+        )
+
+    drifted = sum(1 for item in items if item.difference)
+    if not drifted:
+        print("\nEquity is consistent")
+    elif args.fix:
+        print(f"\nEquity is corrected for {drifted} currencies")
+    else:
+        print(f"\nEquity drift is found for {drifted} currencies")
+        return 2
+
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(asyncio.run(main()))
+else:
+    raise SystemExit("Sorry, this module can not be imported")
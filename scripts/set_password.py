@@ -29,8 +29,8 @@ async def main() -> int:
     args = parser.parse_args()
 
     try:
-        # Hash password with Argon2
-        password_hash = security.hash_password(args.password)
+        # Hash password with Argon2 in the hashing threads
+        password_hash = await security.hash_password_async(args.password)
 
         # Update user password
         async with database.transaction() as session:
@@ -14,6 +14,8 @@ HOW TO WORK WITH SETTIGNS?
 
 __all__ = ("settings",)
 
+from typing import Literal
+
 from pydantic import BaseModel
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
@@ -25,6 +27,9 @@ class DatabaseSettings(BaseModel):
     user: str = "postgres"
     password: str = "postgres"
     name: str = "family_budget"
+    # extra connections that concurrent queries of the worker hold at once.
+    # the rest of the pool (5 connections and 10 overflow) serves requests
+    concurrent_connections: int = 4
 
     @property
     def url(self) -> str:
@@ -47,10 +52,49 @@ class DatabaseSettings(BaseModel):
         )
 
 
+class LocalCacheSettings(BaseModel):
+    """the in-process cache of each worker in front of ``memcached``."""
+
+    max_entries: int = 1024
+    max_bytes: int = 8 * 1024 * 1024
+    # namespace -> TTL in seconds. other namespaces skip the local cache.
+    # other workers do not know about changes, so TTLs must be short
+    policies: dict[str, int] = {"fambb_analytics": 5, "fambb_equity": 1}
+
+
+class MemoryCacheSettings(BaseModel):
+    """the in-process storage that replaces ``memcached``."""
+
+    max_entries: int = 100_000
+    max_bytes: int = 64 * 1024 * 1024
+
+
 class CacheSettings(BaseModel):
+    # 'memory' is for single-worker deployments without ``memcached``
+    backend: Literal["memcached", "memory"] = "memcached"
     host: str = "cache"
     port: int = 11211
     pool: int = 2
+    # values that are greater (in bytes) are compressed
+    compression_threshold: int = 1024
+    # seconds the expired value is served while one worker recomputes it
+    stale_ttl: int = 300
+    # seconds the worker is allowed to recompute the value alone
+    lease_ttl: int = 30
+    # seconds between logging the cache metrics
+    metrics_interval: int = 300
+    local: LocalCacheSettings = LocalCacheSettings()
+    memory: MemoryCacheSettings = MemoryCacheSettings()
+
+
+class EquitySettings(BaseModel):
+    # seconds between folding the equity ledger into the checkpoint
+    compaction_interval: int = 60
+    # seconds between comparing the cached equity with the database
+    cache_check_interval: int = 300
+    # ids of users that may apply the reconciliation correction.
+    # nobody by default. the report is available for everyone
+    correction_user_ids: list[int] = []
 
 
 class CORSSettings(BaseModel):
@@ -77,6 +121,27 @@ class LoggingSettings(BaseModel):
 
 class MonobankSettings(BaseModel):
     webhook_secret: str = "webhook"
+    # seconds. statements of busy accounts take longer than the connection
+    connect_timeout: float = 5
+    read_timeout: float = 30
+    # connections of the shared client, kept alive between requests
+    max_connections: int = 10
+    max_keepalive_connections: int = 5
+    keepalive_expiry: float = 60
+    # repeated requests on 429, 5xx and network errors. the delay is
+    # ``retry_backoff * 2 ** attempt`` seconds unless the API tells it
+    retries: int = 3
+    retry_backoff: float = 0.5
+    # statement requests per second of the API key and the burst.
+    # Monobank allows 1 request in 60 seconds
+    statement_rate: float = 1 / 60
+    statement_burst: int = 1
+    # seconds before the sync watermark that are imported again,
+    # since the bank may post transactions with delay
+    sync_overlap: int = 24 * 60 * 60
+    # seconds the list of user accounts is cached. the client info
+    # is limited by Monobank as well (1 request in 60 seconds)
+    accounts_cache_ttl: int = 60 * 60
 
 
 class AuthSettings(BaseModel):
@@ -84,6 +149,21 @@ class AuthSettings(BaseModel):
     algorithm: str = "HS256"
     access_token_expire_minutes: int = 15
     refresh_token_expire_days: int = 7
+    # threads that hash and verify passwords. each Argon2 call takes
+    # about 64MB of memory, so the number is kept small
+    hashing_workers: int = 2
+    # hashing calls that are submitted to threads at once. others wait
+    # in the event loop, so they could be cancelled
+    hashing_concurrency: int = 2
+    # seconds between reads of the revoked sessions log by the worker.
+    # sessions revoked by other workers are accepted within that time
+    revocation_sync_interval: int = 5
+    # revoked sessions that the in-memory filter keeps with 1% of
+    # false positives. it takes about 120KB
+    revocation_filter_capacity: int = 100_000
+    # verified tokens whose claims are kept by the worker until ``exp``.
+    # 0 disables it
+    claims_cache_size: int = 4096
 
 
 class RateLimitSettings(BaseModel):
@@ -104,6 +184,7 @@ class Settings(BaseSettings):
     cors: CORSSettings = CORSSettings()
     database: DatabaseSettings = DatabaseSettings()
     cache: CacheSettings = CacheSettings()
+    equity: EquitySettings = EquitySettings()
 
     monobank: MonobankSettings = MonobankSettings()
     auth: AuthSettings = AuthSettings()
@@ -1 +1 @@
-from . import equity, notifications, transactions, users
+from . import banks, equity, notifications, transactions, users
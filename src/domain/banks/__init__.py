@@ -0,0 +1,31 @@
+"""
+this package encapsulates transactions that are imported from banks.
+
+bank statements are stored locally with the sync watermark of each
+account, so the bank is requested only for the range that is not
+imported yet. the reconciliation finds bank transactions that are not
+recorded as costs or incomes. the next tables are used:
+- bank_transactions
+- bank_account_syncs
+"""
+
+__all__ = (
+    "AccountSync",
+    "BankRepository",
+    "BankTransaction",
+    "CategorySuggestions",
+    "LedgerEntry",
+    "MissingTransaction",
+    "TOLERANCE_DAYS",
+    "reconcile",
+)
+
+from .entities import AccountSync, BankTransaction
+from .reconciliation import (
+    TOLERANCE_DAYS,
+    CategorySuggestions,
+    LedgerEntry,
+    MissingTransaction,
+    reconcile,
+)
+from .repository import BankRepository
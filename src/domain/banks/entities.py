@@ -0,0 +1,92 @@
+import functools
+
+from src.infrastructure import InternalData, database
+from src.integrations import monobank
+
+
+class BankTransaction(InternalData):
+    """the transaction from the bank statement.
+
+    ``amount`` is negative for costs. in CENTS of the operation currency.
+    """
+
+    id: str
+    account_id: str
+    time: int
+    amount: int
+    currency_code: int
+    description: str | None = None
+
+    @functools.singledispatchmethod
+    @classmethod
+    def from_instance(cls, instance, **_) -> "BankTransaction":
+        raise NotImplementedError(
+            f"Can not get {cls.__name__} from {type(instance)} type"
+        )
+
+    @from_instance.register
+    @classmethod
+    def _(cls, instance: database.BankTransaction, **_):
+        return cls.model_validate(instance)
+
+    @from_instance.register
+    @classmethod
+    def _(cls, instance: monobank.Transaction, *, account_id: str):
+        return cls(
+            id=instance.id,
+            account_id=account_id,
+            time=instance.time,
+            # the account currency amount is used only for the operation
+            # in the account currency
+            amount=(
+                instance.operation_amount
+                if instance.operation_amount is not None
+                else instance.amount
+            ),
+            currency_code=instance.currency_code,
+            description=(
+                instance.description[:255] if instance.description else None
+            ),
+        )
+
+
+class AccountSync(InternalData):
+    """transactions of the account are imported for the whole range
+    between ``synced_from`` and ``synced_until`` (unix timestamps).
+    """
+
+    account_id: str
+    synced_from: int
+    synced_until: int
+
+    def missing(
+        self, start: int, end: int, overlap: int = 0
+    ) -> list[tuple[int, int]]:
+        """ranges to import, so the account covers ``start..end``.
+
+        ARGS
+            ``overlap`` - seconds before ``synced_until`` that are fetched
+                again, since the bank may post transactions with delay
+
+        NOTES
+            ranges adjoin the imported one, so it stays continuous
+        """
+
+        ranges: list[tuple[int, int]] = []
+
+        if start < self.synced_from:
+            ranges.append((start, self.synced_from))
+        if end > self.synced_until:
+            ranges.append(
+                (max(self.synced_until - overlap, self.synced_from), end)
+            )
+
+        return ranges
+
+    def extended(self, start: int, end: int) -> "AccountSync":
+        return self.model_copy(
+            update={
+                "synced_from": min(self.synced_from, start),
+                "synced_until": max(self.synced_until, end),
+            }
+        )
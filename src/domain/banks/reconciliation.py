@@ -0,0 +1,215 @@
+"""
+the reconciliation matches bank transactions with costs and incomes.
+
+MATCHING
+    transactions are matched by the exact value, the currency and the date
+    within the tolerance. the hash-bucket join is used: costs and incomes
+    are grouped by ``(operation, currency, value)`` and sorted by date, so
+    candidates of the bank transaction are found by the binary search.
+    candidates are ranked by the date distance, then by the similarity of
+    names. each transaction is matched once.
+
+    so the reconciliation takes O(n log n) instead of comparing all pairs.
+
+SUGGESTIONS
+    the category of the missing cost is suggested by words of its
+    description. words are learned from names of previous costs and from
+    descriptions of matched bank transactions, which are usually the
+    same for the same shop.
+"""
+
+import bisect
+import re
+from collections import Counter, defaultdict
+from collections.abc import Iterable, Mapping
+from datetime import date
+from difflib import SequenceMatcher
+from typing import Final, Literal
+
+from src.infrastructure import InternalData
+
+from .entities import BankTransaction
+
+# days between the bank transaction and the recorded one
+TOLERANCE_DAYS: Final = 3
+
+_WORD: Final = re.compile(r"\w{3,}")
+
+
+class LedgerEntry(InternalData):
+    """the cost or the income that is recorded by the user."""
+
+    id: int
+    operation: Literal["cost", "income"]
+    name: str
+    value: int
+    currency_id: int
+    timestamp: date
+    category_id: int | None = None
+
+
+class MissingTransaction(InternalData):
+    """the bank transaction that is not recorded.
+
+    ``value`` is positive. in CENTS. ``currency_id`` is ``None`` if the
+    currency is not registered.
+    """
+
+    id: str
+    operation: Literal["cost", "income"]
+    name: str
+    value: int
+    currency_id: int | None
+    timestamp: date
+    suggested_category_id: int | None = None
+
+
+def _words(text: str) -> list[str]:
+    return _WORD.findall(text.lower())
+
+
+def _similarity(left: str, right: str) -> float:
+    return SequenceMatcher(None, left.lower(), right.lower()).ratio()
+
+
+class CategorySuggestions:
+    """cost categories by words of names."""
+
+    def __init__(self) -> None:
+        self._words: defaultdict[str, Counter[int]] = defaultdict(Counter)
+
+    def learn(self, text: str, category_id: int, weight: int = 1) -> None:
+        for word in _words(text):
+            self._words[word][category_id] += weight
+
+    def suggest(self, text: str) -> int | None:
+        scores: defaultdict[int, float] = defaultdict(float)
+        for word in _words(text):
+            if (categories := self._words.get(word)) is not None:
+                # frequent words (like 'payment') matter less
+                total = categories.total()
+                for category_id, count in categories.items():
+                    scores[category_id] += count / total
+
+        if not scores:
+            return None
+
+        return max(scores, key=scores.__getitem__)
+
+
+class _Bucket:
+    """ledger entries with the same operation, currency and value."""
+
+    def __init__(self) -> None:
+        self.entries: list[LedgerEntry] = []
+        self.days: list[int] = []
+        self.matched: set[int] = set()
+
+    def sort(self) -> None:
+        self.entries.sort(key=lambda entry: entry.timestamp)
+        self.days = [entry.timestamp.toordinal() for entry in self.entries]
+
+    def match(self, day: int, name: str, tolerance: int) -> LedgerEntry | None:
+        """the closest entry that is not matched yet."""
+
+        best: tuple[int, float, int] | None = None
+        lower = bisect.bisect_left(self.days, day - tolerance)
+        upper = bisect.bisect_right(self.days, day + tolerance)
+
+        for index in range(lower, upper):
+            if index in self.matched:
+                continue
+
+            rank = (
+                abs(self.days[index] - day),
+                -_similarity(self.entries[index].name, name),
+                index,
+            )
+            if best is None or rank < best:
+                best = rank
+
+        if best is None:
+            return None
+
+        self.matched.add(best[2])
+        return self.entries[best[2]]
+
+
+def _buckets(
+    entries: Iterable[LedgerEntry],
+) -> dict[tuple[str, int, int], _Bucket]:
+    buckets: defaultdict[tuple[str, int, int], _Bucket] = defaultdict(_Bucket)
+    for entry in entries:
+        buckets[
+            entry.operation, entry.currency_id, entry.value
+        ].entries.append(entry)
+
+    for bucket in buckets.values():
+        bucket.sort()
+
+    return buckets
+
+
+def reconcile(
+    transactions: Iterable[BankTransaction],
+    entries: Iterable[LedgerEntry],
+    currencies: Mapping[int, int],
+    suggestions: CategorySuggestions,
+    tolerance: int = TOLERANCE_DAYS,
+) -> list[MissingTransaction]:
+    """bank transactions that are not recorded, from the oldest.
+
+    ARGS
+        ``currencies`` - currency ids by ISO 4217 codes
+        ``tolerance`` - days between the bank and the recorded date
+
+    NOTES
+        bank transactions are matched from the oldest, so the earlier
+        transaction takes the earlier entry of the same value.
+    """
+
+    buckets = _buckets(entries)
+    missing: list[MissingTransaction] = []
+
+    for item in sorted(transactions, key=lambda item: item.time):
+        if item.amount == 0:
+            continue
+
+        operation: Literal["cost", "income"] = (
+            "cost" if item.amount < 0 else "income"
+        )
+        currency_id = currencies.get(item.currency_code)
+        timestamp = date.fromtimestamp(item.time)
+        name = item.description or ""
+
+        bucket = (
+            buckets.get((operation, currency_id, abs(item.amount)))
+            if currency_id is not None
+            else None
+        )
+        if bucket is not None and (
+            entry := bucket.match(timestamp.toordinal(), name, tolerance)
+        ):
+            if entry.category_id is not None:
+                # the bank names the shop the same way each time
+                suggestions.learn(name, entry.category_id, weight=10)
+            continue
+
+        missing.append(
+            MissingTransaction(
+                id=item.id,
+                operation=operation,
+                name=name,
+                value=abs(item.amount),
+                currency_id=currency_id,
+                timestamp=timestamp,
+            )
+        )
+
+    for candidate in missing:
+        if candidate.operation == "cost":
+            candidate.suggested_category_id = suggestions.suggest(
+                candidate.name
+            )
+
+    return missing
@@ -0,0 +1,171 @@
+from collections.abc import Iterable
+from datetime import date
+from itertools import batched
+from typing import Final
+
+from sqlalchemy import Result, String, func, literal, select, union_all
+from sqlalchemy.dialects.postgresql import insert
+
+from src.infrastructure import database
+
+from .entities import AccountSync, BankTransaction
+from .reconciliation import LedgerEntry
+
+# rows of the single insert. each row takes 7 of 32767 query parameters
+_INSERT_BATCH_SIZE: Final = 1000
+
+
+class BankRepository(database.Repository):
+    async def account_syncs(self, user_id: int) -> dict[str, AccountSync]:
+        """sync watermarks of user accounts by account ids."""
+
+        async with self.query.session as session:
+            async with session.begin():
+                results: Result = await session.execute(
+                    select(database.BankAccountSync).where(
+                        database.BankAccountSync.user_id == user_id
+                    )
+                )
+
+        return {
+            item.account_id: AccountSync.model_validate(item)
+            for item in results.scalars()
+        }
+
+    async def save_account_sync(self, user_id: int, sync: AccountSync) -> None:
+        query = insert(database.BankAccountSync).values(
+            user_id=user_id, **sync.model_dump()
+        )
+
+        await self.command.session.execute(
+            query.on_conflict_do_update(
+                index_elements=[database.BankAccountSync.account_id],
+                set_={
+                    "synced_from": query.excluded.synced_from,
+                    "synced_until": query.excluded.synced_until,
+                },
+            )
+        )
+
+    async def save_transactions(
+        self, user_id: int, items: Iterable[BankTransaction]
+    ) -> None:
+        """insert transactions by batches.
+
+        NOTES
+            the bank may update the transaction (the hold is settled),
+            so the existing one is overwritten.
+        """
+
+        for batch in batched(items, _INSERT_BATCH_SIZE):
+            query = insert(database.BankTransaction).values(
+                [{**item.model_dump(), "user_id": user_id} for item in batch]
+            )
+            await self.command.session.execute(
+                query.on_conflict_do_update(
+                    index_elements=[database.BankTransaction.id],
+                    set_={
+                        "time": query.excluded.time,
+                        "amount": query.excluded.amount,
+                        "currency_code": query.excluded.currency_code,
+                        "description": query.excluded.description,
+                    },
+                )
+            )
+
+    async def transactions(
+        self, user_id: int, start: int, end: int
+    ) -> list[BankTransaction]:
+        """imported transactions of the user in ``start..end``."""
+
+        async with self.query.session as session:
+            async with session.begin():
+                results: Result = await session.execute(
+                    select(database.BankTransaction)
+                    .where(
+                        database.BankTransaction.user_id == user_id,
+                        database.BankTransaction.time >= start,
+                        database.BankTransaction.time < end,
+                    )
+                    .order_by(database.BankTransaction.time)
+                )
+
+        return [
+            BankTransaction.from_instance(item) for item in results.scalars()
+        ]
+
+    # ==================================================
+    # reconciliation section
+    # ==================================================
+    async def ledger(
+        self, user_id: int, start: date, end: date
+    ) -> list[LedgerEntry]:
+        """costs and incomes of the user in ``start..end`` inclusive."""
+
+        costs = select(
+            database.Cost.id.label("id"),
+            literal("cost", String).label("operation"),
+            database.Cost.name.label("name"),
+            database.Cost.value.label("value"),
+            database.Cost.currency_id.label("currency_id"),
+            database.Cost.timestamp.label("timestamp"),
+            database.Cost.category_id.label("category_id"),
+        ).where(
+            database.Cost.user_id == user_id,
+            database.Cost.timestamp.between(start, end),
+        )
+        incomes = select(
+            database.Income.id,
+            literal("income", String),
+            database.Income.name,
+            database.Income.value,
+            database.Income.currency_id,
+            database.Income.timestamp,
+            literal(None).label("category_id"),
+        ).where(
+            database.Income.user_id == user_id,
+            database.Income.timestamp.between(start, end),
+        )
+
+        async with self.query.session as session:
+            async with session.begin():
+                results: Result = await session.execute(
+                    union_all(costs, incomes)
+                )
+
+        return [LedgerEntry.model_validate(row) for row in results.mappings()]
+
+    async def cost_names(
+        self, user_id: int, since: date
+    ) -> list[tuple[str, int, int]]:
+        """names of costs with categories and the number of costs."""
+
+        async with self.query.session as session:
+            async with session.begin():
+                results: Result = await session.execute(
+                    select(
+                        database.Cost.name,
+                        database.Cost.category_id,
+                        func.count(),
+                    )
+                    .where(
+                        database.Cost.user_id == user_id,
+                        database.Cost.timestamp >= since,
+                    )
+                    .group_by(database.Cost.name, database.Cost.category_id)
+                )
+
+        return [
+            (name, category_id, count) for name, category_id, count in results
+        ]
+
+    async def currency_ids(self) -> dict[str, int]:
+        """currency ids by names."""
+
+        async with self.query.session as session:
+            async with session.begin():
+                results: Result = await session.execute(
+                    select(database.Currency.name, database.Currency.id)
+                )
+
+        return {name: id_ for name, id_ in results}
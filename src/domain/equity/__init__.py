@@ -8,8 +8,9 @@ related to the family 'equity'.
 __all__ = (
     "Currency",
     "Equity",
+    "EquityDrift",
     "EquityRepository",
 )
 
-from .entities import Currency, Equity
+from .entities import Currency, Equity, EquityDrift
 from .repository import EquityRepository
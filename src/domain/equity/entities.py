@@ -33,5 +33,22 @@ class Currency(InternalData):
 
 
 class Equity(Currency):
+    """The currency with the equity in CENTS."""
 
-    equity: float
+    equity: int
+
+
+class EquityDrift(InternalData):
+    """The difference between the stored equity and the equity
+    that is expected from all the transactions.
+
+    ``expected`` = opening equity + incomes - costs +/- exchanges
+    """
+
+    currency: Currency
+    actual: int
+    expected: int
+
+    @property
+    def difference(self) -> int:
+        return self.expected - self.actual
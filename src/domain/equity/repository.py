@@ -1,22 +1,62 @@
-from sqlalchemy import Result, desc, select, update
+from collections.abc import Mapping
+
+from sqlalchemy import Result, delete, desc, func, insert, select, text, update
+from sqlalchemy.orm.attributes import set_committed_value
 
 from src.infrastructure import database
 
+from .entities import Currency, EquityDrift
+
 
 class EquityRepository(database.Repository):
+    """the equity is represented by 2 parts.
+
+    - ``currencies.equity`` is a checkpoint
+    - ``equity_changes`` rows are pending deltas that are not folded yet
+
+    so the actual equity is 'checkpoint + pending deltas'. writes only
+    append rows to the ledger, so they never wait for the currency row lock.
+    """
+
+    @staticmethod
+    def _with_pending_changes():
+        """select currencies with the sum of pending equity changes."""
+
+        pending = (
+            select(
+                database.EquityChange.currency_id.label("currency_id"),
+                func.sum(database.EquityChange.delta).label("delta"),
+            )
+            .group_by(database.EquityChange.currency_id)
+            .subquery()
+        )
+
+        return select(
+            database.Currency, func.coalesce(pending.c.delta, 0)
+        ).outerjoin(pending, pending.c.currency_id == database.Currency.id)
+
+    @staticmethod
+    def _apply_pending_changes(
+        currency: database.Currency, delta: int
+    ) -> database.Currency:
+        """represent the actual equity without marking the instance dirty."""
+
+        set_committed_value(currency, "equity", currency.equity + delta)
+        return currency
+
     async def currency(self, id_: int) -> database.Currency:
         """search by ``id``."""
 
         async with self.query.session as session:
             async with session.begin():
                 results: Result = await session.execute(
-                    select(database.Currency).where(
+                    self._with_pending_changes().where(
                         database.Currency.id == id_
                     )
                 )
-                item: database.Currency = results.scalars().one()
+                item, delta = results.one()
 
-        return item
+        return self._apply_pending_changes(item, delta)
 
     async def currencies(self) -> tuple[database.Currency, ...]:
         """select everything from 'currencies' table."""
@@ -24,12 +64,53 @@ class EquityRepository(database.Repository):
         async with self.query.session as session:
             async with session.begin():
                 result: Result = await session.execute(
-                    select(database.Currency).order_by(
+                    self._with_pending_changes().order_by(
                         desc(database.Currency.id)
                     )
                 )
 
-        return tuple(result.scalars().all())
+        return tuple(
+            self._apply_pending_changes(item, delta)
+            for item, delta in result.all()
+        )
+
+    async def versioned_currencies(
+        self,
+    ) -> tuple[int, tuple[database.Currency, ...]]:
+        """select everything from 'currencies' table with the version.
+
+        notes:
+            the version is the ``xmax`` of the transaction snapshot. it never
+            decreases, so the greater version includes all the changes
+            that are visible for the smaller one.
+        """
+
+        async with self.query.session as session:
+            async with session.begin():
+                await session.execute(
+                    text(
+                        "SET TRANSACTION ISOLATION LEVEL REPEATABLE READ "
+                        "READ ONLY"
+                    )
+                )
+                version: int = (
+                    await session.execute(
+                        text(
+                            "SELECT pg_snapshot_xmax(pg_current_snapshot())"
+                            "::text::bigint"
+                        )
+                    )
+                ).scalar_one()
+                result: Result = await session.execute(
+                    self._with_pending_changes().order_by(
+                        desc(database.Currency.id)
+                    )
+                )
+
+        return version, tuple(
+            self._apply_pending_changes(item, delta)
+            for item, delta in result.all()
+        )
 
     async def add_currency(
         self, candidate: database.Currency
@@ -39,26 +120,157 @@ class EquityRepository(database.Repository):
         self.command.session.add(candidate)
         return candidate
 
-    async def decrease_equity(self, currency_id: int, value: int) -> None:
-        """decrease the equity for a currency."""
+    async def apply_equity_deltas(self, deltas: Mapping[int, int]) -> None:
+        """apply equity changes for many currencies with a single statement.
 
-        query = (
-            update(database.Currency)
-            .where(database.Currency.id == currency_id)
-            .values({"equity": database.Currency.equity - value})
-            .returning(database.Currency)
+        params:
+            ``deltas`` - currency id -> delta in CENTS. negative decreases
+
+        notes:
+            rows are inserted by one multi-row INSERT statement in
+            the currency id order, so multi-currency operations take
+            a single round trip and always lock in the same order.
+            zero deltas are skipped.
+        """
+
+        if not (
+            values := [
+                {"currency_id": currency_id, "delta": delta}
+                for currency_id, delta in sorted(deltas.items())
+                if delta
+            ]
+        ):
+            return None
+
+        await self.command.session.execute(
+            insert(database.EquityChange).values(values)
         )
 
-        await self.command.session.execute(query)
+    async def decrease_equity(self, currency_id: int, value: int) -> None:
+        """decrease the equity for a currency."""
+
+        await self.apply_equity_deltas({currency_id: -value})
 
     async def increase_equity(self, currency_id: int, value: int) -> None:
         """increase the equity for a currency."""
 
+        await self.apply_equity_deltas({currency_id: value})
+
+    async def compact_equity_changes(self) -> int:
+        """fold pending equity changes into the currencies checkpoint.
+
+        notes:
+            rows are deleted and added to the checkpoint by the single
+            statement, so readers never see the change twice or lose it.
+            concurrent compactions are safe since the deleted row can
+            be folded only once.
+
+        returns:
+            the number of currencies that are updated.
+        """
+
+        folded = (
+            delete(database.EquityChange)
+            .returning(
+                database.EquityChange.currency_id,
+                database.EquityChange.delta,
+            )
+            .cte("folded")
+        )
+        totals = (
+            select(
+                folded.c.currency_id,
+                func.sum(folded.c.delta).label("delta"),
+            )
+            .group_by(folded.c.currency_id)
+            .cte("totals")
+        )
         query = (
             update(database.Currency)
-            .where(database.Currency.id == currency_id)
-            .values({"equity": database.Currency.equity + value})
-            .returning(database.Currency)
+            .where(database.Currency.id == totals.c.currency_id)
+            .values({"equity": database.Currency.equity + totals.c.delta})
+            .returning(database.Currency.id)
+            .execution_options(synchronize_session=False)
         )
 
-        await self.command.session.execute(query)
+        result: Result = await self.command.session.execute(query)
+
+        return len(result.all())
+
+    async def equity_reconciliation(
+        self, chunk_size: int = 1000
+    ) -> tuple[EquityDrift, ...]:
+        """compare the equity with the one expected from all transactions.
+
+        workflow:
+            open the REPEATABLE READ transaction so the equity and all
+                the transactions are read from the same snapshot
+            start from the ``opening_equity`` of each currency
+            stream costs, incomes and exchanges by keyset-ordered chunks
+                and apply them to the expected equity
+
+        notes:
+            only one chunk is kept in memory at any moment.
+        """
+
+        async with self.query.session as session:
+            async with session.begin():
+                await session.execute(
+                    text(
+                        "SET TRANSACTION ISOLATION LEVEL REPEATABLE READ "
+                        "READ ONLY"
+                    )
+                )
+
+                currencies: dict[int, database.Currency] = {
+                    item.id: self._apply_pending_changes(item, delta)
+                    for item, delta in (
+                        await session.execute(
+                            self._with_pending_changes().order_by(
+                                database.Currency.id
+                            )
+                        )
+                    ).all()
+                }
+                expected: dict[int, int] = {
+                    id_: item.opening_equity
+                    for id_, item in currencies.items()
+                }
+
+                for table, sign in (
+                    (database.Cost, -1),
+                    (database.Income, 1),
+                ):
+                    async for rows in self._keyset_chunks(
+                        session,
+                        select(table.id, table.currency_id, table.value),
+                        key=table.id,
+                        chunk_size=chunk_size,
+                    ):
+                        for _, currency_id, value in rows:
+                            expected[currency_id] += sign * value
+
+                async for rows in self._keyset_chunks(
+                    session,
+                    select(
+                        database.Exchange.id,
+                        database.Exchange.from_currency_id,
+                        database.Exchange.from_value,
+                        database.Exchange.to_currency_id,
+                        database.Exchange.to_value,
+                    ),
+                    key=database.Exchange.id,
+                    chunk_size=chunk_size,
+                ):
+                    for _, from_id, from_value, to_id, to_value in rows:
+                        expected[from_id] -= from_value
+                        expected[to_id] += to_value
+
+        return tuple(
+            EquityDrift(
+                currency=Currency.from_instance(item),
+                actual=item.equity,
+                expected=expected[id_],
+            )
+            for id_, item in currencies.items()
+        )
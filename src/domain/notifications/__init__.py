@@ -9,8 +9,14 @@ FEATURES
 - news, suggestions forming using LLM
 """
 
-__all__ = ("Notification", "Notifications", "notify")
+__all__ = (
+    "Notification",
+    "Notifications",
+    "notify",
+    "notify_many",
+    "pop_notifications",
+)
 
 
 from .entities import Notification, Notifications
-from .services import notify
+from .services import notify, notify_many, pop_notifications
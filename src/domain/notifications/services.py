@@ -1,15 +1,88 @@
-from typing import Literal
+"""
+notifications are stored in the cache with a key per notification.
+
+KEYS LAYOUT
+    ``{user_id}:{topic}:seq`` - the counter of the topic notifications
+    ``{user_id}:{topic}:cursor`` - the last counter value that is read
+    ``{user_id}:{topic}:{n}`` - the notification number ``n``
+
+the writer takes the next number with the atomic ``incr`` and creates
+the notification key with ``add``, so concurrent notifications never
+overwrite each other. the reader consumes keys with ``delete`` that is
+also atomic, so each notification is returned only once.
+
+the counter does not expire, since notifications are numbered after it.
+if it is lost anyway (evicted) the cursor is reset with it.
+"""
+
+from collections.abc import Iterable
+from typing import Final, Literal
 
 from src.infrastructure import Cache, errors
 
 from .entities import Notification, Notifications
 
+NOTIFICATIONS_CACHE_NAMESPACE: Final = "fambb_notifications"
 
-async def notify(
-    user_id: int,
-    topic: Literal["big_costs", "incomes", "worker"],
+# only the most recent notifications of each topic are returned
+NOTIFICATIONS_LIMIT: Final = 50
+
+# unread notifications expire after a week
+NOTIFICATIONS_TTL: Final = 7 * 24 * 60 * 60
+
+# the writer takes the next number if the reader has skipped the current one
+_APPEND_ATTEMPTS: Final = 3
+
+_Topic = Literal["big_costs", "incomes", "worker"]
+
+
+def _key(user_id: int, topic: str, suffix: str | int) -> str:
+    return f"{user_id}:{topic}:{suffix}"
+
+
+async def _append_many(
+    cache: Cache, user_ids: Iterable[int], topic: str, value: dict
+) -> None:
+    """add the value with the next number of each user."""
+
+    pending = list(dict.fromkeys(user_ids))
+
+    for _ in range(_APPEND_ATTEMPTS):
+        if not pending:
+            return None
+
+        numbers: dict[str, int] = await cache.incr_many(
+            NOTIFICATIONS_CACHE_NAMESPACE,
+            [_key(user_id, topic, "seq") for user_id in pending],
+        )
+        keys = {
+            _key(user_id, topic, numbers[_key(user_id, topic, "seq")]): user_id
+            for user_id in pending
+        }
+        added = await cache.add_many(
+            NOTIFICATIONS_CACHE_NAMESPACE,
+            dict.fromkeys(keys, value),
+            ttl=NOTIFICATIONS_TTL,
+        )
+
+        # the number is skipped by the reader. the next one is taken
+        pending = [keys[key] for key in keys.keys() - added]
+
+    if pending:
+        raise errors.BaseError(message="the notification can not be saved")
+
+
+async def notify_many(
+    user_ids: Iterable[int],
+    topic: _Topic,
     notification: Notification,
 ):
+    """add the notification for many users.
+
+    notes:
+        counters of all the users are increased with a single request
+        and notifications are created with another one.
+    """
 
     if topic not in Notifications.model_fields.keys():
         raise errors.BaseError(
@@ -17,21 +90,99 @@ async def notify(
         )
 
     async with Cache() as cache:
-        try:
-            results: dict = await cache.get(
-                namespace="fambb_notifications", key=str(user_id)
+        await _append_many(cache, user_ids, topic, notification.model_dump())
+
+
+async def notify(
+    user_id: int,
+    topic: _Topic,
+    notification: Notification,
+):
+    await notify_many([user_id], topic, notification)
+
+
+async def pop_notifications(user_id: int) -> Notifications:
+    """return unread notifications of all topics and remove them.
+
+    workflow:
+        1. get counters and cursors of all topics with a single request
+        2. get the recent unread notifications with a single request
+        3. consume them with a single ``delete_many`` request
+        4. move cursors, so these numbers are not requested again
+
+    notes:
+        the number that is taken by the writer but not created yet is
+        marked as skipped. the writer takes the next one in that case.
+    """
+
+    topics = list(Notifications.model_fields.keys())
+    namespace = NOTIFICATIONS_CACHE_NAMESPACE
+
+    async with Cache() as cache:
+        counters: dict[str, int] = await cache.get_many(
+            namespace,
+            [
+                _key(user_id, topic, suffix)
+                for topic in topics
+                for suffix in ("seq", "cursor")
+            ],
+        )
+
+        numbers: dict[str, list[int]] = {}
+        for topic in topics:
+            last = counters.get(_key(user_id, topic, "seq"), 0)
+            cursor = counters.get(_key(user_id, topic, "cursor"), 0)
+            if cursor > last:
+                # the counter is lost. numbers are taken from the beginning
+                cursor = 0
+            numbers[topic] = list(
+                range(max(cursor, last - NOTIFICATIONS_LIMIT) + 1, last + 1)
             )
-        except errors.NotFoundError:
-            notifications = Notifications()
-        else:
-            notifications = Notifications(**results)
-
-        topic_notifications: list[Notification] = getattr(notifications, topic)
-        topic_notifications.append(notification)
-
-        # update cache instance
-        await cache.set(
-            namespace="fambb_notifications",
-            key=str(user_id),
-            value=notifications.model_dump(),
+
+        keys = [
+            _key(user_id, topic, number)
+            for topic in topics
+            for number in numbers[topic]
+        ]
+        if not keys:
+            return Notifications()
+
+        found: dict[str, dict] = await cache.get_many(namespace, keys)
+
+        # mark numbers that are taken but not created yet
+        for key in keys:
+            if key in found or await cache.add(
+                namespace, key, None, ttl=NOTIFICATIONS_TTL
+            ):
+                continue
+
+            try:
+                found[key] = await cache.get(namespace, key)
+            except errors.NotFoundError:
+                # consumed by the concurrent reader
+                continue
+
+        consumed = await cache.delete_many(
+            namespace, [key for key, value in found.items() if value]
         )
+
+        await cache.set_many(
+            namespace,
+            {
+                _key(user_id, topic, "cursor"): numbers[topic][-1]
+                for topic in topics
+                if numbers[topic]
+            },
+            ttl=NOTIFICATIONS_TTL,
+        )
+
+    return Notifications(
+        **{
+            topic: [
+                found[key]
+                for number in numbers[topic]
+                if (key := _key(user_id, topic, number)) in consumed
+            ]
+            for topic in topics
+        }
+    )
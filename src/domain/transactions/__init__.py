@@ -23,10 +23,13 @@ __all__ = (
     "CostCategory",
     "CostsAnalytics",
     "CostsByCategory",
+    "CostsByDay",
+    "CostsForecast",
     "Exchange",
     "Income",
     "IncomesAnalytics",
     "OperationType",
+    "RecurringCost",
     "Transaction",
     "Transaction",
     "TransactionRepository",
@@ -34,10 +37,20 @@ __all__ = (
     "TransactionsFilter",
     "as_cents",
     "cents_from_raw",
+    "detect_recurring_costs",
+    "forecast_costs",
+    "forecast_history_start",
     "pretty_money",
+    "recurring_history_start",
     "timestamp_from_raw",
 )
 
+from .analytics import (
+    detect_recurring_costs,
+    forecast_costs,
+    forecast_history_start,
+    recurring_history_start,
+)
 from .data_transformation import (
     as_cents,
     cents_from_raw,
@@ -50,8 +63,11 @@ from .value_objects import (
     AnalyticsPeriod,
     CostsAnalytics,
     CostsByCategory,
+    CostsByDay,
+    CostsForecast,
     IncomesAnalytics,
     OperationType,
+    RecurringCost,
     Transaction,
     TransactionsBasicAnalytics,
     TransactionsFilter,
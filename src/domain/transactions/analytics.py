@@ -0,0 +1,306 @@
+"""
+this module includes analytics that are calculated on the application side
+since they can't be expressed with plain SQL aggregations.
+
+each function here is a pure function. the data access is performed by
+the ``TransactionRepository`` and caching is a part of the operational tier.
+"""
+
+import calendar
+import re
+import statistics
+from collections import defaultdict
+from collections.abc import Iterable
+from datetime import date, timedelta
+from typing import Final
+
+from .entities import Cost
+from .value_objects import CostsByDay, CostsForecast, RecurringCost
+
+# the minimum number of occurrences to treat the cost as recurring
+RECURRING_MIN_OCCURRENCES: Final = 3
+
+# the minimum period in days. daily coffee is not a subscription
+RECURRING_MIN_PERIOD: Final = 7
+
+# values that differ less than 15% are treated as 'the same value band'
+RECURRING_VALUE_TOLERANCE: Final = 0.15
+
+# the gap is 'regular' if it differs from the median less than 20%
+RECURRING_GAP_TOLERANCE: Final = 0.2
+
+# the share of regular gaps required to detect the periodicity
+RECURRING_REGULAR_GAPS_RATIO: Final = 0.75
+
+# days of costs that are used for the detection. yearly costs occur
+# ``RECURRING_MIN_OCCURRENCES`` times with irregular gaps within it
+RECURRING_HISTORY_DAYS: Final = 3 * 365
+
+# how many previous months are used for the seasonality adjustment
+FORECAST_HISTORY_MONTHS: Final = 3
+
+# the weight of the seasonality with the full history. the run-rate of
+# the current month always matters, since habits change
+FORECAST_SEASONAL_WEIGHT: Final = 0.8
+
+_NAME_NOISE = re.compile(r"[\d\W_]+")
+
+
+def normalize_cost_name(name: str) -> str:
+    """get rid of the noise in the cost name.
+
+    examples:
+        'Netflix #1234' -> 'netflix'
+        'Rent (March)' -> 'rent march'
+    """
+
+    return " ".join(_NAME_NOISE.sub(" ", name.lower()).split())
+
+
+def _add_months(value: date, months: int) -> date:
+    """shift the date for N months keeping the day of month if possible."""
+
+    month_index = value.month - 1 + months
+    year = value.year + month_index // 12
+    month = month_index % 12 + 1
+    day = min(value.day, calendar.monthrange(year, month)[1])
+
+    return date(year, month, day)
+
+
+def _next_date(last_date: date, period: int) -> date:
+    """calendar-aware prediction of the next occurrence.
+
+    notes:
+        monthly, quarterly and yearly payments are usually charged
+        on the same day of month, so the calendar shift is used for them.
+    """
+
+    if 26 <= period <= 35:
+        return _add_months(last_date, 1)
+    elif 85 <= period <= 95:
+        return _add_months(last_date, 3)
+    elif 350 <= period <= 380:
+        return _add_months(last_date, 12)
+    else:
+        return last_date + timedelta(days=period)
+
+
+def _value_bands(items: list[Cost]) -> Iterable[list[Cost]]:
+    """split items into bands of similar values with a single sorted sweep.
+
+    notes:
+        the band is opened by its smallest value, so the values do not
+        'drift' across the band if they grow slowly one by one.
+    """
+
+    band: list[Cost] = []
+
+    for item in sorted(items, key=lambda item: item.value):
+        if band and item.value > band[0].value * (
+            1 + RECURRING_VALUE_TOLERANCE
+        ):
+            yield band
+            band = []
+        band.append(item)
+
+    if band:
+        yield band
+
+
+def _recurring_cost(band: list[Cost], today: date) -> RecurringCost | None:
+    """detect the periodicity of the band based on inter-arrival gaps."""
+
+    # keep a single occurrence per day
+    occurrences: dict[date, Cost] = {}
+    for item in sorted(band, key=lambda item: (item.timestamp, item.id)):
+        occurrences[item.timestamp] = item
+
+    if len(occurrences) < RECURRING_MIN_OCCURRENCES:
+        return None
+
+    timestamps = list(occurrences.keys())
+    gaps = [
+        (current - previous).days
+        for previous, current in zip(timestamps, timestamps[1:])
+    ]
+    period = int(statistics.median(gaps))
+
+    if period < RECURRING_MIN_PERIOD:
+        return None
+
+    regular_gaps = sum(
+        1
+        for gap in gaps
+        if abs(gap - period) <= period * RECURRING_GAP_TOLERANCE
+    )
+    if regular_gaps < len(gaps) * RECURRING_REGULAR_GAPS_RATIO:
+        return None
+
+    last = occurrences[timestamps[-1]]
+
+    # the cost is not active anymore if it was skipped twice
+    if (today - last.timestamp).days > period * 2:
+        return None
+
+    return RecurringCost(
+        name=last.name,
+        value=int(statistics.median(item.value for item in band)),
+        period=period,
+        occurrences=len(occurrences),
+        last_date=last.timestamp,
+        next_date=_next_date(last.timestamp, period),
+        currency=last.currency,
+        category=last.category,
+    )
+
+
+def detect_recurring_costs(
+    costs: Iterable[Cost], today: date | None = None
+) -> tuple[RecurringCost, ...]:
+    """find costs that repeat with a stable period and similar value.
+
+    workflow:
+        group costs by the normalized name and the currency (hash grouping)
+        split each group into value bands (sorted sweep)
+        detect the period from the inter-arrival gaps of each band
+
+    notes:
+        the complexity is O(n log n) because of sorting inside groups.
+        items are never compared pairwise.
+    """
+
+    today = today or date.today()
+    groups: dict[tuple[str, int], list[Cost]] = defaultdict(list)
+
+    for cost in costs:
+        groups[(normalize_cost_name(cost.name), cost.currency.id)].append(cost)
+
+    results: list[RecurringCost] = []
+    for items in groups.values():
+        if len(items) < RECURRING_MIN_OCCURRENCES:
+            continue
+
+        for band in _value_bands(items):
+            if (item := _recurring_cost(band, today)) is not None:
+                results.append(item)
+
+    return tuple(sorted(results, key=lambda item: (item.next_date, item.name)))
+
+
+def recurring_history_start(today: date) -> date:
+    """the first date of costs that are used for the detection."""
+
+    return today - timedelta(days=RECURRING_HISTORY_DAYS)
+
+
+def forecast_history_start(today: date) -> date:
+    """the first date of daily aggregates that are used for the forecast."""
+
+    return _add_months(today.replace(day=1), -FORECAST_HISTORY_MONTHS)
+
+
+def forecast_costs(
+    daily: Iterable[CostsByDay], today: date | None = None
+) -> tuple[CostsForecast, ...]:
+    """forecast costs by the end of the current month
+    for each (category, currency) pair.
+
+    model:
+        forecast = spent + remaining
+
+        ``remaining`` blends 2 estimations. the weight of the seasonality
+        depends on the number of previous months with costs and never
+        exceeds ``FORECAST_SEASONAL_WEIGHT``:
+        - run-rate: the current daily average for the rest of the month
+        - seasonality: the average spent after the same relative day
+            of previous months. rent paid on the last day is not lost.
+
+    notes:
+        each series is a fixed-size array of daily totals per month, so
+        all the calculations are slices and sums over the same arrays.
+    """
+
+    today = today or date.today()
+    current_month = today.replace(day=1)
+    days_in_month = calendar.monthrange(today.year, today.month)[1]
+
+    # the day of the previous month that corresponds to today
+    history_days: list[int] = []
+    for months_ago in range(1, FORECAST_HISTORY_MONTHS + 1):
+        month = _add_months(current_month, -months_ago)
+        month_days = calendar.monthrange(month.year, month.month)[1]
+        history_days.append(round(today.day / days_in_month * month_days))
+
+    # series[key][months_ago][day - 1] is the total of the day
+    series: dict[tuple[int, int], list[list[int]]] = {}
+    meta: dict[tuple[int, int], CostsByDay] = {}
+
+    for item in daily:
+        months_ago = (
+            (current_month.year - item.timestamp.year) * 12
+            + current_month.month
+            - item.timestamp.month
+        )
+        if not 0 <= months_ago <= FORECAST_HISTORY_MONTHS:
+            continue
+        if item.timestamp > today:
+            continue
+
+        key = (item.category.id, item.currency.id)
+        if key not in series:
+            series[key] = [
+                [0] * 31 for _ in range(FORECAST_HISTORY_MONTHS + 1)
+            ]
+        series[key][months_ago][item.timestamp.day - 1] += item.total
+        meta[key] = item
+
+    results: list[CostsForecast] = []
+    for key, (current, *history) in series.items():
+        spent = sum(current[: today.day])
+        run_rate_remaining = spent / today.day * (days_in_month - today.day)
+
+        # (month total, spent after the relative day) of months with costs
+        seasonal = [
+            (total, total - sum(month[:day]))
+            for month, day in zip(history, history_days)
+            if (total := sum(month)) > 0
+        ]
+
+        if seasonal:
+            weight = (
+                FORECAST_SEASONAL_WEIGHT
+                * len(seasonal)
+                / FORECAST_HISTORY_MONTHS
+            )
+            seasonal_remaining = statistics.fmean(
+                remaining for _, remaining in seasonal
+            )
+            history_average = round(
+                statistics.fmean(total for total, _ in seasonal)
+            )
+        else:
+            weight = 0.0
+            seasonal_remaining = 0.0
+            history_average = 0
+
+        forecast = spent + round(
+            weight * seasonal_remaining + (1 - weight) * run_rate_remaining
+        )
+
+        if forecast == 0:
+            continue
+
+        results.append(
+            CostsForecast(
+                spent=spent,
+                forecast=forecast,
+                history_average=history_average,
+                currency=meta[key].currency,
+                category=meta[key].category,
+            )
+        )
+
+    return tuple(
+        sorted(results, key=lambda item: (item.currency.id, -item.forecast))
+    )
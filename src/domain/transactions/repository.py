@@ -1,4 +1,3 @@
-import asyncio
 import itertools
 import operator
 from collections.abc import AsyncGenerator
@@ -21,9 +20,10 @@ from src.domain.equity import Currency
 from src.domain.users import User
 from src.infrastructure import database, dates, errors
 
-from .entities import CostCategory
+from .entities import Cost, CostCategory
 from .value_objects import (
     CostsByCategory,
+    CostsByDay,
     IncomesBySource,
     Transaction,
     TransactionsBasicAnalytics,
@@ -68,7 +68,9 @@ class TransactionRepository(database.Repository):
                 func.cast("cost", String).label(  # type: ignore[arg-type]
                     "operation_type",
                 ),
-                CurrencyAlias,
+                CurrencyAlias.name,
+                CurrencyAlias.sign,
+                CurrencyAlias.id,
                 UserAlias.name,
             )
             .join(CurrencyAlias, database.Cost.currency)
@@ -89,7 +91,9 @@ class TransactionRepository(database.Repository):
                 func.cast("income", String).label(  # type: ignore[arg-type]
                     "operation_type",
                 ),
-                CurrencyAlias,
+                CurrencyAlias.name,
+                CurrencyAlias.sign,
+                CurrencyAlias.id,
                 UserAlias.name,
             )
             .join(CurrencyAlias, database.Income.currency)
@@ -111,7 +115,9 @@ class TransactionRepository(database.Repository):
                 func.cast("exchange", String).label(  # type: ignore[arg-type]
                     "operation_type",
                 ),
-                CurrencyAlias,
+                CurrencyAlias.name,
+                CurrencyAlias.sign,
+                CurrencyAlias.id,
                 UserAlias.name,
             )
             .join(CurrencyAlias, database.Exchange.to_currency)
@@ -229,7 +235,6 @@ class TransactionRepository(database.Repository):
                         operation_type,
                         currency_name,
                         currency_sign,
-                        _,  # currency equity
                         _currency_id,
                         user_name,
                     ) = row
@@ -253,6 +258,56 @@ class TransactionRepository(database.Repository):
 
         return tuple(results), total
 
+    async def _update_returning_previous(
+        self, table, id_: int, /, **values
+    ) -> dict:
+        """update the transaction with a single statement.
+
+        returns:
+            previous values of ``currency_id``, ``value`` and all
+            the updated columns.
+
+        notes:
+            the row is locked with ``SELECT ... FOR UPDATE`` inside the same
+            statement, so previous values are always the latest committed
+            ones and concurrent updates can not use the stale value.
+        """
+
+        previous = (
+            select(table)
+            .where(getattr(table, "id") == id_)
+            .with_for_update()
+            .cte("previous")
+        )
+
+        if missing := set(values) - set(previous.c.keys()):
+            raise errors.DatabaseError(
+                f"'{table.__tablename__}' table does not have "
+                f"{', '.join(sorted(missing))} columns"
+            )
+
+        query = (
+            update(table)
+            .where(getattr(table, "id") == previous.c.id)
+            .values(values)
+            .returning(
+                *(
+                    previous.c[column]
+                    for column in dict.fromkeys(
+                        ("currency_id", "value", *values)
+                    )
+                )
+            )
+            .execution_options(synchronize_session=False)
+        )
+
+        result: Result = await self.command.session.execute(query)
+
+        if (row := result.one_or_none()) is None:
+            raise errors.NotFoundError(f"{table.__name__} {id_} not found")
+
+        return dict(row._mapping)
+
     async def delete(self, table, candidate_id: int) -> None:
         """delete some specific trasaction from the specified table."""
 
@@ -306,6 +361,137 @@ class TransactionRepository(database.Repository):
                 for item in results.scalars():
                     yield item
 
+    async def costs_history(
+        self, /, start_date: date, end_date: date
+    ) -> AsyncGenerator[Cost, None]:
+        """get costs of ``start_date..end_date`` ordered by timestamp.
+
+        notes:
+            only columns that are required for analytics are selected
+            so the long history could be loaded without the ORM overhead.
+        """
+
+        query: Select = (
+            select(
+                database.Cost.id,
+                database.Cost.name,
+                database.Cost.value,
+                database.Cost.timestamp,
+                database.Cost.user_id,
+                database.Currency.id,
+                database.Currency.name,
+                database.Currency.sign,
+                database.CostCategory.id,
+                database.CostCategory.name,
+            )
+            .join(
+                database.Currency,
+                database.Cost.currency_id == database.Currency.id,
+            )
+            .join(
+                database.CostCategory,
+                database.Cost.category_id == database.CostCategory.id,
+            )
+            .where(
+                database.Cost.timestamp >= start_date,
+                database.Cost.timestamp <= end_date,
+            )
+            .order_by(database.Cost.timestamp, database.Cost.id)
+        )
+
+        async with self.query.session as session:
+            async with session.begin():
+                results: Result = await session.execute(query)
+                for (
+                    id_,
+                    name,
+                    value,
+                    timestamp,
+                    user_id,
+                    currency_id,
+                    currency_name,
+                    currency_sign,
+                    category_id,
+                    category_name,
+                ) in results:
+                    yield Cost(
+                        id=id_,
+                        name=name,
+                        value=value,
+                        timestamp=timestamp,
+                        user_id=user_id,
+                        currency=Currency(
+                            id=currency_id,
+                            name=currency_name,
+                            sign=currency_sign,
+                        ),
+                        category=CostCategory(
+                            id=category_id, name=category_name
+                        ),
+                    )
+
+    async def costs_by_day(
+        self, /, start_date: date, end_date: date
+    ) -> AsyncGenerator[CostsByDay, None]:
+        """get daily totals of costs for each category and currency.
+
+        notes:
+            the aggregation is performed on the database level, so the
+            number of rows depends on days, not on the number of costs.
+        """
+
+        query: Select = (
+            select(
+                database.Cost.timestamp,
+                func.sum(database.Cost.value),
+                database.Currency.id,
+                database.Currency.name,
+                database.Currency.sign,
+                database.CostCategory.id,
+                database.CostCategory.name,
+            )
+            .join(
+                database.Currency,
+                database.Cost.currency_id == database.Currency.id,
+            )
+            .join(
+                database.CostCategory,
+                database.Cost.category_id == database.CostCategory.id,
+            )
+            .where(database.Cost.timestamp.between(start_date, end_date))
+            .group_by(
+                database.Cost.timestamp,
+                database.Currency.id,
+                database.CostCategory.id,
+            )
+            .order_by(database.Cost.timestamp)
+        )
+
+        async with self.query.session as session:
+            async with session.begin():
+                results: Result = await session.execute(query)
+                for (
+                    timestamp,
+                    total,
+                    currency_id,
+                    currency_name,
+                    currency_sign,
+                    category_id,
+                    category_name,
+                ) in results:
+                    yield CostsByDay(
+                        timestamp=timestamp,
+                        total=total,
+                        currency=Currency(
+                            id=currency_id,
+                            name=currency_name,
+                            sign=currency_sign,
+                        ),
+                        category=CostCategory(
+                            id=category_id, name=category_name
+                        ),
+                    )
+
     async def cost(self, id_: int) -> database.Cost:
         """get specific item from 'costs' table"""
 
@@ -330,20 +516,16 @@ class TransactionRepository(database.Repository):
         self.command.session.add(candidate)
         return candidate
 
-    async def update_cost(
-        self, candidate: database.Cost, **values
-    ) -> database.Cost:
-
-        query = (
-            update(database.Cost)
-            .where(database.Cost.id == candidate.id)
-            .values(values)
-            .returning(database.Cost)
-        )
+    async def update_cost(self, id_: int, **values) -> dict:
+        """update the cost and return its previous values.
 
-        await self.command.session.execute(query)
+        notes:
+            check ``_update_returning_previous`` for more details.
+        """
 
-        return candidate
+        return await self._update_returning_previous(
+            database.Cost, id_, **values
+        )
 
     # ==================================================
     # incomes section
@@ -397,20 +579,16 @@ class TransactionRepository(database.Repository):
         self.command.session.add(candidate)
         return candidate
 
-    async def update_income(
-        self, candidate: database.Income, **values
-    ) -> database.Income:
-
-        query = (
-            update(database.Income)
-            .where(database.Income.id == candidate.id)
-            .values(values)
-            .returning(database.Income)
-        )
+    async def update_income(self, id_: int, **values) -> dict:
+        """update the income and return its previous values.
 
-        await self.command.session.execute(query)
+        notes:
+            check ``_update_returning_previous`` for more details.
+        """
 
-        return candidate
+        return await self._update_returning_previous(
+            database.Income, id_, **values
+        )
 
     # ==================================================
     # exchanges section
@@ -651,7 +829,8 @@ class TransactionRepository(database.Repository):
         workflow:
             build database queries. all (except of exchanges)
                 are grouped by currency
-            execute SQL queries asynchronously
+            execute SQL queries concurrently on separate connections
+                that share the same consistent snapshot
             build the internal data structure to be returned
 
         notes:
@@ -746,34 +925,22 @@ class TransactionRepository(database.Repository):
             .order_by(database.Exchange.timestamp)
         )
 
-        # perform database queries
-        async with self.query.session as session:
-            async with session.begin():
-                try:
-                    (
-                        _currencies,
-                        _costs_totals_by_currency,
-                        _cost_totals_by_currency_and_category,
-                        _incomes_totals_by_currency,
-                        _income_totals_by_currency_and_source,
-                        _exchanges,
-                    ) = await asyncio.gather(
-                        session.execute(
-                            select(database.Currency).order_by(
-                                desc(database.Currency.id)
-                            )
-                        ),
-                        session.execute(cost_totals_by_currency_query),
-                        session.execute(
-                            cost_categories_totals_by_currency_query
-                        ),
-                        session.execute(income_totals_by_currency_query),
-                        session.execute(incomes_by_currency_and_source_query),
-                        session.execute(exchanges_query),
-                    )
-
-                except Exception as error:
-                    raise errors.DatabaseError(str(error)) from error
+        # perform database queries over the same snapshot concurrently
+        (
+            _currencies,
+            _costs_totals_by_currency,
+            _cost_totals_by_currency_and_category,
+            _incomes_totals_by_currency,
+            _income_totals_by_currency_and_source,
+            _exchanges,
+        ) = await self.query.execute_concurrently(
+            select(database.Currency).order_by(desc(database.Currency.id)),
+            cost_totals_by_currency_query,
+            cost_categories_totals_by_currency_query,
+            income_totals_by_currency_query,
+            incomes_by_currency_and_source_query,
+            exchanges_query,
+        )
 
         results: dict[int, TransactionsBasicAnalytics] = {
             currency.id: TransactionsBasicAnalytics(
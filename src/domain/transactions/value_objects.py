@@ -6,6 +6,8 @@ from pydantic import Field, model_validator
 from src.domain.equity import Currency
 from src.infrastructure import IncomeSource, InternalData
 
+from .entities import CostCategory
+
 # represents the available list of query strings that client
 # can specify instead of dates to get the basic analytics.
 AnalyticsPeriod = Literal["current-month", "previous-month"]
@@ -186,3 +188,56 @@ class TransactionsBasicAnalytics(InternalData):
             return 100.0
         else:
             return result
+
+
+class RecurringCost(InternalData):
+    """represents the cost that repeats with a stable period.
+    for example: subscriptions, rent, utilities.
+
+    args:
+        ``name`` - the name of the latest occurrence
+        ``value`` - the typical (median) value of the occurrences
+        ``period`` - the typical (median) gap between occurrences in days
+        ``occurrences`` - how many times the cost was found in the history
+        ``last_date`` - the date of the latest occurrence
+        ``next_date`` - the expected date of the next occurrence
+    """
+
+    name: str
+    value: int
+    period: int
+    occurrences: int
+    last_date: date
+    next_date: date
+    currency: Currency
+    category: CostCategory
+
+
+class CostsByDay(InternalData):
+    """the daily aggregate of costs for the category in the currency.
+
+    args:
+        ``timestamp`` - the day of costs
+        ``total`` - the sum of all the costs of that day
+    """
+
+    timestamp: date
+    total: int
+    currency: Currency
+    category: CostCategory
+
+
+class CostsForecast(InternalData):
+    """represents where the category lands by the end of the month.
+
+    args:
+        ``spent`` - the sum of costs from the beginning of the month
+        ``forecast`` - the expected sum of costs at the end of the month
+        ``history_average`` - the average total of previous months
+    """
+
+    spent: int
+    forecast: int
+    history_average: int
+    currency: Currency
+    category: CostCategory
@@ -10,7 +10,19 @@ __all__ = (
     "User",
     "UserConfiguration",
     "UserRepository",
+    "revoke_session",
+    "revoke_user_sessions",
+    "rotate_refresh_token",
+    "save_session",
+    "session_revoked",
 )
 
 from .entities import User, UserConfiguration
 from .repository import UserRepository
+from .tokens import (
+    revoke_session,
+    revoke_user_sessions,
+    rotate_refresh_token,
+    save_session,
+    session_revoked,
+)
@@ -17,7 +17,9 @@ class UserConfiguration(InternalData):
     last_notification: str | None = None
     notify_cost_threshold: int | None = None
 
+    # the key is not cached with the user, but the flag is
     monobank_api_key: str | None = None
+    monobank_integration_active: bool = False
 
 
 class User(InternalData):
@@ -57,5 +59,6 @@ class User(InternalData):
                 last_notification=instance.last_notification,
                 notify_cost_threshold=instance.notify_cost_threshold,
                 monobank_api_key=instance.monobank_api_key,
+                monobank_integration_active=bool(instance.monobank_api_key),
             ),
         )
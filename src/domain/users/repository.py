@@ -21,7 +21,10 @@ class UserRepository(database.Repository):
                         joinedload(database.User.default_cost_category),
                     )
                 )
-                user: database.User = results.scalars().one()
+                try:
+                    user: database.User = results.scalars().one()
+                except NoResultFound as error:
+                    raise errors.NotFoundError("Can't find user") from error
 
         return user
 
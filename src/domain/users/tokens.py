@@ -0,0 +1,299 @@
+"""
+refresh tokens are stored in the cache by their SHA256 hashes.
+
+the login creates the session. refresh tokens of the session are rotated:
+each token is exchanged only once, the reuse of the exchanged token
+revokes all the sessions of the user, since the token is stolen.
+
+KEYS LAYOUT
+    ``user:{user_id}:seq`` - the counter of sessions of the user
+    ``user:{user_id}:{n}`` - the session number ``n`` of the user
+    ``rotated:{token_hash}`` - the refresh token that is exchanged already
+    ``revoked:{session}`` - the revoked session
+    ``revoked:log:seq`` - the counter of the revocations log
+    ``revoked:log:{n}`` - the revoked session number ``n``
+    ``revoked:log:day:{date}`` - the first log number of the day (UTC)
+
+REVOCATION CHECK
+    the session is checked on each authorized request. workers read
+    the revocations log into the in-memory Bloom filter, so the session
+    that is not revoked is answered without the network. the filter
+    answers 'probably revoked' for revoked sessions and rare false
+    positives, which are checked by the ``revoked:{session}`` key.
+
+    the log is read at most once in ``settings.auth.revocation_sync_interval``
+    so the session that is revoked by other worker is accepted within that
+    interval. revocations of the worker are visible immediately.
+
+    log entries expire with refresh tokens, but the counter does not.
+    the reader starts from the first number of the oldest day that may
+    have live entries, so expired numbers are never requested. the filter
+    is rebuilt from the live entries once it is full.
+"""
+
+import asyncio
+import math
+import time
+from collections.abc import Iterable
+from datetime import date, datetime, timedelta, timezone
+from typing import Final
+
+from src.config import settings
+from src.infrastructure import BloomFilter, Cache, errors
+
+REFRESH_TOKENS_CACHE_NAMESPACE: Final = "fambb_refresh_tokens"
+
+# the false positive rate of the revoked sessions filter
+REVOKED_FILTER_ERROR_RATE: Final = 0.01
+
+# the number of numbered keys that are requested at once
+_CHUNK_SIZE: Final = 500
+
+# only recent sessions of the user are revoked at once. sessions live
+# for ``refresh_token_expire_days``, so older numbers are expired
+_USER_SESSIONS_LIMIT: Final = 500
+
+# the writer takes the next number if the reader has skipped the current one
+_APPEND_ATTEMPTS: Final = 3
+
+
+def _ttl(expires_at: int) -> int:
+    """seconds until the expiration. at least 1, since 0 is 'forever'."""
+
+    return max(1, math.ceil(expires_at - time.time()))
+
+
+def _log_ttl() -> int:
+    return settings.auth.refresh_token_expire_days * 24 * 60 * 60
+
+
+def _today() -> date:
+    return datetime.now(timezone.utc).date()
+
+
+def _chunks(start: int, stop: int) -> Iterable[range]:
+    for chunk in range(start, stop + 1, _CHUNK_SIZE):
+        yield range(chunk, min(chunk + _CHUNK_SIZE, stop + 1))
+
+
+async def _append(cache: Cache, prefix: str, value, ttl: int) -> int:
+    """add the value with the next number. the number is returned."""
+
+    for _ in range(_APPEND_ATTEMPTS):
+        number = await cache.incr(
+            REFRESH_TOKENS_CACHE_NAMESPACE, f"{prefix}:seq"
+        )
+        if await cache.add(
+            REFRESH_TOKENS_CACHE_NAMESPACE, f"{prefix}:{number}", value, ttl
+        ):
+            return number
+
+    raise errors.BaseError(message="the refresh token can not be saved")
+
+
+async def _log_floor(cache: Cache) -> int:
+    """the first log number that may be alive. 1 if it is unknown."""
+
+    days = [
+        _today() - timedelta(days=offset)
+        for offset in range(settings.auth.refresh_token_expire_days + 1)
+    ]
+    found: dict[str, int] = await cache.get_many(
+        REFRESH_TOKENS_CACHE_NAMESPACE,
+        (f"revoked:log:day:{day.isoformat()}" for day in days),
+    )
+
+    return min(found.values(), default=1)
+
+
+async def _log_entries(
+    cache: Cache, numbers: Iterable[int]
+) -> dict[int, str | None]:
+    """get revocations log entries by numbers.
+
+    NOTES
+        the number that is taken by the writer but not created yet is
+        marked as skipped with a single request, so the reader never
+        waits for it.
+    """
+
+    namespace = REFRESH_TOKENS_CACHE_NAMESPACE
+    keys = {f"revoked:log:{number}": number for number in numbers}
+    found: dict[str, str | None] = await cache.get_many(namespace, keys)
+
+    if missing := keys.keys() - found.keys():
+        skipped = await cache.add_many(
+            namespace, dict.fromkeys(missing), ttl=_log_ttl()
+        )
+        if created := missing - skipped:
+            found.update(await cache.get_many(namespace, created))
+
+    return {keys[key]: value for key, value in found.items()}
+
+
+class RevokedSessions:
+    """the revoked sessions filter of the worker."""
+
+    def __init__(self) -> None:
+        self._filter = self._new_filter()
+        self._cursor: int | None = None
+        self._synced_at = -math.inf
+
+    @staticmethod
+    def _new_filter() -> BloomFilter:
+        return BloomFilter(
+            capacity=settings.auth.revocation_filter_capacity,
+            error_rate=REVOKED_FILTER_ERROR_RATE,
+        )
+
+    async def sync(self, cache: Cache) -> None:
+        """read new revocations log entries into the filter."""
+
+        started = time.monotonic()
+        if started - self._synced_at < settings.auth.revocation_sync_interval:
+            return None
+
+        # concurrent checks do not wait for the sync in progress
+        self._synced_at = started
+
+        try:
+            await self._read_log(cache)
+        except BaseException:
+            self._synced_at = -math.inf
+            raise
+
+    async def _read_log(self, cache: Cache) -> None:
+        try:
+            last: int = await cache.get(
+                REFRESH_TOKENS_CACHE_NAMESPACE, "revoked:log:seq"
+            )
+        except errors.NotFoundError:
+            last = 0
+
+        if self._cursor is not None and last < self._cursor:
+            # the counter is lost. numbers are taken from the beginning
+            self._filter = self._new_filter()
+            self._cursor = 0
+        elif (
+            self._cursor is None or self._filter.count > self._filter.capacity
+        ):
+            # the filter is built from live entries only
+            self._filter = self._new_filter()
+            self._cursor = await _log_floor(cache) - 1
+
+        for numbers in _chunks(self._cursor + 1, last):
+            for session in (await _log_entries(cache, numbers)).values():
+                if session:
+                    self._filter.add(session)
+            self._cursor = numbers[-1]
+
+    def add(self, session: str) -> None:
+        self._filter.add(session)
+
+    async def revoked(self, session: str) -> bool:
+        async with Cache() as cache:
+            await self.sync(cache)
+
+            if session not in self._filter:
+                return False
+
+            try:
+                await cache.get(
+                    REFRESH_TOKENS_CACHE_NAMESPACE, f"revoked:{session}"
+                )
+            except errors.NotFoundError:
+                return False
+            else:
+                return True
+
+
+revoked_sessions = RevokedSessions()
+
+
+async def save_session(user_id: int, session: str, expires_at: int) -> None:
+    """record the session of the user, so it could be revoked.
+
+    NOTES
+        rotated refresh tokens belong to the same session,
+        so the index grows only with logins.
+    """
+
+    async with Cache() as cache:
+        await _append(
+            cache,
+            f"user:{user_id}",
+            {"session": session, "expires_at": expires_at},
+            ttl=_ttl(expires_at),
+        )
+
+
+async def rotate_refresh_token(token_hash: str, expires_at: int) -> bool:
+    """mark the refresh token as exchanged.
+
+    RETURNS
+        ``False`` if the token is exchanged already
+    """
+
+    async with Cache() as cache:
+        return await cache.add(
+            REFRESH_TOKENS_CACHE_NAMESPACE,
+            f"rotated:{token_hash}",
+            True,
+            ttl=_ttl(expires_at),
+        )
+
+
+async def revoke_session(session: str, expires_at: int) -> None:
+    """revoke the session with all the refresh and access tokens."""
+
+    async with Cache() as cache:
+        await cache.set(
+            REFRESH_TOKENS_CACHE_NAMESPACE,
+            f"revoked:{session}",
+            True,
+            ttl=_ttl(expires_at),
+        )
+        number = await _append(cache, "revoked:log", session, ttl=_log_ttl())
+        # only the first writer of the day records the number
+        await cache.add(
+            REFRESH_TOKENS_CACHE_NAMESPACE,
+            f"revoked:log:day:{_today().isoformat()}",
+            number,
+            ttl=_log_ttl() + 24 * 60 * 60,
+        )
+
+    revoked_sessions.add(session)
+
+
+async def revoke_user_sessions(user_id: int) -> None:
+    """revoke all the sessions of the user that are not expired."""
+
+    async with Cache() as cache:
+        try:
+            last: int = await cache.get(
+                REFRESH_TOKENS_CACHE_NAMESPACE, f"user:{user_id}:seq"
+            )
+        except errors.NotFoundError:
+            return None
+
+        found: dict[str, dict] = await cache.get_many(
+            REFRESH_TOKENS_CACHE_NAMESPACE,
+            (
+                f"user:{user_id}:{number}"
+                for number in range(
+                    max(1, last - _USER_SESSIONS_LIMIT + 1), last + 1
+                )
+            ),
+        )
+
+    await asyncio.gather(
+        *(
+            revoke_session(item["session"], item["expires_at"])
+            for item in found.values()
+            if item["expires_at"] > time.time()
+        )
+    )
+
+
+async def session_revoked(session: str) -> bool:
+    return await revoked_sessions.revoked(session)
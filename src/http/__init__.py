@@ -11,13 +11,16 @@ what HTTP-resources groups we have:
     when clients exchange money from one currency to another
 6. analytics - allows clients to claim analytics based on the trns-ns.
     this group is also about getting information about the EQUITY.
+7. metrics - allows clients to observe the infrastructure usage.
 """
 
 from .contracts import (
+    CacheNamespaceMetrics,
     Cost,
     CostCategory,
     CostCategoryCreateBody,
     CostCreateBody,
+    CostsForecast,
     CostShortcut,
     CostShortcutApply,
     CostShortcutCreateBody,
@@ -25,11 +28,13 @@ from .contracts import (
     Currency,
     CurrencyCreateBody,
     Equity,
+    EquityReconciliation,
     Exchange,
     ExchangeCreateBody,
     Income,
     IncomeCreateBody,
     IncomeUpdateBody,
+    RecurringCost,
     Transaction,
     TransactionBasicAnalytics,
     User,
@@ -42,5 +47,6 @@ from .resources.currencies import router as currencies_router
 from .resources.exchange import router as exchange_router
 from .resources.identity import router as users_router
 from .resources.incomes import router as incomes_router
+from .resources.metrics import router as metrics_router
 from .resources.notifications import router as notifications_router
 from .resources.transactions import router as transactions_router
@@ -2,12 +2,14 @@ from ._query_params import TransactionsFilter, get_transactions_detail_filter
 from .analytics import (
     CostsAnalytics,
     CostsByCategory,
+    CostsForecast,
     IncomesAnalytics,
     IncomesBySource,
+    RecurringCost,
     TransactionBasicAnalytics,
 )
 from .currency import Currency, CurrencyCreateBody
-from .equity import Equity
+from .equity import Equity, EquityReconciliation
 from .identity import (
     GetTokensRequestBody,
     RefreshRequestBody,
@@ -17,6 +19,7 @@ from .identity import (
     UserConfigurationPartialUpdateRequestBody,
     UserCreateRequestBody,
 )
+from .metrics import CacheNamespaceMetrics, PasswordHashingMetrics
 from .notifications import Notification
 from .shortcuts import CostShortcut, CostShortcutApply, CostShortcutCreateBody
 from .transactions import (
@@ -30,5 +33,6 @@ from .transactions import (
     Income,
     IncomeCreateBody,
     IncomeUpdateBody,
+    MissingTransaction,
     Transaction,
 )
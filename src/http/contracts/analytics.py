@@ -7,6 +7,7 @@ of all the transactions, saved in the database for the specific dates range.
 
 import functools
 import operator
+from datetime import date
 
 from pydantic import Field, field_validator
 
@@ -14,6 +15,7 @@ from src import domain
 from src.infrastructure import IncomeSource, PublicData
 
 from .currency import Currency
+from .transactions import CostCategory
 
 TEST = 12
 
@@ -127,3 +129,72 @@ class TransactionBasicAnalytics(PublicData):
             ),
             total_ratio=instance.total_ratio,
         )
+
+
+class RecurringCost(PublicData):
+    """Represents the cost that repeats with a stable period."""
+
+    name: str = Field(description="The name of the latest occurrence")
+    value: float = Field(description="The typical value of the cost")
+    period: int = Field(
+        description="The typical gap between occurrences in days",
+        examples=[7, 30, 365],
+    )
+    occurrences: int = Field(description="How many times the cost was found")
+    last_date: date = Field(description="The date of the latest occurrence")
+    next_date: date = Field(description="The expected date of the next one")
+    currency: Currency
+    category: CostCategory
+
+    @functools.singledispatchmethod
+    @classmethod
+    def from_instance(cls, instance) -> "RecurringCost":
+        raise NotImplementedError(
+            f"Can not get {cls.__name__} from {type(instance)} type"
+        )
+
+    @from_instance.register
+    @classmethod
+    def _(cls, instance: domain.transactions.RecurringCost):
+        return cls(
+            name=instance.name,
+            value=domain.transactions.pretty_money(instance.value),
+            period=instance.period,
+            occurrences=instance.occurrences,
+            last_date=instance.last_date,
+            next_date=instance.next_date,
+            currency=Currency.from_instance(instance.currency),
+            category=CostCategory.model_validate(instance.category),
+        )
+
+
+class CostsForecast(PublicData):
+    """Represents where the category lands by the end of the month."""
+
+    spent: float = Field(description="Spent from the beginning of the month")
+    forecast: float = Field(description="Expected total at the end of month")
+    history_average: float = Field(
+        description="The average total of previous months"
+    )
+    currency: Currency
+    category: CostCategory
+
+    @functools.singledispatchmethod
+    @classmethod
+    def from_instance(cls, instance) -> "CostsForecast":
+        raise NotImplementedError(
+            f"Can not get {cls.__name__} from {type(instance)} type"
+        )
+
+    @from_instance.register
+    @classmethod
+    def _(cls, instance: domain.transactions.CostsForecast):
+        return cls(
+            spent=domain.transactions.pretty_money(instance.spent),
+            forecast=domain.transactions.pretty_money(instance.forecast),
+            history_average=domain.transactions.pretty_money(
+                instance.history_average
+            ),
+            currency=Currency.from_instance(instance.currency),
+            category=CostCategory.model_validate(instance.category),
+        )
@@ -1,5 +1,7 @@
 import functools
 
+from pydantic import Field
+
 from src import domain
 from src.infrastructure import PublicData, database
 
@@ -26,3 +28,40 @@ class Equity(PublicData):
             ),
             amount=domain.transactions.pretty_money(instance.equity),
         )
+
+    @from_instance.register
+    @classmethod
+    def _(cls, instance: domain.equity.Equity):
+        return cls(
+            currency=domain.equity.Currency.model_validate(instance),
+            amount=domain.transactions.pretty_money(instance.equity),
+        )
+
+
+class EquityReconciliation(PublicData):
+    """The stored equity compared to the equity expected
+    from all the transactions.
+    """
+
+    currency: domain.equity.Currency
+    actual: float = Field(description="The stored equity")
+    expected: float = Field(description="The equity based on transactions")
+    difference: float = Field(description="``expected - actual``")
+
+    @functools.singledispatchmethod
+    @classmethod
+    def from_instance(cls, instance) -> "EquityReconciliation":
+        raise NotImplementedError(
+            f"Can not convert {type(instance)} "
+            "into the EquityReconciliation contract"
+        )
+
+    @from_instance.register
+    @classmethod
+    def _(cls, instance: domain.equity.EquityDrift):
+        return cls(
+            currency=instance.currency,
+            actual=domain.transactions.pretty_money(instance.actual),
+            expected=domain.transactions.pretty_money(instance.expected),
+            difference=domain.transactions.pretty_money(instance.difference),
+        )
@@ -83,12 +83,7 @@ class UserConfiguration(PublicData):
     @from_instance.register
     @classmethod
     def _(cls, instance: domain.users.UserConfiguration):
-        return cls(
-            **instance.model_dump(),
-            monobank_integration_active=(
-                True if instance.monobank_api_key else False
-            ),
-        )
+        return cls(**instance.model_dump())
 
     @field_validator("notify_cost_threshold", mode="after")
     @classmethod
@@ -0,0 +1,45 @@
+from pydantic import Field
+
+from src.infrastructure.responses import PublicData
+
+
+class CacheNamespaceMetrics(PublicData):
+    """The cache usage of the namespace in the worker that
+    handles the request.
+    """
+
+    namespace: str
+    hits: int
+    misses: int
+    errors: int
+    hit_ratio: float | None
+    requests: int = Field(description="The number of memcached requests")
+    latency: dict[str, int] = Field(
+        description="Requests by the upper bound of time in seconds"
+    )
+    latency_total: float
+    latency_p50: float | None
+    latency_p99: float | None
+    sizes: dict[str, int] = Field(
+        description="Written values by the upper bound of size in bytes"
+    )
+    size_total: int
+    hot_keys: list[tuple[str, int]] = Field(
+        description="The most requested keys with the number of lookups"
+    )
+
+
+class PasswordHashingMetrics(PublicData):
+    """The password hashing threads usage of the worker that
+    handles the request.
+    """
+
+    workers: int
+    in_progress: int = Field(description="Calls running in threads")
+    waiting: int = Field(description="Calls waiting for a thread")
+    calls: int
+    queue_time_total: float = Field(
+        description="Seconds from calls to the start of hashing"
+    )
+    queue_time_max: float
+    run_time_total: float
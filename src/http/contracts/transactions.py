@@ -1,6 +1,7 @@
 import contextlib
 import functools
 from datetime import date
+from typing import Literal
 
 from pydantic import Field, field_validator, model_validator
 
@@ -331,3 +332,42 @@ class Exchange(PublicData):
             from_currency=Currency.model_validate(instance.from_currency),
             to_currency=Currency.model_validate(instance.to_currency),
         )
+
+
+class MissingTransaction(PublicData):
+    """The bank transaction that is not recorded."""
+
+    id: str = Field(description="The bank transaction id")
+    operation: Literal["cost", "income"] = Field(
+        description="The type of the operation"
+    )
+    name: str = Field(description="The bank description")
+    value: float = Field(description="The amount with cents")
+    timestamp: date = Field(description="The date of a transaction")
+    currency_id: int | None = Field(
+        description="The currency. None if it is not registered"
+    )
+    suggested_category_id: int | None = Field(
+        description="The cost category that fits the transaction"
+    )
+
+    @functools.singledispatchmethod
+    @classmethod
+    def from_instance(cls, instance) -> "MissingTransaction":
+        raise NotImplementedError(
+            f"Can not convert {type(instance)} "
+            f"into the {type(cls.__name__)} contract"
+        )
+
+    @from_instance.register
+    @classmethod
+    def _(cls, instance: domain.banks.MissingTransaction):
+        return cls(
+            id=instance.id,
+            operation=instance.operation,
+            name=instance.name,
+            value=domain.transactions.pretty_money(instance.value),
+            timestamp=instance.timestamp,
+            currency_id=instance.currency_id,
+            suggested_category_id=instance.suggested_category_id,
+        )
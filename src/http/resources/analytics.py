@@ -5,9 +5,16 @@ from fastapi import APIRouter, Depends, Query
 
 from src import domain
 from src import operational as op
-from src.infrastructure import ResponseMulti
+from src.config import settings
+from src.infrastructure import ResponseMulti, errors
 
-from ..contracts import Equity, TransactionBasicAnalytics
+from ..contracts import (
+    CostsForecast,
+    Equity,
+    EquityReconciliation,
+    RecurringCost,
+    TransactionBasicAnalytics,
+)
 
 router = APIRouter(prefix="/analytics", tags=["Analytics"])
 
@@ -20,8 +27,45 @@ async def equity(
 
     return ResponseMulti[Equity](
         result=[
-            Equity.from_instance(item)
-            for item in await domain.equity.EquityRepository().currencies()
+            Equity.from_instance(item) for item in await op.currencies_equity()
+        ]
+    )
+
+
+@router.get("/equity/reconciliation")
+async def equity_reconciliation(
+    _: domain.users.User = Depends(op.authorize),
+) -> ResponseMulti[EquityReconciliation]:
+    """compare the equity with the one expected from all transactions."""
+
+    return ResponseMulti[EquityReconciliation](
+        result=[
+            EquityReconciliation.from_instance(item)
+            for item in await op.reconcile_equity()
+        ]
+    )
+
+
+@router.post("/equity/reconciliation")
+async def equity_reconciliation_apply(
+    user: domain.users.User = Depends(op.authorize),
+) -> ResponseMulti[EquityReconciliation]:
+    """correct the equity of drifted currencies.
+
+    NOTES:
+        the response includes the state before the correction.
+        only users from ``settings.equity.correction_user_ids`` may do it.
+    """
+
+    if user.id not in settings.equity.correction_user_ids:
+        raise errors.PermissionDeniedError(
+            "The equity correction is not allowed for the user"
+        )
+
+    return ResponseMulti[EquityReconciliation](
+        result=[
+            EquityReconciliation.from_instance(item)
+            for item in await op.reconcile_equity(fix=True)
         ]
     )
 
@@ -84,3 +128,41 @@ async def transaction_analytics_basic(
             for instance in instances
         ]
     )
+
+
+@router.get("/costs/recurring")
+async def recurring_costs(
+    _: domain.users.User = Depends(op.authorize),
+) -> ResponseMulti[RecurringCost]:
+    """costs that repeat with a stable period and a similar value.
+
+    NOTES:
+        subscriptions, rent and utilities are detected from the whole
+        costs history. results are ordered by the next expected date.
+    """
+
+    return ResponseMulti[RecurringCost](
+        result=[
+            RecurringCost.from_instance(item)
+            for item in await op.recurring_costs()
+        ]
+    )
+
+
+@router.get("/costs/forecast")
+async def costs_forecast(
+    _: domain.users.User = Depends(op.authorize),
+) -> ResponseMulti[CostsForecast]:
+    """where each category lands by the end of the current month.
+
+    NOTES:
+        the forecast is based on the current run-rate adjusted with
+        the spending profile of previous months.
+    """
+
+    return ResponseMulti[CostsForecast](
+        result=[
+            CostsForecast.from_instance(item)
+            for item in await op.costs_forecast()
+        ]
+    )
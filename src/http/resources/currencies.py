@@ -13,12 +13,11 @@ router = APIRouter(prefix="/currencies", tags=["Currencies"])
 async def currencies(_=Depends(op.authorize)) -> ResponseMulti[Currency]:
     """Return available cost categories."""
 
-    currencies: tuple[database.Currency, ...] = (
-        await domain.EquityRepository().currencies()
-    )
-
     return ResponseMulti[Currency](
-        result=[Currency.from_instance(item) for item in currencies]
+        result=[
+            Currency.from_instance(item)
+            for item in await op.currencies_equity()
+        ]
     )
 
 
@@ -34,4 +33,6 @@ async def currency_create(
             candidate=database.Currency(name=body.name, sign=body.sign)
         )
 
+    await op.sync_equity_cache()
+
     return Response[Currency](result=Currency.from_instance(instance))
@@ -1,11 +1,9 @@
-from fastapi import APIRouter, Body, Depends, Request, status
-from slowapi import Limiter
-from slowapi.util import get_remote_address
+from fastapi import APIRouter, Body, Depends, status
 
 from src import operational as op
 from src.config import settings
 from src.domain import users as domain
-from src.infrastructure import Response
+from src.infrastructure import RateLimit, Response, rate_limit
 from src.operational import authentication
 
 from ..contracts.identity import (
@@ -18,21 +16,20 @@ from ..contracts.identity import (
 
 router = APIRouter(prefix="/identity", tags=["Identity"])
 
-# Rate limiter for auth endpoints
-limiter = Limiter(key_func=get_remote_address)
-
-# Rate limit strings
-_login_limit = (
-    f"{settings.rate_limit.login_per_minute}/minute;"
-    f"{settings.rate_limit.login_per_hour}/hour"
+# Rate limits are shared by all the workers
+_login_limit = rate_limit(
+    "login",
+    RateLimit(limit=settings.rate_limit.login_per_minute, period=60),
+    RateLimit(limit=settings.rate_limit.login_per_hour, period=60 * 60),
+)
+_refresh_limit = rate_limit(
+    "refresh",
+    RateLimit(limit=settings.rate_limit.refresh_per_minute, period=60),
 )
-_refresh_limit = f"{settings.rate_limit.refresh_per_minute}/minute"
 
 
-@router.post("/tokens")
-@limiter.limit(_login_limit)
+@router.post("/tokens", dependencies=[Depends(_login_limit)])
 async def get_tokens(
-    request: Request,
     body: GetTokensRequestBody = Body(...),
 ) -> Response[TokenPairResponse]:
     """Authenticate user with username and password.
@@ -50,10 +47,8 @@ async def get_tokens(
     )
 
 
-@router.post("/refresh")
-@limiter.limit(_refresh_limit)
+@router.post("/refresh", dependencies=[Depends(_refresh_limit)])
 async def refresh(
-    request: Request,
     body: RefreshRequestBody = Body(...),
 ) -> Response[TokenPairResponse]:
     """Refresh tokens using a valid refresh token.
@@ -70,10 +65,14 @@ async def refresh(
 
 
 @router.post("/revoke-refresh", status_code=status.HTTP_204_NO_CONTENT)
-async def logout() -> None:
-    """Logout by revoking the refresh token."""
+async def logout(body: RefreshRequestBody = Body(...)) -> None:
+    """Logout by revoking the refresh token.
+
+    NOTES
+    (1) Access tokens of the same session are rejected as well
+    """
 
-    # TODO: Remove refresh tokens from the cache
+    await authentication.revoke_refresh_token(body.refresh_token)
 
     return None
 
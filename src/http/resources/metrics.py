@@ -0,0 +1,41 @@
+from fastapi import APIRouter, Depends
+
+from src import domain
+from src import operational as op
+from src.infrastructure import Response, ResponseMulti
+
+from ..contracts import CacheNamespaceMetrics, PasswordHashingMetrics
+
+router = APIRouter(prefix="/metrics", tags=["Metrics"])
+
+
+@router.get("/cache")
+async def cache_metrics(
+    _: domain.users.User = Depends(op.authorize),
+) -> ResponseMulti[CacheNamespaceMetrics]:
+    """the cache usage per namespace.
+
+    NOTES:
+        metrics are collected by each worker, so the response
+        includes only the worker that handles the request.
+    """
+
+    return ResponseMulti[CacheNamespaceMetrics](
+        result=[
+            CacheNamespaceMetrics.model_validate(item)
+            for item in op.cache_metrics()
+        ]
+    )
+
+
+@router.get("/password-hashing")
+async def password_hashing_metrics(
+    _: domain.users.User = Depends(op.authorize),
+) -> Response[PasswordHashingMetrics]:
+    """the password hashing threads usage of the worker."""
+
+    return Response[PasswordHashingMetrics](
+        result=PasswordHashingMetrics.model_validate(
+            op.password_hashing_metrics()
+        )
+    )
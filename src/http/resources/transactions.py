@@ -7,11 +7,16 @@ from src import domain
 from src import operational as op
 from src.infrastructure import (
     OffsetPagination,
+    ResponseMulti,
     ResponseMultiPaginated,
     get_offset_pagination_params,
 )
 
-from ..contracts import Transaction, get_transactions_detail_filter
+from ..contracts import (
+    MissingTransaction,
+    Transaction,
+    get_transactions_detail_filter,
+)
 
 router = APIRouter(prefix="/transactions", tags=["Transactions"])
 
@@ -78,9 +83,16 @@ async def lookup_missing_transactions(
         ),
     ],
     user: domain.users.User = Depends(op.authorize),
-) -> None:
+) -> ResponseMulti[MissingTransaction]:
     """Looking for missing transactions
     with all available banks integrations.
+
+    NOTES
+    (1) Bank statements are imported once, repeated lookups are local
     """
 
-    await op.lookup_missing_transactions(user, start_date, end_date)
+    items = await op.lookup_missing_transactions(user, start_date, end_date)
+
+    return ResponseMulti[MissingTransaction](
+        result=[MissingTransaction.from_instance(item) for item in items]
+    )
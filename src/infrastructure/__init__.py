@@ -1,4 +1,5 @@
 __all__ = (
+    "BloomFilter",
     "Cache",
     "ErrorDetail",
     "ErrorResponse",
@@ -7,6 +8,7 @@ __all__ = (
     "InternalData",
     "OffsetPagination",
     "PublicData",
+    "RateLimit",
     "Response",
     "ResponseMulti",
     "ResponseMultiPaginated",
@@ -18,12 +20,15 @@ __all__ = (
     "get_offset_pagination_params",
     "hooks",
     "middleware",
+    "rate_limit",
 )
 
 
 from . import database, dates, errors, factories, hooks, middleware
+from .bloom import BloomFilter
 from .cache import Cache
 from .entities import InternalData
+from .rate_limiter import RateLimit, rate_limit
 from .responses import (
     ErrorDetail,
     ErrorResponse,
@@ -0,0 +1,24 @@
+__all__ = (
+    "Cache",
+    "CacheBackend",
+    "CacheMetrics",
+    "CacheNamespaceStats",
+    "CachePoolStats",
+    "CacheTierStats",
+    "LocalCache",
+    "MemcachedBackend",
+    "MemoryBackend",
+    "codecs",
+)
+
+
+from . import codecs
+from .backends import (
+    CacheBackend,
+    CachePoolStats,
+    MemcachedBackend,
+    MemoryBackend,
+)
+from .client import Cache
+from .local import CacheTierStats, LocalCache
+from .metrics import CacheMetrics, CacheNamespaceStats
@@ -0,0 +1,345 @@
+"""
+storage backends of the ``Cache``.
+
+backends store encoded values by full keys (``namespace:key``). encoding,
+the local tier, metrics and single-flight are the ``Cache`` part, so they
+work the same way for any backend.
+
+BACKENDS
+    ``memcached`` - shared by all the workers and containers
+    ``memory`` - the process memory. for single-worker deployments,
+        since workers do not see changes of each other
+"""
+
+import time
+from typing import Protocol
+
+from aiomcache import FlagClient
+from aiomcache.pool import Connection, MemcachePool
+
+from src.config import settings
+
+from ..entities import InternalData
+from .local import LocalCache
+
+
+class CacheBackend(Protocol):
+    """the interface of the cache storage.
+
+    NOTES
+        each method is a single request for the remote storage.
+        ``ttl`` is in seconds, 0 means 'no expiration'.
+    """
+
+    async def get_many(
+        self, keys: list[str]
+    ) -> list[tuple[bytes, int] | None]: ...
+
+    async def set_many(
+        self, items: list[tuple[str, bytes, int]], ttl: int
+    ) -> list[bool]: ...
+
+    async def add_many(
+        self, items: list[tuple[str, bytes, int]], ttl: int
+    ) -> list[bool]: ...
+
+    async def gets(self, key: str) -> tuple[bytes, int, int] | None: ...
+
+    async def cas(
+        self, key: str, data: bytes, flags: int, ttl: int, token: int
+    ) -> bool: ...
+
+    async def delete_many(self, keys: list[str]) -> list[bool]: ...
+
+    async def incr_many(
+        self, keys: list[str], delta: int
+    ) -> list[int | None]: ...
+
+    async def close(self) -> None: ...
+
+
+class CachePoolStats(InternalData):
+    """the snapshot of the connections pool state.
+
+    ARGS
+    ``size`` - the number of opened connections
+    ``in_use`` - the number of connections that are in use right now
+    ``acquisitions`` - the total number of acquired connections
+    ``waits`` - how many acquisitions have waited for the connection
+        that is used by others. opening a new connection is not a wait
+    ``wait_total`` - the total time of waits. in seconds
+    ``wait_max`` - the longest wait. in seconds
+    """
+
+    size: int
+    in_use: int
+    acquisitions: int
+    waits: int
+    wait_total: float
+    wait_max: float
+
+
+class InstrumentedPool(MemcachePool):
+    """connections pool that tracks the time spent waiting for
+    a connection, so the pool size could be tuned.
+
+    NOTES
+        only the public ``acquire``, ``release`` and ``size`` of
+        the ``aiomcache`` pool are used. the acquisition waits if
+        ``maxsize`` connections are taken or requested already.
+    """
+
+    def __init__(
+        self, host: str, port: int, *, minsize: int, maxsize: int
+    ) -> None:
+        super().__init__(host, port, minsize=minsize, maxsize=maxsize)
+
+        self.maxsize = maxsize
+        # connections that are used or requested right now
+        self._demand = 0
+        self._in_use_count = 0
+
+        self._acquisitions = 0
+        self._waits = 0
+        self._wait_total = 0.0
+        self._wait_max = 0.0
+
+    async def acquire(self) -> Connection:
+        blocked = self._demand >= self.maxsize
+        self._demand += 1
+        started = time.perf_counter()
+
+        try:
+            connection = await super().acquire()
+        except BaseException:
+            self._demand -= 1
+            raise
+
+        self._acquisitions += 1
+        self._in_use_count += 1
+
+        if blocked:
+            elapsed = time.perf_counter() - started
+            self._waits += 1
+            self._wait_total += elapsed
+            self._wait_max = max(self._wait_max, elapsed)
+
+        return connection
+
+    def release(self, conn: Connection) -> None:
+        super().release(conn)
+
+        self._demand -= 1
+        self._in_use_count -= 1
+
+    def stats(self) -> CachePoolStats:
+        return CachePoolStats(
+            size=self.size(),
+            in_use=self._in_use_count,
+            acquisitions=self._acquisitions,
+            waits=self._waits,
+            wait_total=self._wait_total,
+            wait_max=self._wait_max,
+        )
+
+
+async def _pass_flags(value: bytes, flags: int) -> tuple[bytes, int]:
+    return value, flags
+
+
+class MemcachedBackend:
+    """``memcached`` storage.
+
+    NOTES
+        the retrieval is performed by the ``aiomcache`` client. other
+        commands are pipelined over a single connection, so N commands
+        take one network round trip instead of N.
+
+        the client is bound to the shared pool and keys are validated
+        by its private members, so ``aiomcache`` is pinned to 0.8.x.
+    """
+
+    def __init__(self, pool: MemcachePool) -> None:
+        self.pool = pool
+        self.client: FlagClient = FlagClient(
+            settings.cache.host,
+            settings.cache.port,
+            get_flag_handler=_pass_flags,
+        )
+        self.client._pool = pool
+
+    def pool_stats(self) -> CachePoolStats | None:
+        if isinstance(self.pool, InstrumentedPool):
+            return self.pool.stats()
+        else:
+            return None
+
+    def _validate(self, keys: list[str]) -> list[bytes]:
+        return [self.client._validate_key(key.encode()) for key in keys]
+
+    async def _pipeline(self, commands: list[bytes]) -> list[bytes]:
+        """send commands with a single write and read a reply line for each.
+
+        NOTES
+            memcached replies in the order of commands.
+        """
+
+        connection = await self.pool.acquire()
+
+        try:
+            connection.writer.write(b"".join(commands))
+            await connection.writer.drain()
+
+            return [
+                (await connection.reader.readline()).rstrip(b"\r\n")
+                for _ in commands
+            ]
+        except Exception as error:
+            # the connection state is unknown, so it is closed on release
+            connection.reader.set_exception(error)
+            raise
+        finally:
+            self.pool.release(connection)
+
+    async def get_many(
+        self, keys: list[str]
+    ) -> list[tuple[bytes, int] | None]:
+        values: tuple[bytes | tuple[bytes, int] | None, ...] = (
+            await self.client.multi_get(*self._validate(keys))
+        )
+
+        # zero flags are not passed to the handler
+        return [
+            (value, 0) if isinstance(value, bytes) else value
+            for value in values
+        ]
+
+    async def set_many(
+        self, items: list[tuple[str, bytes, int]], ttl: int
+    ) -> list[bool]:
+        keys = self._validate([key for key, _, _ in items])
+        replies = await self._pipeline(
+            [
+                b"set %b %d %d %d\r\n%b\r\n"
+                % (key, flags, ttl, len(data), data)
+                for key, (_, data, flags) in zip(keys, items)
+            ]
+        )
+
+        return [reply == b"STORED" for reply in replies]
+
+    async def add_many(
+        self, items: list[tuple[str, bytes, int]], ttl: int
+    ) -> list[bool]:
+        keys = self._validate([key for key, _, _ in items])
+        replies = await self._pipeline(
+            [
+                b"add %b %d %d %d\r\n%b\r\n"
+                % (key, flags, ttl, len(data), data)
+                for key, (_, data, flags) in zip(keys, items)
+            ]
+        )
+
+        return [reply == b"STORED" for reply in replies]
+
+    async def gets(self, key: str) -> tuple[bytes, int, int] | None:
+        (validated,) = self._validate([key])
+        value, token = await self.client.gets(validated)
+
+        if value is None or token is None:
+            return None
+        elif isinstance(value, bytes):
+            # zero flags are not passed to the handler
+            return value, 0, token
+        else:
+            return *value, token
+
+    async def cas(
+        self, key: str, data: bytes, flags: int, ttl: int, token: int
+    ) -> bool:
+        (validated,) = self._validate([key])
+        (reply,) = await self._pipeline(
+            [
+                b"cas %b %d %d %d %d\r\n%b\r\n"
+                % (validated, flags, ttl, len(data), token, data)
+            ]
+        )
+
+        return reply == b"STORED"
+
+    async def delete_many(self, keys: list[str]) -> list[bool]:
+        replies = await self._pipeline(
+            [b"delete %b\r\n" % key for key in self._validate(keys)]
+        )
+
+        return [reply == b"DELETED" for reply in replies]
+
+    async def incr_many(self, keys: list[str], delta: int) -> list[int | None]:
+        replies = await self._pipeline(
+            [b"incr %b %d\r\n" % (key, delta) for key in self._validate(keys)]
+        )
+
+        results: list[int | None] = []
+        for key, reply in zip(keys, replies):
+            if reply.isdigit():
+                results.append(int(reply))
+            elif reply == b"NOT_FOUND":
+                results.append(None)
+            else:
+                raise ValueError(f"Can not increase {key}: {reply!r}")
+
+        return results
+
+    async def close(self) -> None:
+        await self.client.close()
+
+
+class MemoryBackend:
+    """the process memory storage with TTL and LRU bounds.
+
+    NOTES
+        operations never await, so they are atomic for the event loop
+        the same way ``memcached`` commands are atomic for its clients.
+    """
+
+    def __init__(self, max_entries: int, max_bytes: int) -> None:
+        self.storage = LocalCache(max_entries=max_entries, max_bytes=max_bytes)
+
+    async def get_many(
+        self, keys: list[str]
+    ) -> list[tuple[bytes, int] | None]:
+        return [self.storage.get(key) for key in keys]
+
+    async def set_many(
+        self, items: list[tuple[str, bytes, int]], ttl: int
+    ) -> list[bool]:
+        return [
+            self.storage.set(key, data, flags, ttl)
+            for key, data, flags in items
+        ]
+
+    async def add_many(
+        self, items: list[tuple[str, bytes, int]], ttl: int
+    ) -> list[bool]:
+        return [
+            self.storage.peek(key) is None
+            and self.storage.set(key, data, flags, ttl)
+            for key, data, flags in items
+        ]
+
+    async def gets(self, key: str) -> tuple[bytes, int, int] | None:
+        return self.storage.gets(key)
+
+    async def cas(
+        self, key: str, data: bytes, flags: int, ttl: int, token: int
+    ) -> bool:
+        return self.storage.cas(key, data, flags, ttl, token)
+
+    async def delete_many(self, keys: list[str]) -> list[bool]:
+        return [self.storage.delete(key) for key in keys]
+
+    async def incr_many(self, keys: list[str], delta: int) -> list[int | None]:
+        return [self.storage.incr(key, delta) for key in keys]
+
+    async def close(self) -> None:
+        pass
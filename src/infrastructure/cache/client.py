@@ -0,0 +1,615 @@
+import asyncio
+import time
+from collections.abc import Awaitable, Callable, Iterable, Mapping
+from contextlib import contextmanager
+from typing import Any, ClassVar, Final, Self
+
+from aiomcache.pool import MemcachePool
+from loguru import logger
+
+from src.config import settings
+
+from .. import errors
+from . import codecs
+from .backends import (
+    CacheBackend,
+    CachePoolStats,
+    InstrumentedPool,
+    MemcachedBackend,
+    MemoryBackend,
+)
+from .local import CacheTierStats, LocalCache
+from .metrics import CacheMetrics, CacheNamespaceStats
+
+# seconds between checks if the value is produced by another worker
+LEASE_POLL_INTERVAL: Final = 0.1
+
+
+class Cache:
+    """the cache client.
+
+    USAGE
+    >>> async with Cache() as cache:
+    >>>     await cache.set('namespace', 'key', {"key": "value"})
+    >>>     await cache.get('namespace', 'key')
+
+    NOTES
+        the storage is selected by ``settings.cache.backend``.
+        check ``backends`` for details.
+
+        values are encoded by ``codecs`` and the codec is stored in
+        the item flags. large values are compressed.
+
+        namespaces that have the policy in ``settings.cache.local`` are
+        also kept in the in-process LRU cache of the worker for the policy
+        TTL. changes are visible for other workers after the TTL expires.
+        the ``memory`` backend skips it, since it is in-process itself.
+
+        the pooled backend is shared by all the ``Cache`` instances of
+        the worker. it is created by ``Cache.connect()`` on the application
+        startup and closed by ``Cache.disconnect()`` on the shutdown.
+
+        if it is not connected (scripts, etc) each instance creates
+        its own ``memcached`` connection that is closed
+        on ``Cache.__aexit__``.
+
+        hits, misses, errors, the backend latency and written sizes
+        are recorded per namespace. check ``Cache.metrics()``.
+    """
+
+    _shared_backend: ClassVar[CacheBackend | None] = None
+    _memory: ClassVar[MemoryBackend | None] = None
+
+    _local: ClassVar[LocalCache | None] = None
+    _remote_hits: ClassVar[int] = 0
+    _remote_misses: ClassVar[int] = 0
+    _inflight: ClassVar[dict[str, asyncio.Task]] = {}
+    _metrics: ClassVar[CacheMetrics] = CacheMetrics()
+
+    @classmethod
+    def memory(cls) -> MemoryBackend:
+        """the in-memory backend of the process."""
+
+        if cls._memory is None:
+            cls._memory = MemoryBackend(
+                max_entries=settings.cache.memory.max_entries,
+                max_bytes=settings.cache.memory.max_bytes,
+            )
+
+        return cls._memory
+
+    @classmethod
+    async def connect(cls) -> None:
+        """create the backend that is shared by the worker."""
+
+        if cls._shared_backend is not None:
+            return None
+        elif settings.cache.backend == "memory":
+            cls._shared_backend = cls.memory()
+        else:
+            cls._shared_backend = MemcachedBackend(
+                InstrumentedPool(
+                    settings.cache.host,
+                    settings.cache.port,
+                    minsize=1,
+                    maxsize=settings.cache.pool,
+                )
+            )
+
+    @classmethod
+    async def disconnect(cls) -> None:
+        if (backend := cls._shared_backend) is not None:
+            cls._shared_backend = None
+            await backend.close()
+
+    @classmethod
+    def pool_stats(cls) -> CachePoolStats | None:
+        """connections pool metrics. ``None`` if not connected."""
+
+        if isinstance(backend := cls._shared_backend, MemcachedBackend):
+            return backend.pool_stats()
+        else:
+            return None
+
+    @classmethod
+    def local(cls) -> LocalCache:
+        """the in-process cache of the worker."""
+
+        if cls._local is None:
+            cls._local = LocalCache(
+                max_entries=settings.cache.local.max_entries,
+                max_bytes=settings.cache.local.max_bytes,
+            )
+
+        return cls._local
+
+    @classmethod
+    def tier_stats(cls) -> dict[str, CacheTierStats]:
+        """hits, misses and evictions of each tier of the worker."""
+
+        return {
+            "local": cls.local().stats(),
+            "remote": CacheTierStats(
+                hits=cls._remote_hits, misses=cls._remote_misses
+            ),
+        }
+
+    @classmethod
+    def metrics(cls) -> tuple[CacheNamespaceStats, ...]:
+        """usage metrics of each namespace in the worker."""
+
+        return cls._metrics.stats()
+
+    @classmethod
+    @contextmanager
+    def _observe(cls, namespace: str):
+        """record the time and the failure of the backend request."""
+
+        started = time.perf_counter()
+        try:
+            yield
+        except Exception:
+            cls._metrics.error(namespace)
+            raise
+        finally:
+            cls._metrics.latency(namespace, time.perf_counter() - started)
+
+    def __init__(self) -> None:
+        self._backend: CacheBackend | None = None
+        self._owned: bool = False
+
+    async def __aenter__(self) -> Self:
+        if (backend := self._shared_backend) is not None:
+            self._backend = backend
+        elif settings.cache.backend == "memory":
+            self._backend = self.memory()
+        else:
+            self._backend = MemcachedBackend(
+                MemcachePool(
+                    settings.cache.host,
+                    settings.cache.port,
+                    minsize=1,
+                    maxsize=1,
+                )
+            )
+            self._owned = True
+
+        return self
+
+    async def __aexit__(self, *args, **kwargs) -> None:
+        if self._owned is True and self._backend is not None:
+            await self._backend.close()
+
+        self._backend = None
+        self._owned = False
+
+    @property
+    def backend(self) -> CacheBackend:
+        if self._backend is None:
+            raise Exception(f"Bad usage. {self.__class__.__doc__}")
+        else:
+            return self._backend
+
+    def _local_ttl(self, namespace: str) -> int | None:
+        """TTL of the local tier. ``None`` if it is not used."""
+
+        if isinstance(self.backend, MemoryBackend):
+            return None
+        else:
+            return settings.cache.local.policies.get(namespace)
+
+    @classmethod
+    def _decode(cls, namespace: str, data: bytes, flags: int) -> Any:
+        try:
+            return codecs.decode(data, flags)
+        except ValueError:
+            cls._metrics.error(namespace)
+            raise
+
+    @classmethod
+    def _decode_many(
+        cls, namespace: str, found: dict[str, tuple[bytes, int]]
+    ) -> dict[str, Any]:
+        results: dict[str, Any] = {}
+
+        for key, (data, flags) in found.items():
+            try:
+                results[key] = cls._decode(namespace, data, flags)
+            except ValueError as error:
+                logger.warning(
+                    f"Broken cache entry {namespace}:{key}: {error}"
+                )
+
+        return results
+
+    async def set(
+        self, namespace: str, key: str, value: Any, ttl: int = 0
+    ) -> bool:
+        """save the value. ``ttl`` is in seconds, 0 means 'no expiration'."""
+
+        return await self.set_many(namespace, {key: value}, ttl=ttl)
+
+    async def add(
+        self, namespace: str, key: str, value: Any, ttl: int = 0
+    ) -> bool:
+        """save the value only if the key does not exist.
+
+        NOTES
+            it is atomic for all the workers, so it is used as a lock.
+            the local tier is skipped.
+        """
+
+        return bool(await self.add_many(namespace, {key: value}, ttl=ttl))
+
+    async def add_many(
+        self, namespace: str, items: Mapping[str, Any], ttl: int = 0
+    ) -> frozenset[str]:
+        """save many values that do not exist with a single backend request.
+
+        returns:
+            keys that are added by this request.
+        """
+
+        if not items:
+            return frozenset()
+
+        encoded: list[tuple[str, bytes, int]] = []
+        for key, value in items.items():
+            data, flags = codecs.encode(value)
+            self._metrics.size(namespace, len(data))
+            encoded.append((f"{namespace}:{key}", data, flags))
+
+        with self._observe(namespace):
+            added = await self.backend.add_many(encoded, ttl)
+
+        return frozenset(key for key, ok in zip(items, added) if ok)
+
+    async def get(self, namespace: str, key: str) -> Any:
+        full_key = f"{namespace}:{key}"
+        ttl = self._local_ttl(namespace)
+
+        if ttl is not None and (result := self.local().get(full_key)):
+            self._metrics.hit(namespace, key)
+            return self._decode(namespace, *result)
+
+        with self._observe(namespace):
+            (value,) = await self.backend.get_many([full_key])
+
+        if value is None:
+            Cache._remote_misses += 1
+            self._metrics.miss(namespace, key)
+            raise errors.NotFoundError
+
+        Cache._remote_hits += 1
+        self._metrics.hit(namespace, key)
+
+        if ttl is not None:
+            self.local().set(full_key, *value, ttl=ttl)
+
+        return self._decode(namespace, *value)
+
+    async def gets(self, namespace: str, key: str) -> tuple[Any, int]:
+        """get the value with the token for ``cas``.
+
+        NOTES
+            the local tier is skipped, since the token is the state
+            of the backend.
+        """
+
+        with self._observe(namespace):
+            found = await self.backend.gets(f"{namespace}:{key}")
+
+        if found is None:
+            self._metrics.miss(namespace, key)
+            raise errors.NotFoundError
+
+        self._metrics.hit(namespace, key)
+        data, flags, token = found
+
+        return self._decode(namespace, data, flags), token
+
+    async def cas(
+        self, namespace: str, key: str, value: Any, token: int, ttl: int = 0
+    ) -> bool:
+        """save the value only if it is not changed since ``gets``.
+
+        NOTES
+            it is atomic for all the workers. ``False`` is returned if
+            the value is changed or deleted by another request.
+        """
+
+        full_key = f"{namespace}:{key}"
+        data, flags = codecs.encode(value)
+        self._metrics.size(namespace, len(data))
+
+        with self._observe(namespace):
+            stored = await self.backend.cas(full_key, data, flags, ttl, token)
+
+        local_ttl = self._local_ttl(namespace)
+        if local_ttl is not None and stored:
+            self.local().set(
+                full_key, data, flags, min(local_ttl, ttl or local_ttl)
+            )
+        elif local_ttl is not None:
+            self.local().delete(full_key)
+
+        return stored
+
+    async def get_or_set(
+        self,
+        namespace: str,
+        key: str,
+        producer: Callable[[], Awaitable[Any]],
+        ttl: int = 0,
+    ) -> Any:
+        """get the value or produce it once for all concurrent callers.
+
+        WORKFLOW
+            1. concurrent calls of the worker wait for the same task
+            2. the fresh value is returned from the cache
+            3. otherwise the worker takes the lease with ``add``
+                and calls the ``producer``. other workers return
+                the expired (stale) value meanwhile or wait for the new
+                one if there is nothing to return
+
+        PARAMS
+            ``producer`` - returns the JSON-compatible value. it is returned
+                as is to the callers of the worker that has produced it
+            ``ttl`` - seconds the value is fresh. 0 means 'forever'.
+                the expired value is kept for ``settings.cache.stale_ttl``
+
+        NOTES
+            the shared task uses its own ``Cache`` context, so it is not
+            affected by the caller that has left its context.
+
+            use ``invalidate`` to drop the value. the value that is
+            produced before the invalidation is not kept.
+        """
+
+        full_key = f"{namespace}:{key}"
+
+        if (task := Cache._inflight.get(full_key)) is None:
+            task = asyncio.create_task(
+                self._produce_shared(namespace, key, producer, ttl)
+            )
+            Cache._inflight[full_key] = task
+            task.add_done_callback(
+                lambda _: Cache._inflight.pop(full_key, None)
+            )
+
+        # the cancelled caller does not cancel others
+        return await asyncio.shield(task)
+
+    async def _cached_entry(self, namespace: str, key: str) -> dict | None:
+        try:
+            entry = await self.get(namespace, key)
+        except errors.NotFoundError:
+            return None
+        except ValueError as error:
+            logger.warning(f"Broken cache entry {namespace}:{key}: {error}")
+            return None
+
+        if not isinstance(entry, dict) or "fresh_until" not in entry:
+            return None
+        else:
+            return entry
+
+    @classmethod
+    async def _produce_shared(
+        cls,
+        namespace: str,
+        key: str,
+        producer: Callable[[], Awaitable[Any]],
+        ttl: int,
+    ) -> Any:
+        async with cls() as cache:
+            return await cache._get_or_produce(namespace, key, producer, ttl)
+
+    async def _version(self, namespace: str, key: str) -> int:
+        return await self.incr(f"{namespace}:version", key, delta=0)
+
+    async def invalidate(self, namespace: str, key: str) -> None:
+        """drop the value of ``get_or_set``.
+
+        NOTES
+            the version is increased before the value is deleted, so
+            the producer that has started earlier does not keep its value.
+        """
+
+        await self.incr(f"{namespace}:version", key)
+        await self.delete(namespace, key)
+
+    async def _get_or_produce(
+        self,
+        namespace: str,
+        key: str,
+        producer: Callable[[], Awaitable[Any]],
+        ttl: int,
+    ) -> Any:
+        entry = await self._cached_entry(namespace, key)
+
+        if entry is not None and (
+            entry["fresh_until"] is None or entry["fresh_until"] > time.time()
+        ):
+            return entry["value"]
+
+        lease_namespace = f"{namespace}:lease"
+        leased = await self.add(
+            lease_namespace, key, True, ttl=settings.cache.lease_ttl
+        )
+
+        if not leased:
+            if entry is not None:
+                return entry["value"]
+
+            # wait for the leaseholder. produce the value if it has failed
+            deadline = time.monotonic() + settings.cache.lease_ttl
+            while time.monotonic() < deadline:
+                await asyncio.sleep(LEASE_POLL_INTERVAL)
+                if (
+                    entry := await self._cached_entry(namespace, key)
+                ) is not None:
+                    return entry["value"]
+
+        try:
+            version = await self._version(namespace, key)
+            value = await producer()
+
+            if await self._version(namespace, key) == version:
+                await self.set(
+                    namespace,
+                    key,
+                    {
+                        "fresh_until": time.time() + ttl if ttl else None,
+                        "value": value,
+                    },
+                    ttl=ttl + settings.cache.stale_ttl if ttl else 0,
+                )
+                # the invalidation between the check and the write
+                if await self._version(namespace, key) != version:
+                    await self.delete(namespace, key)
+        finally:
+            if leased:
+                await self.delete(lease_namespace, key)
+
+        return value
+
+    async def delete(self, namespace: str, key: str) -> bool:
+        return bool(await self.delete_many(namespace, [key]))
+
+    async def get_many(
+        self, namespace: str, keys: Iterable[str]
+    ) -> dict[str, Any]:
+        """get values by keys with a single backend request.
+
+        NOTES
+            missing and broken values are not included in results.
+        """
+
+        keys = list(dict.fromkeys(keys))
+        ttl = self._local_ttl(namespace)
+        found: dict[str, tuple[bytes, int]] = {}
+
+        if ttl is not None:
+            for key in keys:
+                if result := self.local().get(f"{namespace}:{key}"):
+                    self._metrics.hit(namespace, key)
+                    found[key] = result
+
+        if missing := [key for key in keys if key not in found]:
+            with self._observe(namespace):
+                values = await self.backend.get_many(
+                    [f"{namespace}:{key}" for key in missing]
+                )
+
+            for key, value in zip(missing, values):
+                if value is None:
+                    Cache._remote_misses += 1
+                    self._metrics.miss(namespace, key)
+                    continue
+
+                Cache._remote_hits += 1
+                self._metrics.hit(namespace, key)
+                found[key] = value
+
+                if ttl is not None:
+                    self.local().set(f"{namespace}:{key}", *value, ttl=ttl)
+
+        return self._decode_many(namespace, found)
+
+    async def set_many(
+        self, namespace: str, items: Mapping[str, Any], ttl: int = 0
+    ) -> bool:
+        """save many values with a single backend request.
+
+        returns:
+            ``True`` if all the values are stored.
+        """
+
+        if not items:
+            return True
+
+        local_ttl = self._local_ttl(namespace)
+        encoded: list[tuple[str, bytes, int]] = []
+
+        for key, value in items.items():
+            full_key = f"{namespace}:{key}"
+            data, flags = codecs.encode(value)
+
+            if local_ttl is not None:
+                self.local().set(
+                    full_key, data, flags, min(local_ttl, ttl or local_ttl)
+                )
+
+            self._metrics.size(namespace, len(data))
+            encoded.append((full_key, data, flags))
+
+        with self._observe(namespace):
+            return all(await self.backend.set_many(encoded, ttl))
+
+    async def delete_many(
+        self, namespace: str, keys: Iterable[str]
+    ) -> frozenset[str]:
+        """delete many values with a single backend request.
+
+        returns:
+            keys that are deleted by this request. each key is deleted
+            only once, so concurrent callers never get the same key.
+        """
+
+        if not (keys := list(keys)):
+            return frozenset()
+
+        full_keys = [f"{namespace}:{key}" for key in keys]
+        for full_key in full_keys:
+            self.local().delete(full_key)
+
+        with self._observe(namespace):
+            deleted = await self.backend.delete_many(full_keys)
+
+        return frozenset(key for key, ok in zip(keys, deleted) if ok)
+
+    async def incr(
+        self, namespace: str, key: str, delta: int = 1, ttl: int = 0
+    ) -> int:
+        """increase the counter atomically and return the new value.
+
+        NOTES
+            the missing counter is created with 0. the local tier is skipped.
+        """
+
+        return (await self.incr_many(namespace, [key], delta, ttl))[key]
+
+    async def incr_many(
+        self,
+        namespace: str,
+        keys: Iterable[str],
+        delta: int = 1,
+        ttl: int = 0,
+    ) -> dict[str, int]:
+        """increase many counters with a single backend request.
+
+        NOTES
+            missing counters are created with 0 and increased again.
+        """
+
+        results: dict[str, int] = {}
+        pending = list(dict.fromkeys(keys))
+
+        while pending:
+            with self._observe(namespace):
+                values = await self.backend.incr_many(
+                    [f"{namespace}:{key}" for key in pending], delta
+                )
+
+            missing: list[str] = []
+            for key, value in zip(pending, values):
+                if value is None:
+                    missing.append(key)
+                else:
+                    results[key] = value
+
+            await self.add_many(namespace, dict.fromkeys(missing, 0), ttl=ttl)
+            pending = missing
+
+        return results
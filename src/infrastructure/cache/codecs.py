@@ -0,0 +1,115 @@
+"""
+values are stored in the cache as bytes. the memcached item ``flags`` field
+identifies how the value is encoded, so the value is always decoded
+by the same codec that has encoded it.
+
+FLAGS LAYOUT
+    the lower byte is the codec id
+    ``COMPRESSED`` bit is set if the payload is compressed with zlib
+
+the payload is compressed only if it is greater than the threshold, since
+small values gain nothing but the CPU cost.
+
+values with zero flags are written by the previous version of the client
+as ``str(dict)``. they are still decoded until they expire.
+"""
+
+import zlib
+from typing import Any, Final, Protocol
+
+import pydantic_core
+
+from src.config import settings
+
+CODEC_MASK: Final = 0xFF
+COMPRESSED: Final = 0x100
+
+# the fastest zlib level. cached payloads are mostly JSON which is
+# compressed well even with that level
+COMPRESSION_LEVEL: Final = 1
+
+
+class Codec(Protocol):
+    """the interface of the cache value codec."""
+
+    flag: int
+
+    def encode(self, value: Any) -> bytes: ...
+
+    def decode(self, data: bytes) -> Any: ...
+
+
+class JsonCodec:
+    """JSON codec based on ``pydantic_core``.
+
+    pydantic models, dataclasses, dates, decimals, sets and tuples
+    are serialized. they are decoded as regular JSON types.
+    """
+
+    flag = 1
+
+    def encode(self, value: Any) -> bytes:
+        return pydantic_core.to_json(value)
+
+    def decode(self, data: bytes) -> Any:
+        return pydantic_core.from_json(data)
+
+
+CODECS: dict[int, Codec] = {}
+DEFAULT_CODEC: Final = JsonCodec()
+
+
+def register_codec(codec: Codec) -> None:
+    """make the codec available to decode values."""
+
+    if not 0 < codec.flag <= CODEC_MASK:
+        raise ValueError(f"Wrong codec flag: {codec.flag}")
+    elif codec.flag in CODECS:
+        raise ValueError(f"Codec flag {codec.flag} is already taken")
+
+    CODECS[codec.flag] = codec
+
+
+def encode(value: Any, codec: Codec = DEFAULT_CODEC) -> tuple[bytes, int]:
+    """encode the value and build ``flags`` for it."""
+
+    try:
+        data = codec.encode(value)
+    except pydantic_core.PydanticSerializationError as error:
+        raise ValueError(f"Can not encode {type(value)}: {error}") from error
+
+    flags = codec.flag
+
+    if len(data) > settings.cache.compression_threshold:
+        data = zlib.compress(data, COMPRESSION_LEVEL)
+        flags |= COMPRESSED
+
+    return data, flags
+
+
+def decode_legacy(data: bytes) -> Any:
+    """decode the value that is stored by the previous client version."""
+
+    try:
+        return pydantic_core.from_json(data.decode().replace("'", '"'))
+    except (UnicodeDecodeError, ValueError) as error:
+        raise ValueError("cache value must be JSON serializable") from error
+
+
+def decode(data: bytes, flags: int) -> Any:
+    """decode the value using the codec identified by ``flags``."""
+
+    if flags == 0:
+        return decode_legacy(data)
+    elif (codec := CODECS.get(flags & CODEC_MASK)) is None:
+        raise ValueError(f"Unrecognized cache flags: {flags}")
+
+    try:
+        if flags & COMPRESSED:
+            data = zlib.decompress(data)
+        return codec.decode(data)
+    except (zlib.error, ValueError) as error:
+        raise ValueError(f"Broken cache value: {error}") from error
+
+
+register_codec(DEFAULT_CODEC)
@@ -0,0 +1,191 @@
+"""
+the in-process LRU cache that sits in front of ``memcached``.
+
+values are kept encoded, so the size of each entry is known and callers
+never share mutable objects through the cache.
+"""
+
+import itertools
+import math
+import time
+from collections import OrderedDict
+from collections.abc import Iterator
+from typing import NamedTuple
+
+from ..entities import InternalData
+
+
+class CacheTierStats(InternalData):
+    """the snapshot of the cache tier counters.
+
+    ARGS
+    ``hits`` - how many lookups found the value
+    ``misses`` - how many lookups found nothing
+    ``evictions`` - how many values are evicted to fit the limits.
+        ``None`` if the tier does not track them (memcached reports
+        its evictions by the ``stats`` command)
+    ``entries`` - the number of values that are stored right now
+    ``size`` - the total size of values. in bytes
+    """
+
+    hits: int
+    misses: int
+    evictions: int | None = None
+    entries: int | None = None
+    size: int | None = None
+
+
+class _Entry(NamedTuple):
+    data: bytes
+    flags: int
+    expires_at: float
+    # changes on each write, like the ``memcached`` cas unique
+    token: int
+
+
+class LocalCache:
+    """LRU cache with TTL bounded by the number of entries and bytes.
+
+    NOTES
+        it is not shared between workers. expired entries are removed
+        lazily on the lookup or evicted by the LRU order.
+
+        operations never await, so each of them is atomic for
+        the event loop. it is not thread-safe.
+    """
+
+    def __init__(self, max_entries: int, max_bytes: int) -> None:
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+
+        self._entries: OrderedDict[str, _Entry] = OrderedDict()
+        self._tokens = itertools.count(1)
+        self._size = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def _alive(self, key: str) -> _Entry | None:
+        if (entry := self._entries.get(key)) is None:
+            return None
+        elif entry.expires_at <= time.monotonic():
+            self._remove(key)
+            return None
+        else:
+            return entry
+
+    def get(self, key: str) -> tuple[bytes, int] | None:
+        if (entry := self._alive(key)) is None:
+            self._misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self._hits += 1
+
+        return entry.data, entry.flags
+
+    def peek(self, key: str) -> tuple[bytes, int] | None:
+        """get the value without updating the LRU order and stats."""
+
+        if (entry := self._alive(key)) is None:
+            return None
+        else:
+            return entry.data, entry.flags
+
+    def gets(self, key: str) -> tuple[bytes, int, int] | None:
+        """get the value with the token for ``cas``."""
+
+        if (entry := self._alive(key)) is None:
+            return None
+        else:
+            return entry.data, entry.flags, entry.token
+
+    def cas(
+        self, key: str, data: bytes, flags: int, ttl: int, token: int
+    ) -> bool:
+        """save the value only if it is not changed since ``gets``."""
+
+        if (entry := self._alive(key)) is None or entry.token != token:
+            return False
+        else:
+            return self.set(key, data, flags, ttl)
+
+    def keys(self) -> Iterator[str]:
+        """keys of values that are not expired."""
+
+        for key in list(self._entries):
+            if self._alive(key) is not None:
+                yield key
+
+    def set(self, key: str, data: bytes, flags: int, ttl: int) -> bool:
+        """save the value. ``ttl`` is in seconds, 0 means 'no expiration'.
+
+        returns:
+            ``False`` if the value is greater than the limit.
+        """
+
+        self.delete(key)
+
+        # the value would evict everything else
+        if len(data) > self.max_bytes:
+            return False
+
+        expires_at = time.monotonic() + ttl if ttl else math.inf
+        self._entries[key] = _Entry(
+            data, flags, expires_at, next(self._tokens)
+        )
+        self._size += len(data)
+
+        while (
+            len(self._entries) > self.max_entries
+            or self._size > self.max_bytes
+        ):
+            self._remove(next(iter(self._entries)))
+            self._evictions += 1
+
+        return True
+
+    def incr(self, key: str, delta: int) -> int | None:
+        """increase the decimal value keeping its flags and expiration.
+
+        returns:
+            ``None`` if the value does not exist.
+        """
+
+        if (entry := self._alive(key)) is None:
+            return None
+        elif not entry.data.isdigit():
+            raise ValueError(f"Can not increase {key}: not a number")
+
+        value = int(entry.data) + delta
+        data = str(value).encode()
+
+        self._size += len(data) - len(entry.data)
+        self._entries[key] = entry._replace(
+            data=data, token=next(self._tokens)
+        )
+
+        return value
+
+    def delete(self, key: str) -> bool:
+        if self._alive(key) is None:
+            return False
+
+        self._remove(key)
+        return True
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._size = 0
+
+    def _remove(self, key: str) -> None:
+        self._size -= len(self._entries.pop(key).data)
+
+    def stats(self) -> CacheTierStats:
+        return CacheTierStats(
+            hits=self._hits,
+            misses=self._misses,
+            evictions=self._evictions,
+            entries=len(self._entries),
+            size=self._size,
+        )
@@ -0,0 +1,174 @@
+"""
+per-namespace metrics of the cache usage.
+
+metrics are collected by each worker in memory, so they are cheap to record
+and are reported for the worker that serves the request.
+
+HISTOGRAMS
+    each bucket counts values that are less or equal to its upper bound.
+    the last bucket ``+Inf`` counts everything else
+"""
+
+from collections import Counter
+from typing import Final
+
+from ..entities import InternalData
+
+# seconds
+LATENCY_BUCKETS: Final = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.5)
+
+# bytes
+SIZE_BUCKETS: Final = (128, 1024, 4096, 16 * 1024, 64 * 1024, 256 * 1024)
+
+# the number of the most requested keys in the report
+HOT_KEYS_LIMIT: Final = 10
+
+# the number of tracked keys. the least requested are dropped above it
+HOT_KEYS_TRACKED: Final = 1000
+
+
+class CacheNamespaceStats(InternalData):
+    """the snapshot of the namespace metrics.
+
+    ARGS
+    ``requests`` - the number of ``memcached`` requests
+    ``latency`` - the histogram of ``memcached`` requests time. in seconds
+    ``latency_p50``, ``latency_p99`` - bucket upper bounds of percentiles
+    ``sizes`` - the histogram of written values sizes. in bytes
+    ``size_total`` - the total size of written values. in bytes
+    ``hot_keys`` - the most requested keys with the number of lookups
+    """
+
+    namespace: str
+    hits: int
+    misses: int
+    errors: int
+    hit_ratio: float | None
+    requests: int
+    latency: dict[str, int]
+    latency_total: float
+    latency_p50: float | None
+    latency_p99: float | None
+    sizes: dict[str, int]
+    size_total: int
+    hot_keys: list[tuple[str, int]]
+
+
+def _bucket(bounds: tuple[float, ...], value: float) -> int:
+    for index, bound in enumerate(bounds):
+        if value <= bound:
+            return index
+
+    return len(bounds)
+
+
+def _histogram(bounds: tuple[float, ...], counts: list[int]) -> dict:
+    return {
+        **{str(bound): count for bound, count in zip(bounds, counts)},
+        "+Inf": counts[-1],
+    }
+
+
+def _percentile(
+    bounds: tuple[float, ...], counts: list[int], q: float
+) -> float | None:
+    """the upper bound of the bucket that includes the percentile."""
+
+    if not (total := sum(counts)):
+        return None
+
+    seen = 0
+    for bound, count in zip((*bounds, float("inf")), counts):
+        seen += count
+        if seen >= total * q:
+            return bound
+
+    return None
+
+
+class _NamespaceMetrics:
+    def __init__(self) -> None:
+        self.hits = 0
+        self.misses = 0
+        self.errors = 0
+        self.latency = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.latency_total = 0.0
+        self.sizes = [0] * (len(SIZE_BUCKETS) + 1)
+        self.size_total = 0
+        self.keys: Counter[str] = Counter()
+
+    def lookup(self, key: str) -> None:
+        self.keys[key] += 1
+
+        if len(self.keys) > HOT_KEYS_TRACKED:
+            self.keys = Counter(
+                dict(self.keys.most_common(HOT_KEYS_TRACKED // 2))
+            )
+
+
+class CacheMetrics:
+    """metrics of all the namespaces."""
+
+    def __init__(self) -> None:
+        self._namespaces: dict[str, _NamespaceMetrics] = {}
+
+    def _get(self, namespace: str) -> _NamespaceMetrics:
+        if (metrics := self._namespaces.get(namespace)) is None:
+            metrics = self._namespaces[namespace] = _NamespaceMetrics()
+
+        return metrics
+
+    def hit(self, namespace: str, key: str) -> None:
+        metrics = self._get(namespace)
+        metrics.hits += 1
+        metrics.lookup(key)
+
+    def miss(self, namespace: str, key: str) -> None:
+        metrics = self._get(namespace)
+        metrics.misses += 1
+        metrics.lookup(key)
+
+    def error(self, namespace: str) -> None:
+        self._get(namespace).errors += 1
+
+    def latency(self, namespace: str, seconds: float) -> None:
+        metrics = self._get(namespace)
+        metrics.latency[_bucket(LATENCY_BUCKETS, seconds)] += 1
+        metrics.latency_total += seconds
+
+    def size(self, namespace: str, size: int) -> None:
+        metrics = self._get(namespace)
+        metrics.sizes[_bucket(SIZE_BUCKETS, size)] += 1
+        metrics.size_total += size
+
+    def reset(self) -> None:
+        self._namespaces.clear()
+
+    def stats(self) -> tuple[CacheNamespaceStats, ...]:
+        results: list[CacheNamespaceStats] = []
+
+        for namespace, metrics in sorted(self._namespaces.items()):
+            lookups = metrics.hits + metrics.misses
+            results.append(
+                CacheNamespaceStats(
+                    namespace=namespace,
+                    hits=metrics.hits,
+                    misses=metrics.misses,
+                    errors=metrics.errors,
+                    hit_ratio=metrics.hits / lookups if lookups else None,
+                    requests=sum(metrics.latency),
+                    latency=_histogram(LATENCY_BUCKETS, metrics.latency),
+                    latency_total=metrics.latency_total,
+                    latency_p50=_percentile(
+                        LATENCY_BUCKETS, metrics.latency, 0.5
+                    ),
+                    latency_p99=_percentile(
+                        LATENCY_BUCKETS, metrics.latency, 0.99
+                    ),
+                    sizes=_histogram(SIZE_BUCKETS, metrics.sizes),
+                    size_total=metrics.size_total,
+                    hot_keys=metrics.keys.most_common(HOT_KEYS_LIMIT),
+                )
+            )
+
+        return tuple(results)
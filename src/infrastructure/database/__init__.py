@@ -1,9 +1,12 @@
 __all__ = (
+    "BankAccountSync",
+    "BankTransaction",
     "Base",
     "Cost",
     "CostCategory",
     "CostShortcut",
     "Currency",
+    "EquityChange",
     "Exchange",
     "Income",
     "Repository",
@@ -16,11 +19,14 @@ __all__ = (
 from .cqs import transaction
 from .repository import Repository
 from .tables import (
+    BankAccountSync,
+    BankTransaction,
     Base,
     Cost,
     CostCategory,
     CostShortcut,
     Currency,
+    EquityChange,
     Exchange,
     Income,
     Table,
@@ -12,15 +12,18 @@ data concurrently.
 IMPORTANT: the CQS is a lowes level to access the data from the database.
 """
 
+import asyncio
 from collections.abc import AsyncGenerator
 from contextlib import asynccontextmanager
 from contextvars import ContextVar
-from typing import Self
+from typing import ClassVar, Self
 
 from loguru import logger
+from sqlalchemy import Executable, Result, text
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from src.config import settings
 from src.infrastructure import errors
 
 from .session import session_factoy
@@ -98,9 +101,44 @@ class Command:
 
 
 class Query:
+    """cqs 'Query' non-data descriptor
+
+    usage:
+        ```py
+        # a single query
+        async with self.query.session as session:
+            result: Result = await session.execute(select(database.Table))
+
+        # independent queries over the same snapshot of data
+        first, second = await self.query.execute_concurrently(
+            select(database.Table), select(database.AnotherTable)
+        )
+        ```
+    """
+
+    # extra connections that are held by ``execute_concurrently`` calls
+    _reserved: ClassVar[int] = 0
+
     def __get__(self, instance, owner) -> Self:
         return self
 
+    @classmethod
+    def _reserve(cls, connections: int) -> bool:
+        """take all the connections of the group or nothing.
+
+        NOTES
+            the group never holds a part of connections while waiting
+            for the rest, so concurrent groups do not starve the pool.
+        """
+
+        if cls._reserved + connections > (
+            settings.database.concurrent_connections
+        ):
+            return False
+
+        cls._reserved += connections
+        return True
+
     @property
     @asynccontextmanager
     async def session(self) -> AsyncGenerator[AsyncSession, None]:
@@ -122,3 +160,82 @@ class Query:
             raise errors.DatabaseError(str(error)) from error
         finally:
             await session.close()
+
+    async def execute_concurrently(
+        self, *statements: Executable
+    ) -> tuple[Result, ...]:
+        """execute independent read statements on separate connections.
+
+        WORKFLOW
+            1. the 'leader' session opens the REPEATABLE READ transaction
+                and exports its snapshot with ``pg_export_snapshot()``
+            2. each other statement is executed by the 'worker' session
+                that imports the snapshot with ``SET TRANSACTION SNAPSHOT``
+            3. the leader keeps its transaction open until all workers
+                are done, since the snapshot lives only while it is open
+
+        NOTES
+            all the results are mutually consistent as if they were
+            executed within the single transaction, but the latency is
+            equal to the slowest statement instead of their sum.
+
+            each other statement takes the extra connection from the pool.
+            if ``settings.database.concurrent_connections`` are held by
+            other calls, statements are executed one by one by the leader
+            within the same snapshot.
+        """
+
+        if not statements:
+            return ()
+
+        async with self.session as leader:
+            async with leader.begin():
+                await leader.execute(
+                    text(
+                        "SET TRANSACTION ISOLATION LEVEL REPEATABLE READ "
+                        "READ ONLY"
+                    )
+                )
+                snapshot_id: str = (
+                    await leader.execute(text("SELECT pg_export_snapshot()"))
+                ).scalar_one()
+
+                first, *others = statements
+
+                if not self._reserve(len(others)):
+                    return tuple(
+                        [await leader.execute(item) for item in statements]
+                    )
+
+                try:
+                    return tuple(
+                        await asyncio.gather(
+                            leader.execute(first),
+                            *(
+                                self._execute_in_snapshot(item, snapshot_id)
+                                for item in others
+                            ),
+                        )
+                    )
+                finally:
+                    Query._reserved -= len(others)
+
+    async def _execute_in_snapshot(
+        self, statement: Executable, snapshot_id: str
+    ) -> Result:
+        """execute the statement within the exported snapshot."""
+
+        async with self.session as session:
+            async with session.begin():
+                await session.execute(
+                    text(
+                        "SET TRANSACTION ISOLATION LEVEL REPEATABLE READ "
+                        "READ ONLY"
+                    )
+                )
+                # the snapshot id is generated by the database itself
+                await session.execute(
+                    text(f"SET TRANSACTION SNAPSHOT '{snapshot_id}'")
+                )
+
+                return await session.execute(statement)
@@ -1,4 +1,7 @@
-from sqlalchemy import Result, Select, func, select
+from collections.abc import AsyncGenerator, Sequence
+
+from sqlalchemy import Result, Row, Select, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.infrastructure import errors
 
@@ -106,3 +109,37 @@ class Repository:
             query = query.limit(limit)
 
         return query
+
+    async def _keyset_chunks(
+        self, session: AsyncSession, query: Select, /, key, chunk_size: int
+    ) -> AsyncGenerator[Sequence[Row], None]:
+        """iterate over the query results by chunks using keyset pagination.
+
+        params:
+            ``query`` - the ``key`` column must be selected first
+            ``key`` - the unique column to order and paginate by
+
+        notes:
+            unlike ``OFFSET`` each chunk is fetched with the index scan
+            starting after the last key, so the memory is bounded by
+            the chunk size and the cost does not grow with the table.
+        """
+
+        if chunk_size <= 0:
+            raise ValueError("Wrong ``chunk_size`` on keyset pagination")
+
+        last_key = None
+
+        while True:
+            chunk_query = query.order_by(key).limit(chunk_size)
+            if last_key is not None:
+                chunk_query = chunk_query.where(key > last_key)
+
+            rows = (await session.execute(chunk_query)).all()
+            if rows:
+                yield rows
+
+            if len(rows) < chunk_size:
+                break
+            else:
+                last_key = rows[-1][0]
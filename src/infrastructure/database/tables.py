@@ -18,8 +18,10 @@ from typing import TypeVar
 
 from sqlalchemy import (
     DATE,
+    BigInteger,
     Boolean,
     ForeignKey,
+    Index,
     Integer,
     MetaData,
     String,
@@ -143,7 +145,10 @@ class Currency(Base, DefaultColumnsMixin):
     params:
         ``name`` - 'USD'
         ``sign`` - '$'
-        ``equity`` - 10000 which is 100$. in CENTS
+        ``equity`` - 10000 which is 100$. in CENTS. the checkpoint.
+            pending changes are stored in the ``equity_changes`` table
+        ``opening_equity`` - the equity before any transaction. in CENTS.
+            it is used to reconcile the equity with transactions
     """
 
     __tablename__ = "currencies"
@@ -151,6 +156,7 @@ class Currency(Base, DefaultColumnsMixin):
     name: Mapped[str] = mapped_column(unique=True)
     sign: Mapped[str] = mapped_column(String(1), unique=True)
     equity: Mapped[int] = mapped_column(default=0)
+    opening_equity: Mapped[int] = mapped_column(default=0, server_default="0")
 
     costs: "Mapped[list[Cost]]" = relationship(
         "Cost", viewonly=True, uselist=True
@@ -169,6 +175,27 @@ class Currency(Base, DefaultColumnsMixin):
     )
 
 
+class EquityChange(Base, DefaultColumnsMixin):
+    """table includes 'equity changes' ledger.
+
+    each transaction appends the row instead of updating the
+    ``currencies.equity`` so concurrent writes in the same currency do not
+    wait for the same row lock. the compaction job folds rows into
+    the ``currencies.equity`` which is used as a checkpoint.
+
+    params:
+        ``currency_id`` - the currency of the change
+        ``delta`` - -10000 if 100$ are spent. in CENTS
+    """
+
+    __tablename__ = "equity_changes"
+
+    delta: Mapped[int]
+    currency_id: Mapped[int] = mapped_column(
+        ForeignKey("currencies.id", ondelete="RESTRICT"), index=True
+    )
+
+
 class CostCategory(Base, DefaultColumnsMixin):
     """table includes 'cost categories'.
 
@@ -424,3 +451,56 @@ class CostShortcut(Base, DefaultColumnsMixin):
             raise ValueError("Cost value must be >= 0")
         else:
             return address
+
+
+class BankTransaction(Base):
+    """table includes 'bank transactions' imported from Monobank.
+
+    the table is the local copy of bank statements, so lookups compare
+    transactions without requesting the bank again.
+
+    params:
+        ``id`` - the Monobank transaction id 'ZuHWzqkKGVo='
+        ``user_id`` - the owner of the API key
+        ``account_id`` - the Monobank account id 'kKGVoZuHWzqVoZuH'
+        ``time`` - the operation time. unix timestamp
+        ``amount`` - -95000 if 950 UAH are spent. in CENTS of the operation
+        ``currency_code`` - the operation currency. ISO 4217 code: 980
+        ``description`` - 'Some name'
+    """
+
+    __tablename__ = "bank_transactions"
+
+    id: Mapped[str] = mapped_column(String(64), primary_key=True)
+    account_id: Mapped[str] = mapped_column(String(64))
+    time: Mapped[int] = mapped_column(BigInteger)
+    amount: Mapped[int] = mapped_column(BigInteger)
+    currency_code: Mapped[int]
+    description: Mapped[str | None] = mapped_column(default=None)
+
+    user_id: Mapped[int] = mapped_column(
+        ForeignKey("users.id", ondelete="RESTRICT")
+    )
+
+    __table_args__ = (
+        Index("ix_bank_transactions_user_id_time", "user_id", "time"),
+    )
+
+
+class BankAccountSync(Base):
+    """table includes the 'sync watermark' of each bank account.
+
+    transactions of the account are imported for the whole range
+    between ``synced_from`` and ``synced_until`` (unix timestamps),
+    so only the rest of the requested range is fetched from the bank.
+    """
+
+    __tablename__ = "bank_account_syncs"
+
+    account_id: Mapped[str] = mapped_column(String(64), primary_key=True)
+    synced_from: Mapped[int] = mapped_column(BigInteger)
+    synced_until: Mapped[int] = mapped_column(BigInteger)
+
+    user_id: Mapped[int] = mapped_column(
+        ForeignKey("users.id", ondelete="RESTRICT"), index=True
+    )
@@ -3,13 +3,15 @@ __all__ = (
     "BadRequestError",
     "BaseError",
     "DatabaseError",
+    "IntegrationError",
     "NotFoundError",
+    "PermissionDeniedError",
+    "RateLimitError",
     "UnprocessableRequestError",
     "base_error_handler",
     "database_error_handler",
     "fastapi_http_exception_handler",
     "not_implemented_error_handler",
-    "rate_limit_exceeded_handler",
     "unhandled_error_handler",
     "unprocessable_entity_error_handler",
     "value_error_handler",
@@ -20,7 +22,10 @@ from .exceptions import (
     BadRequestError,
     BaseError,
     DatabaseError,
+    IntegrationError,
     NotFoundError,
+    PermissionDeniedError,
+    RateLimitError,
     UnprocessableRequestError,
 )
 from .handlers import (
@@ -28,7 +33,6 @@ from .handlers import (
     database_error_handler,
     fastapi_http_exception_handler,
     not_implemented_error_handler,
-    rate_limit_exceeded_handler,
     unhandled_error_handler,
     unprocessable_entity_error_handler,
     value_error_handler,
@@ -75,6 +75,36 @@ class AuthenticationError(BaseError):
         )
 
 
+class PermissionDeniedError(BaseError):
+    def __init__(self, message="Permission denied") -> None:
+        """the user is authenticated but is not allowed to do that."""
+
+        super().__init__(
+            message=message,
+            status_code=status.HTTP_403_FORBIDDEN,
+        )
+
+
+class RateLimitError(BaseError):
+    def __init__(self, message="Too many requests") -> None:
+        """the client has exceeded the rate limit of the operation."""
+
+        super().__init__(
+            message=message,
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+        )
+
+
+class IntegrationError(BaseError):
+    def __init__(self, message="External service is not available") -> None:
+        """the external service (the bank API) has failed the request."""
+
+        super().__init__(
+            message=message,
+            status_code=status.HTTP_502_BAD_GATEWAY,
+        )
+
+
 class DatabaseError(BaseError):
     def __init__(self, message="Database error") -> None:
         """Any internally defined database error
@@ -8,6 +8,9 @@ from loguru import logger
 
 from src.config import settings
 
+from . import security
+from .cache import Cache
+
 
 async def check_database_connection() -> None:
     try:
@@ -49,7 +52,25 @@ async def lifespan_event(_: FastAPI):
 
     await asyncio.gather(
         check_database_connection(),
-        check_cache_connection(),
+        *(
+            (check_cache_connection(),)
+            if settings.cache.backend == "memcached"
+            else ()
+        ),
     )
+    await Cache.connect()
 
     yield
+
+    if stats := Cache.pool_stats():
+        logger.info(f"Cache connections pool: {stats.model_dump()}")
+
+    for tier, tier_stats in Cache.tier_stats().items():
+        logger.info(f"Cache {tier} tier: {tier_stats.model_dump()}")
+
+    await Cache.disconnect()
+
+    security.shutdown_password_hashing()
+    logger.info(
+        f"Password hashing: {security.password_hashing_stats().model_dump()}"
+    )
@@ -0,0 +1,143 @@
+"""
+the rate limiter that is shared by all the workers.
+
+ALGORITHM
+    the sliding window is approximated by 2 fixed windows:
+        estimated = previous * (1 - elapsed / period) + current
+    where ``elapsed`` is the time passed in the current window.
+    counters are memcached keys that are increased atomically by ``incr``,
+    so the limit holds for any number of workers.
+
+LOCAL FAST PATH
+    the previous window count does not change once the window is over,
+    so it is requested once per window and kept by the worker.
+    the client that is over the limit is rejected by the worker without
+    the network until the estimation allows the next request.
+    so the regular check takes a single ``incr`` request.
+"""
+
+import time
+from collections.abc import Awaitable, Callable
+from typing import Final
+
+from fastapi import Request
+from loguru import logger
+
+from . import errors
+from .cache import Cache
+from .entities import InternalData
+
+RATE_LIMIT_CACHE_NAMESPACE: Final = "fambb_rate_limit"
+
+# previous windows counts that are kept by the worker
+_PREVIOUS_WINDOWS_LIMIT: Final = 10_000
+
+
+class RateLimit(InternalData):
+    """``limit`` requests per ``period`` seconds."""
+
+    limit: int
+    period: int
+
+
+class RateLimiter:
+    """the rate limiter of the worker.
+
+    NOTES
+        if the cache is not available requests are allowed, since
+        rejecting them would make the whole API unavailable.
+    """
+
+    def __init__(self) -> None:
+        # previous windows counts by the window key
+        self._previous: dict[str, int] = {}
+        # rejected clients by the limit key. the time (epoch) till that
+        self._blocked: dict[str, float] = {}
+
+    def _forget(self, now: float) -> None:
+        """drop the state that is not actual anymore."""
+
+        self._blocked = {
+            key: till for key, till in self._blocked.items() if till > now
+        }
+        if len(self._previous) > _PREVIOUS_WINDOWS_LIMIT:
+            self._previous.clear()
+
+    async def _previous_count(
+        self, cache: Cache, key: str, window: int
+    ) -> int:
+        window_key = f"{key}:{window - 1}"
+
+        if (count := self._previous.get(window_key)) is None:
+            try:
+                count = int(
+                    await cache.get(RATE_LIMIT_CACHE_NAMESPACE, window_key)
+                )
+            except errors.NotFoundError:
+                count = 0
+            self._previous[window_key] = count
+
+        return count
+
+    async def hit(self, key: str, rate: RateLimit) -> bool:
+        """count the request. ``False`` if the limit is exceeded."""
+
+        now = time.time()
+        key = f"{key}:{rate.limit}/{rate.period}"
+
+        if self._blocked.get(key, 0) > now:
+            return False
+
+        window, offset = divmod(now, rate.period)
+        window = int(window)
+        elapsed = offset / rate.period
+
+        try:
+            async with Cache() as cache:
+                current = await cache.incr(
+                    RATE_LIMIT_CACHE_NAMESPACE,
+                    f"{key}:{window}",
+                    ttl=2 * rate.period,
+                )
+                previous = await self._previous_count(cache, key, window)
+        except Exception as error:
+            logger.warning(f"Rate limit {key} is not checked: {error}")
+            return True
+
+        if previous * (1 - elapsed) + current <= rate.limit:
+            return True
+
+        # the estimation goes down only with the previous window weight.
+        # the next request is allowed once it fits the limit
+        if previous and current + 1 <= rate.limit:
+            wait = 1 - elapsed - (rate.limit - current - 1) / previous
+            till = now + max(wait, 0) * rate.period
+        else:
+            till = (window + 1) * rate.period
+
+        self._forget(now)
+        self._blocked[key] = till
+
+        return False
+
+
+limiter = RateLimiter()
+
+
+def rate_limit(
+    name: str, *rates: RateLimit
+) -> Callable[[Request], Awaitable[None]]:
+    """FastAPI dependency that limits requests by the client address.
+
+    USAGE
+    >>> @router.post("/tokens", dependencies=[Depends(rate_limit("login", RateLimit(limit=5, period=60)))])
+    """  # noqa: E501
+
+    async def dependency(request: Request) -> None:
+        client = request.client.host if request.client else "unknown"
+
+        for rate in rates:
+            if not await limiter.hit(f"{name}:{client}", rate):
+                raise errors.RateLimitError
+
+    return dependency
@@ -7,10 +7,21 @@ REASONING
 
 NOTES
 (1) Password hashing Argon2 is used as an OWASP recommendation
+(2) Argon2 takes tens of milliseconds of CPU by design. async handlers
+    use ``*_async`` functions that run it in the dedicated threads,
+    so the event loop keeps serving other requests
+(3) the same access token is sent with many requests, so claims of
+    verified tokens are kept by the worker until they expire
 """
 
+import asyncio
 import hashlib
+import secrets
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
+from typing import Callable, TypeVar
 
 import jwt
 from argon2 import PasswordHasher
@@ -18,8 +29,12 @@ from argon2.exceptions import VerifyMismatchError
 
 from src.config import settings
 
+from .entities import InternalData
+
 _password_hasher = PasswordHasher()
 
+_T = TypeVar("_T")
+
 
 def hash_password(password: str) -> str:
     """Hash a password using Argon2"""
@@ -38,54 +53,269 @@ def verify_password(password: str, password_hash: str) -> bool:
         return True
 
 
-def create_access_token(user_id: int) -> str:
-    """Create a JWT access token with short expiry"""
+class PasswordHashingStats(InternalData):
+    """the snapshot of the password hashing threads usage.
+
+    ARGS
+    ``workers`` - the number of threads
+    ``in_progress`` - calls that are submitted to threads
+    ``waiting`` - calls that wait for the concurrency slot
+    ``calls`` - the total number of finished calls
+    ``queue_time_total`` - the total time from the call to the start
+        of hashing in the thread. in seconds
+    ``queue_time_max`` - the longest queue time. in seconds
+    ``run_time_total`` - the total time of hashing. in seconds
+    """
+
+    workers: int
+    in_progress: int
+    waiting: int
+    calls: int
+    queue_time_total: float
+    queue_time_max: float
+    run_time_total: float
+
+
+class _PasswordHashingPool:
+    """threads for the CPU-bound password hashing.
+
+    NOTES
+        Argon2 releases the GIL, so threads run in parallel.
+        the semaphore is created for the running event loop.
+    """
+
+    def __init__(self) -> None:
+        self._executor: ThreadPoolExecutor | None = None
+        self._semaphore: asyncio.Semaphore | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+
+        self._in_progress = 0
+        self._waiting = 0
+        self._calls = 0
+        self._queue_time_total = 0.0
+        self._queue_time_max = 0.0
+        self._run_time_total = 0.0
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=settings.auth.hashing_workers,
+                thread_name_prefix="password-hashing",
+            )
+
+        return self._executor
+
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+
+        if self._semaphore is None or self._loop is not loop:
+            self._semaphore = asyncio.Semaphore(
+                settings.auth.hashing_concurrency
+            )
+            self._loop = loop
+
+        return self._semaphore
+
+    async def run(self, func: Callable[..., _T], *args) -> _T:
+        """call the function in the thread once the concurrency slot
+        is available.
+
+        NOTES
+            the slot is released when the thread finishes, even if
+            the caller is cancelled, so the limit is never exceeded.
+        """
+
+        loop = asyncio.get_running_loop()
+        semaphore = self._get_semaphore()
+        called = time.perf_counter()
+        started: float | None = None
+        ended = called
+
+        def measured() -> _T:
+            nonlocal started, ended
+            started = time.perf_counter()
+            try:
+                return func(*args)
+            finally:
+                ended = time.perf_counter()
+
+        def finished() -> None:
+            self._in_progress -= 1
+            semaphore.release()
+
+            if started is not None:
+                self._calls += 1
+                self._queue_time_total += started - called
+                self._queue_time_max = max(
+                    self._queue_time_max, started - called
+                )
+                self._run_time_total += ended - started
+
+        self._waiting += 1
+        try:
+            await semaphore.acquire()
+        finally:
+            self._waiting -= 1
+
+        self._in_progress += 1
+        try:
+            future = self._get_executor().submit(measured)
+        except BaseException:
+            # i.e. the executor is shut down. nothing will be finished
+            self._in_progress -= 1
+            semaphore.release()
+            raise
+
+        future.add_done_callback(lambda _: loop.call_soon_threadsafe(finished))
+
+        return await asyncio.wrap_future(future)
+
+    def stats(self) -> PasswordHashingStats:
+        return PasswordHashingStats(
+            workers=settings.auth.hashing_workers,
+            in_progress=self._in_progress,
+            waiting=self._waiting,
+            calls=self._calls,
+            queue_time_total=self._queue_time_total,
+            queue_time_max=self._queue_time_max,
+            run_time_total=self._run_time_total,
+        )
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+
+_hashing_pool = _PasswordHashingPool()
+
+
+async def hash_password_async(password: str) -> str:
+    """Hash a password using Argon2 in the hashing threads"""
+
+    return await _hashing_pool.run(hash_password, password)
+
+
+async def verify_password_async(password: str, password_hash: str) -> bool:
+    """Verify a password against its hash in the hashing threads"""
+
+    return await _hashing_pool.run(verify_password, password, password_hash)
+
+
+def password_hashing_stats() -> PasswordHashingStats:
+    return _hashing_pool.stats()
+
+
+def shutdown_password_hashing() -> None:
+    """wait for running calls and stop the hashing threads."""
+
+    _hashing_pool.shutdown()
+
+
+def new_session_id() -> str:
+    """Generate the id of the login session"""
+
+    return secrets.token_urlsafe(16)
+
+
+def create_access_token(user_id: int, session: str | None = None) -> str:
+    """Create a JWT access token with short expiry
+
+    NOTES
+    (1) ``session`` links the token to the refresh token session,
+        so it is rejected once the session is revoked
+    """
 
     expire = datetime.now(timezone.utc) + timedelta(
         minutes=settings.auth.access_token_expire_minutes
     )
+    payload: dict = {
+        "sub": str(user_id),
+        "exp": expire,
+        "type": "access",
+    }
+    if session is not None:
+        payload["sid"] = session
 
     return jwt.encode(
-        {
-            "sub": str(user_id),
-            "exp": expire,
-            "type": "access",
-        },
+        payload,
         settings.auth.secret_key,
         algorithm=settings.auth.algorithm,
     )
 
 
-def create_refresh_token(user_id: int) -> str:
-    """Create a JWT refresh token with longer expiry (7 days by default)"""
+def create_refresh_token(
+    user_id: int,
+    session: str | None = None,
+    expires_at: datetime | None = None,
+) -> str:
+    """Create a JWT refresh token with longer expiry (7 days by default)
 
-    expires_at = datetime.now(timezone.utc) + timedelta(
-        days=settings.auth.refresh_token_expire_days
-    )
+    NOTES
+    (1) ``jti`` makes each token unique, so rotated tokens of the same
+        session never match each other
+    (2) rotated tokens keep ``expires_at`` of the session
+    """
+
+    if expires_at is None:
+        expires_at = datetime.now(timezone.utc) + timedelta(
+            days=settings.auth.refresh_token_expire_days
+        )
+
+    payload: dict = {
+        "sub": str(user_id),
+        "exp": expires_at,
+        "type": "refresh",
+        "jti": secrets.token_urlsafe(8),
+    }
+    if session is not None:
+        payload["sid"] = session
 
     return jwt.encode(
-        {
-            "sub": str(user_id),
-            "exp": expires_at,
-            "type": "refresh",
-        },
+        payload,
         settings.auth.secret_key,
         algorithm=settings.auth.algorithm,
     )
 
 
+# verified claims by the token digest. the most recently used are last
+_claims_cache: OrderedDict[bytes, dict] = OrderedDict()
+
+
 def decode_token(token: str) -> dict:
     """Decode and validate a JWT token.
 
     ERRORS
     (1) jwt.ExpiredSignatureError: if token has expired
     (2) jwt.InvalidTokenError: if token is invalid
+
+    NOTES
+    (1) claims are cached by the digest of the whole token, so the
+        token that differs in any byte is verified again
+    (2) the copy is returned, so callers can not change cached claims
     """
 
-    return jwt.decode(
+    key = hashlib.blake2b(token.encode(), digest_size=16).digest()
+
+    if (claims := _claims_cache.get(key)) is not None:
+        if claims["exp"] <= time.time():
+            del _claims_cache[key]
+            raise jwt.ExpiredSignatureError("Signature has expired")
+
+        _claims_cache.move_to_end(key)
+        return dict(claims)
+
+    claims = jwt.decode(
         token, settings.auth.secret_key, algorithms=[settings.auth.algorithm]
     )
 
+    if settings.auth.claims_cache_size > 0 and "exp" in claims:
+        _claims_cache[key] = dict(claims)
+        while len(_claims_cache) > settings.auth.claims_cache_size:
+            _claims_cache.popitem(last=False)
+
+    return claims
+
 
 def hash_refresh_token(token: str) -> str:
     """Hash a refresh token using SHA256 for database storage"""
@@ -35,19 +35,66 @@ URL PATH ARGUMENTS:
   },
   // ...
 ]
+
+HTTP CLIENT
+    requests share the single ``httpx.AsyncClient`` of the worker, so
+    connections (and TLS sessions) are kept alive between them. it is
+    created on the first request and closed by the application lifespan.
+    HTTP/2 is used if the ``h2`` package is installed.
+
+    all the requests are GET, so they are repeated safely on 429, 5xx
+    and network errors with the exponential backoff.
+
+STATEMENTS
+    the statement is limited to ``MAX_STATEMENT_PERIOD`` and
+    ``STATEMENT_LIMIT`` transactions, which go from the newest one.
+    the range is split into windows, the full window is requested again
+    before its oldest transaction.
+
+    Monobank limits statement requests of the API key (1 per 60 seconds).
+    requests of all accounts and windows are scheduled concurrently
+    through the token bucket of the key, so they are sent as soon as the
+    limit allows. buckets are kept by the worker.
 """
 
+import asyncio
+import hashlib
+import time
+from collections.abc import AsyncIterator, Iterable, Iterator
 from datetime import date, datetime, timedelta
-from typing import Final
+from importlib.util import find_spec
+from typing import ClassVar, Final
 
 import httpx
+from loguru import logger
 from pydantic import Field, RootModel
 
-from src.infrastructure import PublicData
+from src.config import settings
+from src.infrastructure import PublicData, errors
 
 BASE_URL: Final = "https://api.monobank.ua"
 PERSONAL_INFO_URL: Final = f"{BASE_URL}/personal/client-info"
-STATEMENTS_URL: Final = f"{BASE_URL}/statements"
+STATEMENTS_URL: Final = f"{BASE_URL}/personal/statement"
+
+# the longest statement period: 31 days
+MAX_STATEMENT_PERIOD: Final = 31 * 24 * 60 * 60
+
+# the max number of transactions in the statement response
+STATEMENT_LIMIT: Final = 500
+
+# ISO 4217 codes of currencies that Monobank accounts have
+CURRENCY_CODES: Final = {
+    980: "UAH",
+    840: "USD",
+    978: "EUR",
+    826: "GBP",
+    985: "PLN",
+}
+
+# responses that are worth repeating the request
+RETRY_STATUS_CODES: Final = frozenset({429, 500, 502, 503, 504})
+
+_HTTP2: Final = find_spec("h2") is not None
 
 
 class AccountInfo(PublicData):
@@ -80,40 +127,268 @@ class MonobankTransactionsResponse(PublicData):
     transactions: list[Transaction] = Field(default_factory=list)
 
 
-async def fetch_last_transactions(
-    api_key: str,
-) -> MonobankTransactionsResponse:
+# ==================================================
+# HTTP CLIENT SECTION
+# ==================================================
+def _new_client() -> httpx.AsyncClient:
+    config = settings.monobank
 
-    now = datetime.now()
-    yesterday = now - timedelta(days=1)
+    return httpx.AsyncClient(
+        http2=_HTTP2,
+        headers={"Content-Type": "application/json"},
+        timeout=httpx.Timeout(
+            config.read_timeout, connect=config.connect_timeout
+        ),
+        limits=httpx.Limits(
+            max_connections=config.max_connections,
+            max_keepalive_connections=config.max_keepalive_connections,
+            keepalive_expiry=config.keepalive_expiry,
+        ),
+    )
 
-    headers: dict[str, str] = {
-        "X-Token": api_key,
-        "Content-Type": "application/json",
-    }
 
-    async with httpx.AsyncClient() as client:
-        client_info_response = await client.get(
-            PERSONAL_INFO_URL, headers=headers
-        )
+class MonobankClient:
+    """the shared client of the worker."""
+
+    _client: ClassVar[httpx.AsyncClient | None] = None
+
+    @classmethod
+    def get(cls) -> httpx.AsyncClient:
+        if cls._client is None or cls._client.is_closed:
+            cls._client = _new_client()
+
+        return cls._client
+
+    @classmethod
+    async def close(cls) -> None:
+        """close connections of the shared client."""
+
+        if (client := cls._client) is not None:
+            cls._client = None
+            await client.aclose()
+
+
+def _retry_delay(attempt: int, response: httpx.Response | None) -> float:
+    """the ``Retry-After`` header is respected if it is given in seconds."""
 
-        client_info = ClientInfoResponse(**client_info_response.json())
-        all_transactions = []
+    if response is not None:
+        try:
+            return max(0.0, float(response.headers["Retry-After"]))
+        except (KeyError, ValueError):
+            pass
 
-        for acc in client_info.accounts:
-            statement_url = (
-                f"{STATEMENTS_URL}"
-                f"/{acc.id}"
-                f"/{int(now.timestamp())}/{int(yesterday.timestamp())}"
+    return settings.monobank.retry_backoff * 2**attempt
+
+
+async def _get(url: str, api_key: str) -> httpx.Response:
+    """send the GET request to the Monobank API.
+
+    RETURNS
+        the response of the last attempt
+
+    RAISES
+        errors.IntegrationError if the API is not reachable
+    """
+
+    retries = settings.monobank.retries
+
+    for attempt in range(retries + 1):
+        response: httpx.Response | None = None
+        try:
+            response = await MonobankClient.get().get(
+                url, headers={"X-Token": api_key}
             )
-            statement_response = await client.get(
-                str(statement_url), headers=headers
+        except httpx.TransportError as error:
+            if attempt == retries:
+                raise errors.IntegrationError(
+                    "Monobank API is not available"
+                ) from error
+            logger.warning(f"Monobank GET {url} failed: {error!r}")
+        else:
+            if (
+                response.status_code not in RETRY_STATUS_CODES
+                or attempt == retries
+            ):
+                return response
+            logger.warning(
+                f"Monobank GET {url} responded {response.status_code}"
             )
-            if statement_response.is_success:
-                txs = StatementResponse.model_validate(
-                    statement_response.json()
-                )
-                all_transactions.extend(txs.root)
+
+        await asyncio.sleep(_retry_delay(attempt, response))
+
+    raise errors.IntegrationError("Monobank API is not available")
+
+
+async def _client_info(api_key: str) -> ClientInfoResponse:
+    response = await _get(PERSONAL_INFO_URL, api_key)
+    if not response.is_success:
+        raise errors.IntegrationError(
+            f"Monobank client info is not available: {response.status_code}"
+        )
+
+    return ClientInfoResponse(**response.json())
+
+
+async def _statement(
+    api_key: str, account_id: str, start: int, end: int
+) -> list[Transaction]:
+    response = await _get(
+        f"{STATEMENTS_URL}/{account_id}/{start}/{end}", api_key
+    )
+    if not response.is_success:
+        raise errors.IntegrationError(
+            f"Monobank statement is not available: {response.status_code}"
+        )
+
+    return StatementResponse.model_validate(response.json()).root
+
+
+# ==================================================
+# STATEMENTS SECTION
+# ==================================================
+class TokenBucket:
+    """``rate`` requests per second with bursts up to ``capacity``.
+
+    NOTES
+        waiters are served one by one in the order of arrival.
+    """
+
+    def __init__(self, rate: float, capacity: int) -> None:
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(
+            self.capacity, self._tokens + (now - self._updated) * self.rate
+        )
+        self._updated = now
+
+    async def acquire(self) -> None:
+        async with self._lock:
+            self._refill()
+            while self._tokens < 1:
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+                self._refill()
+
+            self._tokens -= 1
+
+
+_buckets: dict[str, TokenBucket] = {}
+
+
+def _bucket(api_key: str) -> TokenBucket:
+    """the statements limit of the API key. the key itself is not kept."""
+
+    digest = hashlib.sha256(api_key.encode()).hexdigest()
+
+    if (bucket := _buckets.get(digest)) is None:
+        bucket = _buckets[digest] = TokenBucket(
+            rate=settings.monobank.statement_rate,
+            capacity=settings.monobank.statement_burst,
+        )
+
+    return bucket
+
+
+def statement_windows(start: int, end: int) -> Iterator[tuple[int, int]]:
+    """split the range (timestamps) into periods Monobank accepts."""
+
+    while start < end:
+        yield start, min(start + MAX_STATEMENT_PERIOD, end)
+        start += MAX_STATEMENT_PERIOD
+
+
+async def _window_statement(
+    api_key: str, account_id: str, start: int, end: int
+) -> tuple[str, list[Transaction]]:
+    """all the transactions of the window, requested by pages."""
+
+    results: dict[str, Transaction] = {}
+    bucket = _bucket(api_key)
+
+    while True:
+        await bucket.acquire()
+        page = await _statement(api_key, account_id, start, end)
+        results.update((tx.id, tx) for tx in page)
+
+        # the page goes from the newest transaction. the rest are older
+        oldest = min((tx.time for tx in page), default=end)
+        if len(page) < STATEMENT_LIMIT or oldest >= end:
+            return account_id, list(results.values())
+
+        end = oldest
+
+
+async def statements(
+    api_key: str, account_ids: Iterable[str], start: int, end: int
+) -> AsyncIterator[tuple[str, list[Transaction]]]:
+    """stream transactions of accounts by windows as they are fetched.
+
+    ARGS
+        ``start`` and ``end`` are timestamps
+
+    YIELDS
+        the account id with transactions of the window
+
+    NOTES
+        all the requests are scheduled at once, the token bucket of the
+        API key decides when they are sent. the newest window of each
+        account goes first, so recent transactions come early.
+    """
+
+    accounts = tuple(account_ids)
+    tasks = [
+        asyncio.create_task(_window_statement(api_key, account_id, *window))
+        for window in reversed(list(statement_windows(start, end)))
+        for account_id in accounts
+    ]
+
+    try:
+        for task in asyncio.as_completed(tasks):
+            yield await task
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+
+# ==================================================
+# TRANSACTIONS SECTION
+# ==================================================
+async def accounts(api_key: str) -> list[AccountInfo]:
+    return (await _client_info(api_key)).accounts
+
+
+async def _collect(
+    api_key: str, account_ids: Iterable[str], start: int, end: int
+) -> list[Transaction]:
+    """transactions by ids, since windows share their bounds."""
+
+    results: dict[str, Transaction] = {}
+    async for _, transactions in statements(api_key, account_ids, start, end):
+        results.update((tx.id, tx) for tx in transactions)
+
+    return list(results.values())
+
+
+async def fetch_last_transactions(
+    api_key: str,
+) -> MonobankTransactionsResponse:
+
+    now = datetime.now()
+    yesterday = now - timedelta(days=1)
+
+    client_info = await _client_info(api_key)
+    all_transactions = await _collect(
+        api_key,
+        (acc.id for acc in client_info.accounts),
+        int(yesterday.timestamp()),
+        int(now.timestamp()),
+    )
 
     return MonobankTransactionsResponse(
         accounts=client_info.accounts,
@@ -124,32 +399,11 @@ async def fetch_last_transactions(
 async def get_transactions(
     api_key: str, start: date, end: date
 ) -> list[Transaction]:
-    headers: dict[str, str] = {
-        "X-Token": api_key,
-        "Content-Type": "application/json",
-    }
+    client_info = await _client_info(api_key)
 
-    async with httpx.AsyncClient() as client:
-        client_info_response = await client.get(
-            PERSONAL_INFO_URL, headers=headers
-        )
-        client_info = ClientInfoResponse(**client_info_response.json())
-        all_transactions = []
-
-        start_ts = int(
-            datetime.combine(start, datetime.min.time()).timestamp()
-        )
-        end_ts = int(datetime.combine(end, datetime.min.time()).timestamp())
+    start_ts = int(datetime.combine(start, datetime.min.time()).timestamp())
+    end_ts = int(datetime.combine(end, datetime.min.time()).timestamp())
 
-        for acc in client_info.accounts:
-            statement_url = f"{STATEMENTS_URL}/{acc.id}/{start_ts}/{end_ts}"
-            statement_response: httpx.Response = await client.get(
-                statement_url, headers=headers
-            )
-            if statement_response.is_success:
-                txs = StatementResponse.model_validate(
-                    statement_response.json()
-                )
-                all_transactions.extend(txs.root)
-
-    return all_transactions
+    return await _collect(
+        api_key, (acc.id for acc in client_info.accounts), start_ts, end_ts
+    )
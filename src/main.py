@@ -29,6 +29,9 @@ so each of them can see the transactions themselves, analytics and equity.
 on the other hand user settings are not sharable for others.
 """
 
+import asyncio
+from contextlib import asynccontextmanager, suppress
+
 import sentry_sdk
 from fastapi import FastAPI, HTTPException
 from fastapi.exceptions import RequestValidationError
@@ -37,13 +40,12 @@ from loguru import logger
 from sentry_sdk.integrations.asgi import SentryAsgiMiddleware
 from sentry_sdk.integrations.fastapi import FastApiIntegration
 from sentry_sdk.integrations.loguru import LoguruIntegration
-from slowapi import Limiter
-from slowapi.errors import RateLimitExceeded
-from slowapi.util import get_remote_address
 
 from src import http
+from src import operational as op
 from src.config import settings
 from src.infrastructure import errors, factories, hooks, middleware
+from src.integrations import monobank
 
 logger.add(
     settings.logging.file,
@@ -60,7 +62,6 @@ exception_handlers = (
         RequestValidationError: errors.unprocessable_entity_error_handler,
         HTTPException: errors.fastapi_http_exception_handler,
         NotImplementedError: errors.not_implemented_error_handler,
-        RateLimitExceeded: errors.rate_limit_exceeded_handler,
         errors.BaseError: errors.base_error_handler,
         Exception: errors.unhandled_error_handler,
     }
@@ -102,6 +103,37 @@ if settings.sentry_dsn and settings.debug is False:
     logger.success("Sentry initialized")
 
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """extend the infrastructure lifespan with background workers."""
+
+    async with hooks.lifespan_event(app):
+        workers = (
+            asyncio.create_task(
+                op.equity_compaction_worker(
+                    settings.equity.compaction_interval
+                )
+            ),
+            asyncio.create_task(
+                op.equity_cache_check_worker(
+                    settings.equity.cache_check_interval
+                )
+            ),
+            asyncio.create_task(
+                op.cache_metrics_worker(settings.cache.metrics_interval)
+            ),
+        )
+
+        yield
+
+        for worker in workers:
+            worker.cancel()
+            with suppress(asyncio.CancelledError):
+                await worker
+
+        await monobank.MonobankClient.close()
+
+
 app: FastAPI = factories.asgi_app(
     debug=settings.debug,
     rest_routers=(
@@ -113,10 +145,9 @@ app: FastAPI = factories.asgi_app(
         http.incomes_router,
         http.exchange_router,
         http.notifications_router,
+        http.metrics_router,
     ),
     middlewares=middlewares,
     exception_handlers=exception_handlers,
-    lifespan=hooks.lifespan_event,
+    lifespan=lifespan,
 )
-
-app.state.limiter = Limiter(key_func=get_remote_address)
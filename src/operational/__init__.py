@@ -15,36 +15,74 @@ __all__ = (
     "add_income",
     "apply_cost_shortcut",
     "authorize",
+    "bank_transactions",
+    "cache_metrics",
+    "cache_metrics_worker",
+    "compact_equity",
+    "costs_forecast",
+    "currencies_equity",
     "currency_exchange",
     "delete_cost",
     "delete_cost_shortcut",
     "delete_currency_exchange",
     "delete_income",
+    "equity_cache_check_worker",
+    "equity_compaction_worker",
     "get_cost_shortcuts",
     "get_costs",
     "get_currency_exchanges",
     "get_incomes",
     "get_tokens_pair",
+    "invalidate_costs_analytics",
     "lookup_missing_transactions",
     "notify_about_big_cost",
     "notify_about_income",
     "notify_about_worker",
+    "password_hashing_metrics",
+    "reconcile_equity",
+    "recurring_costs",
     "refresh_tokens",
+    "revoke_refresh_token",
+    "sync_equity_cache",
+    "sync_monobank_transactions",
     "transactions_basic_analytics",
     "transactions_chart_analytics",
     "update_cost",
     "update_income",
     "user_notifications",
     "user_retrieve",
+    "user_retrieve_cached",
     "user_update",
 )
 
 
 from .analytics import (
+    costs_forecast,
+    invalidate_costs_analytics,
+    recurring_costs,
     transactions_basic_analytics,
     transactions_chart_analytics,
 )
-from .authentication import authorize, get_tokens_pair, refresh_tokens
+from .authentication import (
+    authorize,
+    get_tokens_pair,
+    refresh_tokens,
+    revoke_refresh_token,
+)
+from .banks import bank_transactions, sync_monobank_transactions
+from .equity import (
+    compact_equity,
+    currencies_equity,
+    equity_cache_check_worker,
+    equity_compaction_worker,
+    reconcile_equity,
+    sync_equity_cache,
+)
+from .metrics import (
+    cache_metrics,
+    cache_metrics_worker,
+    password_hashing_metrics,
+)
 from .notifications import (
     notify_about_big_cost,
     notify_about_income,
@@ -69,4 +107,4 @@ from .transactions import (
     update_cost,
     update_income,
 )
-from .users import user_retrieve, user_update
+from .users import user_retrieve, user_retrieve_cached, user_update
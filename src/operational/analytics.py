@@ -6,9 +6,24 @@ this is separated to have cleaner code.
 """
 
 from datetime import date
+from typing import Final
 
 from src.domain import transactions as domain
-from src.infrastructure import dates
+from src.infrastructure import Cache, dates
+
+ANALYTICS_CACHE_NAMESPACE: Final = "fambb_analytics"
+
+# seconds the analytics is fresh. it is recomputed in the background of
+# a single request after that, while others get the previous results
+ANALYTICS_CACHE_TTL: Final = 60 * 60
+
+
+def _recurring_costs_cache_key(month: date) -> str:
+    return f"recurring_costs:{month.strftime('%Y-%m')}"
+
+
+def _costs_forecast_cache_key(day: date) -> str:
+    return f"costs_forecast:{day.isoformat()}"
 
 
 async def transactions_basic_analytics(
@@ -62,3 +77,114 @@ async def transactions_chart_analytics(
 ) -> tuple[domain.Transaction, ...]:
 
     raise NotImplementedError("Chart analytics is not ready yet")
+
+
+async def recurring_costs() -> tuple[domain.RecurringCost, ...]:
+    """return costs that repeat with a stable period (subscriptions, rent).
+
+    WORKFLOW
+        1. return results from the cache if they are calculated this month
+        2. otherwise detect them over ``RECURRING_HISTORY_DAYS`` of costs
+        3. save results to the cache until the next cost is changed
+            or ``ANALYTICS_CACHE_TTL`` expires
+
+    NOTES
+        the cache entry is created per month, so the stale entries
+        from the previous months are never used.
+
+        concurrent requests wait for the single detection.
+    """
+
+    today = date.today()
+
+    async def detect() -> list[dict]:
+        items = domain.detect_recurring_costs(
+            [
+                item
+                async for item in (
+                    domain.TransactionRepository().costs_history(
+                        start_date=domain.recurring_history_start(today),
+                        end_date=today,
+                    )
+                )
+            ],
+            today=today,
+        )
+
+        return [item.model_dump(mode="json") for item in items]
+
+    async with Cache() as cache:
+        results: list[dict] = await cache.get_or_set(
+            namespace=ANALYTICS_CACHE_NAMESPACE,
+            key=_recurring_costs_cache_key(today),
+            producer=detect,
+            ttl=ANALYTICS_CACHE_TTL,
+        )
+
+    return tuple(domain.RecurringCost(**item) for item in results)
+
+
+async def costs_forecast() -> tuple[domain.CostsForecast, ...]:
+    """return the forecast of costs by the end of the current month.
+
+    WORKFLOW
+        1. return results from the cache if they are calculated today
+        2. otherwise get daily totals of the current and previous months
+        3. save results to the cache until the next cost is changed
+            or ``ANALYTICS_CACHE_TTL`` expires
+
+    NOTES
+        the run-rate depends on the day of month, so the cache entry
+        is created per day.
+
+        concurrent requests wait for the single calculation.
+    """
+
+    today = date.today()
+
+    async def forecast() -> list[dict]:
+        items = domain.forecast_costs(
+            [
+                item
+                async for item in (
+                    domain.TransactionRepository().costs_by_day(
+                        start_date=domain.forecast_history_start(today),
+                        end_date=today,
+                    )
+                )
+            ],
+            today=today,
+        )
+
+        return [item.model_dump(mode="json") for item in items]
+
+    async with Cache() as cache:
+        results: list[dict] = await cache.get_or_set(
+            namespace=ANALYTICS_CACHE_NAMESPACE,
+            key=_costs_forecast_cache_key(today),
+            producer=forecast,
+            ttl=ANALYTICS_CACHE_TTL,
+        )
+
+    return tuple(domain.CostsForecast(**item) for item in results)
+
+
+async def invalidate_costs_analytics() -> None:
+    """drop cached costs analytics of the current month.
+
+    NOTES
+        it is called on any cost mutation since even the old cost
+        changes the history that is used for analytics.
+    """
+
+    today = date.today()
+
+    async with Cache() as cache:
+        await cache.invalidate(
+            namespace=ANALYTICS_CACHE_NAMESPACE,
+            key=_recurring_costs_cache_key(today),
+        )
+        await cache.invalidate(
+            namespace=ANALYTICS_CACHE_NAMESPACE,
+            key=_costs_forecast_cache_key(today),
+        )
@@ -1,16 +1,24 @@
 """
 Authentication operational layer.
+
+the login starts the session. access and refresh tokens carry its id
+(``sid``), so revoking the session rejects all of them.
 """
 
 import time
+from datetime import datetime, timedelta, timezone
 
 import jwt
 from fastapi import Depends
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
+from loguru import logger
 
 from src import domain
+from src.config import settings
 from src.infrastructure import InternalData, database, errors, security
 
+from .users import user_retrieve, user_retrieve_cached
+
 http_bearer = HTTPBearer(auto_error=False)
 
 
@@ -19,10 +27,45 @@ class TokensPair(InternalData):
     refresh_token: str
 
 
+async def _session_revoked(session: str) -> bool:
+    """check the session of the access token.
+
+    NOTES
+        the check fails open: if the cache is not available the token
+        is accepted, since it expires in
+        ``settings.auth.access_token_expire_minutes`` anyway.
+        refresh tokens are not exchanged without the cache.
+    """
+
+    try:
+        return await domain.users.session_revoked(session)
+    except Exception as error:
+        logger.warning(f"Can not check the session revocation: {error}")
+        return False
+
+
+async def _user(user_id: int) -> domain.users.User:
+    """the cached user. it is read from the database if the cache fails."""
+
+    try:
+        return await user_retrieve_cached(user_id)
+    except errors.NotFoundError:
+        raise
+    except Exception as error:
+        logger.warning(f"Can not get the cached user: {error}")
+
+    return await user_retrieve(user_id)
+
+
 async def authorize(
     creds: HTTPAuthorizationCredentials | None = Depends(http_bearer),
 ) -> domain.users.User:
-    """Dependency-injection for FastAPI."""
+    """Dependency-injection for FastAPI.
+
+    NOTES
+        the user is cached for a short time, since it is resolved
+        on every authorized request.
+    """
 
     if creds is None:
         raise errors.AuthenticationError(
@@ -42,13 +85,41 @@ async def authorize(
         raise errors.AuthenticationError("Invalid token") from error
 
     else:
+        if (session := payload.get("sid")) and await _session_revoked(session):
+            raise errors.AuthenticationError("Session revoked")
+
         try:
-            user = await domain.users.UserRepository().user_by_id(user_id)
-        except Exception as error:
+            return await _user(user_id)
+        except errors.NotFoundError as error:
             raise errors.AuthenticationError("User not found") from error
-        else:
 
-            return domain.users.User.from_instance(user)
+
+def _issue_tokens(
+    user_id: int, session: str, expires_at: datetime
+) -> TokensPair:
+    """create the tokens pair of the session."""
+
+    return TokensPair(
+        access_token=security.create_access_token(user_id, session=session),
+        refresh_token=security.create_refresh_token(
+            user_id, session=session, expires_at=expires_at
+        ),
+    )
+
+
+async def _start_session(user_id: int) -> TokensPair:
+    """start the session and record it, so it could be revoked."""
+
+    session = security.new_session_id()
+    expires_at = datetime.now(timezone.utc) + timedelta(
+        days=settings.auth.refresh_token_expire_days
+    )
+
+    await domain.users.save_session(
+        user_id, session, expires_at=int(expires_at.timestamp())
+    )
+
+    return _issue_tokens(user_id, session, expires_at)
 
 
 async def get_tokens_pair(username: str, password: str) -> TokensPair:
@@ -67,48 +138,84 @@ async def get_tokens_pair(username: str, password: str) -> TokensPair:
         if not user.password_hash:
             raise errors.AuthenticationError("Invalid credentials")
 
-        if not security.verify_password(password, user.password_hash):
+        if not await security.verify_password_async(
+            password, user.password_hash
+        ):
             raise errors.AuthenticationError("Invalid credentials")
 
-        # Create tokens
-        access_token = security.create_access_token(user.id)
-        refresh_token = security.create_refresh_token(user.id)
-
-        # TODO: Store refresh token hash in cache
-        # token_hash = security.hash_refresh_token(refresh_token)
-
-        return TokensPair(
-            access_token=access_token,
-            refresh_token=refresh_token,
-        )
-
+        return await _start_session(user.id)
 
-async def refresh_tokens(refresh_token: str) -> TokensPair:
-    """Returns new TokenPair with fresh access token and same refresh token."""
 
+def _decode_refresh_token(refresh_token: str) -> dict:
     try:
-        # Decode and validate the refresh token
         payload = security.decode_token(refresh_token)
     except jwt.ExpiredSignatureError:
         raise errors.AuthenticationError("Refresh token expired")
     except (jwt.InvalidTokenError, KeyError, ValueError):
         raise errors.AuthenticationError("Invalid refresh token")
+
+    if (exp := payload.get("exp")) and ((exp - int(time.time())) < 0):
+        raise errors.AuthenticationError(
+            "Token has been expired. Please authorize again"
+        )
+
+    if payload.get("type") != "refresh":
+        raise errors.AuthenticationError("Invalid token type")
+
+    return payload
+
+
+async def refresh_tokens(refresh_token: str) -> TokensPair:
+    """Returns new TokenPair of the same session.
+
+    WORKFLOW
+        1. check the session is not revoked
+        2. mark the refresh token as exchanged, so it is used only once
+        3. issue new tokens that expire with the session
+
+    NOTES
+        the reuse of the exchanged refresh token means it is stolen,
+        so all the sessions of the user are revoked.
+        tokens without the session are issued before sessions are
+        introduced. the new session is started for them.
+    """
+
+    payload = _decode_refresh_token(refresh_token)
+    user_id = int(payload["sub"])
+    expires_at = int(payload["exp"])
+
+    if (session := payload.get("sid")) and (
+        await domain.users.session_revoked(session)
+    ):
+        raise errors.AuthenticationError("Session revoked")
+
+    if not await domain.users.rotate_refresh_token(
+        security.hash_refresh_token(refresh_token), expires_at
+    ):
+        await domain.users.revoke_user_sessions(user_id)
+        raise errors.AuthenticationError(
+            "Refresh token is already used. Please authorize again"
+        )
+
+    if session is None:
+        return await _start_session(user_id)
     else:
-        if (exp := payload.get("exp")) and ((exp - int(time.time())) < 0):
-            raise errors.AuthenticationError(
-                "Token has been expired. Please authorize again"
-            )
+        return _issue_tokens(
+            user_id,
+            session=session,
+            expires_at=datetime.fromtimestamp(expires_at, timezone.utc),
+        )
 
-        if payload.get("type") != "refresh":
-            raise errors.AuthenticationError("Invalid token type")
-        else:
-            user_id = int(payload["sub"])
 
-    # TODO: Check if token is not revoked
-    #       Add refresh token to the cache in order to check later
-    # token_hash = security.hash_refresh_token(refresh_token)
+async def revoke_refresh_token(refresh_token: str) -> None:
+    """revoke the session of the refresh token (logout)."""
+
+    payload = _decode_refresh_token(refresh_token)
+    expires_at = int(payload["exp"])
 
-    # Create new access token only
-    access_token = security.create_access_token(user_id)
+    await domain.users.rotate_refresh_token(
+        security.hash_refresh_token(refresh_token), expires_at
+    )
 
-    return TokensPair(access_token=access_token, refresh_token=refresh_token)
+    if session := payload.get("sid"):
+        await domain.users.revoke_session(session, expires_at)
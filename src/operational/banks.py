@@ -0,0 +1,157 @@
+"""
+bank statements are imported into the local store incrementally.
+
+each account has the sync watermark: the range that is imported already.
+the lookup requests the bank only for the rest of the requested range
+(and the short overlap before the watermark), so repeated lookups of
+the same period do not request statements at all.
+"""
+
+import asyncio
+import time
+from collections import defaultdict
+from datetime import date, datetime, timedelta
+from typing import Final
+
+from src import domain
+from src.config import settings
+from src.infrastructure import Cache, database, errors
+from src.integrations import monobank
+
+BANKS_CACHE_NAMESPACE: Final = "fambb_banks"
+
+
+def _timestamp(day: date) -> int:
+    """the start of the day in the server timezone."""
+
+    return int(datetime.combine(day, datetime.min.time()).timestamp())
+
+
+def _period(start_date: date, end_date: date) -> tuple[int, int]:
+    """timestamps of the period. the end date is included."""
+
+    return (
+        _timestamp(start_date),
+        min(_timestamp(end_date + timedelta(days=1)), int(time.time())),
+    )
+
+
+async def _monobank_api_key(user: domain.users.User) -> str | None:
+    """the key is not cached with the user, so it is read if missing."""
+
+    if (
+        api_key := user.configuration.monobank_api_key
+    ) is None and user.configuration.monobank_integration_active:
+        db_instance = await domain.users.UserRepository().user_by_id(user.id)
+        api_key = db_instance.monobank_api_key
+
+    return api_key
+
+
+async def _monobank_accounts(user_id: int, api_key: str) -> list[str]:
+    """account ids of the user. the bank is requested once in a while."""
+
+    async with Cache() as cache:
+        try:
+            return await cache.get(BANKS_CACHE_NAMESPACE, f"{user_id}")
+        except errors.NotFoundError:
+            pass
+
+        account_ids = [item.id for item in await monobank.accounts(api_key)]
+        await cache.set(
+            BANKS_CACHE_NAMESPACE,
+            f"{user_id}",
+            account_ids,
+            ttl=settings.monobank.accounts_cache_ttl,
+        )
+
+    return account_ids
+
+
+async def _import_statements(
+    user_id: int, api_key: str, account_ids: list[str], start: int, end: int
+) -> None:
+    """save statements window by window as they are fetched."""
+
+    repository = domain.banks.BankRepository()
+
+    async for account_id, transactions in monobank.statements(
+        api_key, account_ids, start, end
+    ):
+        async with database.transaction():
+            await repository.save_transactions(
+                user_id,
+                (
+                    domain.banks.BankTransaction.from_instance(
+                        item, account_id=account_id
+                    )
+                    for item in transactions
+                ),
+            )
+
+
+async def sync_monobank_transactions(
+    user: domain.users.User, start_date: date, end_date: date
+) -> None:
+    """import Monobank transactions of ``start_date..end_date`` inclusive.
+
+    WORKFLOW
+        1. get ranges that are not imported for each account
+        2. fetch accounts with the same range together
+        3. extend watermarks once everything is saved
+    """
+
+    if (api_key := await _monobank_api_key(user)) is None:
+        raise errors.UnprocessableRequestError("No API Keys were found")
+
+    start, end = _period(start_date, end_date)
+    if start >= end:
+        return None
+
+    repository = domain.banks.BankRepository()
+    syncs = await repository.account_syncs(user.id)
+
+    ranges: dict[tuple[int, int], list[str]] = defaultdict(list)
+    for account_id in await _monobank_accounts(user.id, api_key):
+        if (sync := syncs.get(account_id)) is None:
+            ranges[start, end].append(account_id)
+        else:
+            for range_ in sync.missing(
+                start, end, overlap=settings.monobank.sync_overlap
+            ):
+                ranges[range_].append(account_id)
+
+    await asyncio.gather(
+        *(
+            _import_statements(user.id, api_key, account_ids, *range_)
+            for range_, account_ids in ranges.items()
+        )
+    )
+
+    updated = {
+        account_id
+        for account_ids in ranges.values()
+        for account_id in account_ids
+    }
+    async with database.transaction():
+        for account_id in updated:
+            sync = syncs.get(account_id) or domain.banks.AccountSync(
+                account_id=account_id, synced_from=start, synced_until=end
+            )
+            await repository.save_account_sync(
+                user.id, sync.extended(start, end)
+            )
+
+
+async def bank_transactions(
+    user: domain.users.User, start_date: date, end_date: date
+) -> list[domain.banks.BankTransaction]:
+    """bank transactions of the period from the local store.
+    the store is synchronized with the bank before.
+    """
+
+    await sync_monobank_transactions(user, start_date, end_date)
+
+    return await domain.banks.BankRepository().transactions(
+        user.id, *_period(start_date, end_date)
+    )
@@ -0,0 +1,217 @@
+"""
+the equity is stored as the checkpoint and the ledger of pending changes.
+this module includes operations to maintain the ledger.
+
+the list of currencies with the equity is cached, since it is polled by
+clients. each equity mutation updates the cache entry (write-through) and
+the periodic check guards against the drift.
+"""
+
+import asyncio
+from typing import Final
+
+from loguru import logger
+
+from src import domain
+from src.infrastructure import Cache, database, errors
+
+EQUITY_CACHE_NAMESPACE: Final = "fambb_equity"
+EQUITY_CACHE_KEY: Final = "currencies"
+
+# the entry is saved again if it is changed since it is read
+_STORE_ATTEMPTS: Final = 3
+
+
+async def _cached_equity(cache: Cache) -> dict | None:
+    try:
+        return await cache.get(
+            namespace=EQUITY_CACHE_NAMESPACE, key=EQUITY_CACHE_KEY
+        )
+    except errors.NotFoundError:
+        return None
+    except ValueError as error:
+        logger.warning(f"Broken equity cache entry: {error}")
+        return None
+
+
+async def _store_equity(cache: Cache) -> tuple[domain.equity.Equity, ...]:
+    """read the equity from the database and save it to the cache.
+
+    notes:
+        the entry is replaced with ``cas``, so it is not overwritten
+        if the concurrent request has saved the greater version, which
+        means it has read more recent data.
+    """
+
+    version, currencies = (
+        await domain.equity.EquityRepository().versioned_currencies()
+    )
+    items = tuple(
+        domain.equity.Equity.model_validate(item) for item in currencies
+    )
+    value = {
+        "version": version,
+        "items": [item.model_dump() for item in items],
+    }
+
+    for _ in range(_STORE_ATTEMPTS):
+        try:
+            cached, token = await cache.gets(
+                namespace=EQUITY_CACHE_NAMESPACE, key=EQUITY_CACHE_KEY
+            )
+        except errors.NotFoundError:
+            stored = await cache.add(
+                namespace=EQUITY_CACHE_NAMESPACE,
+                key=EQUITY_CACHE_KEY,
+                value=value,
+            )
+        except ValueError as error:
+            logger.warning(f"Broken equity cache entry: {error}")
+            await cache.delete(
+                namespace=EQUITY_CACHE_NAMESPACE, key=EQUITY_CACHE_KEY
+            )
+            continue
+        else:
+            if cached["version"] > version:
+                break
+
+            stored = await cache.cas(
+                namespace=EQUITY_CACHE_NAMESPACE,
+                key=EQUITY_CACHE_KEY,
+                value=value,
+                token=token,
+            )
+
+        if stored:
+            break
+
+    return items
+
+
+async def currencies_equity() -> tuple[domain.equity.Equity, ...]:
+    """return currencies with the equity.
+
+    WORKFLOW
+        1. return results from the cache if they are there
+        2. otherwise read the database and save results to the cache
+    """
+
+    async with Cache() as cache:
+        if (cached := await _cached_equity(cache)) is not None:
+            return tuple(
+                domain.equity.Equity(**item) for item in cached["items"]
+            )
+
+        return await _store_equity(cache)
+
+
+async def sync_equity_cache() -> None:
+    """write-through the equity change to the cache.
+
+    notes:
+        must be called after the transaction is committed.
+        if nothing is cached yet - the entry is created on the next read.
+    """
+
+    async with Cache() as cache:
+        if await _cached_equity(cache) is not None:
+            await _store_equity(cache)
+
+
+async def equity_cache_check_worker(interval: int) -> None:
+    """compare the cached equity with the database periodically.
+
+    notes:
+        each mutation updates the cache, so any difference means
+        the update is lost (i.e. the cache was not reachable).
+    """
+
+    while True:
+        await asyncio.sleep(interval)
+
+        try:
+            async with Cache() as cache:
+                if (cached := await _cached_equity(cache)) is None:
+                    continue
+
+                items = await _store_equity(cache)
+
+                if cached["items"] != [item.model_dump() for item in items]:
+                    logger.warning("Equity cache drift is detected and fixed")
+        except Exception as error:
+            logger.error(f"Equity cache check is failed: {error}")
+
+
+async def compact_equity() -> int:
+    """fold pending equity changes into the currencies checkpoint.
+
+    returns:
+        the number of currencies that are updated.
+    """
+
+    async with database.transaction():
+        total: int = (
+            await domain.equity.EquityRepository().compact_equity_changes()
+        )
+
+    if total:
+        logger.debug(f"Equity changes are compacted for {total} currencies")
+
+    return total
+
+
+async def equity_compaction_worker(interval: int) -> None:
+    """compact the equity ledger periodically.
+
+    notes:
+        errors are not raised, since the next iteration folds
+        the same changes. the ledger is correct until compacted anyway.
+    """
+
+    while True:
+        await asyncio.sleep(interval)
+
+        try:
+            await compact_equity()
+        except Exception as error:
+            logger.error(f"Equity compaction is failed: {error}")
+
+
+async def reconcile_equity(
+    fix: bool = False, chunk_size: int = 1000
+) -> tuple[domain.equity.EquityDrift, ...]:
+    """recompute the expected equity of each currency from transactions.
+
+    params:
+        ``fix`` - apply the correction for drifted currencies
+
+    notes:
+        the correction is added to the equity ledger in one transaction.
+        it is computed over the consistent snapshot, so transactions
+        that are added concurrently do not affect it.
+    """
+
+    items = await domain.equity.EquityRepository().equity_reconciliation(
+        chunk_size=chunk_size
+    )
+
+    if drifted := [item for item in items if item.difference]:
+        for item in drifted:
+            logger.warning(
+                f"Equity drift for {item.currency.name}: "
+                f"actual={item.actual} expected={item.expected}"
+            )
+
+        if fix is True:
+            async with database.transaction():
+                await domain.equity.EquityRepository().apply_equity_deltas(
+                    {item.currency.id: item.difference for item in drifted}
+                )
+
+            await sync_equity_cache()
+
+            logger.success(
+                f"Equity is corrected for {len(drifted)} currencies"
+            )
+
+    return items
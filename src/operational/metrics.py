@@ -0,0 +1,49 @@
+"""
+this module includes operations to observe the infrastructure usage.
+"""
+
+import asyncio
+
+from loguru import logger
+
+from src.infrastructure import Cache, security
+from src.infrastructure.cache import CacheNamespaceStats
+
+
+def cache_metrics() -> tuple[CacheNamespaceStats, ...]:
+    """return the cache metrics of the current worker per namespace."""
+
+    return Cache.metrics()
+
+
+def password_hashing_metrics() -> security.PasswordHashingStats:
+    """return the password hashing threads usage of the current worker."""
+
+    return security.password_hashing_stats()
+
+
+async def cache_metrics_worker(interval: int) -> None:
+    """log the aggregated cache metrics periodically.
+
+    notes:
+        values are accumulated since the worker start, so the difference
+        between 2 records is the usage within the interval.
+    """
+
+    while True:
+        await asyncio.sleep(interval)
+
+        for item in cache_metrics():
+            hit_ratio = (
+                f"{item.hit_ratio:.2%}" if item.hit_ratio is not None else "-"
+            )
+            logger.info(
+                f"Cache {item.namespace}: "
+                f"hits={item.hits} misses={item.misses} "
+                f"hit_ratio={hit_ratio} errors={item.errors} "
+                f"requests={item.requests} "
+                f"latency_p50={item.latency_p50} "
+                f"latency_p99={item.latency_p99} "
+                f"written={item.size_total}B "
+                f"hot_keys={item.hot_keys[:3]}"
+            )
@@ -9,7 +9,7 @@ client requested notifications.
 import asyncio
 
 from src import domain
-from src.infrastructure import Cache, database, errors
+from src.infrastructure import database
 
 pretty_money = domain.transactions.data_transformation.pretty_money
 
@@ -17,29 +17,9 @@ pretty_money = domain.transactions.data_transformation.pretty_money
 async def user_notifications(
     user: domain.users.User,
 ) -> domain.notifications.Notifications:
-    """
-
-    WORKFLOW
-        1. retrieve notifications from the cache
-        2. remove notifications in the cache
-    """
-
-    async with Cache() as cache:
-        try:
-            results: dict = await cache.get(
-                namespace="fambb_notifications", key=str(user.id)
-            )
-        except errors.NotFoundError:
-            notifications = domain.notifications.Notifications()
-        else:
-            notifications = domain.notifications.Notifications(**results)
-
-            # erase notifications
-            await cache.delete(
-                namespace="fambb_notifications", key=str(user.id)
-            )
+    """retrieve notifications from the cache and remove them."""
 
-        return notifications
+    return await domain.notifications.pop_notifications(user.id)
 
 
 async def notify_about_big_cost(cost: database.Cost):
@@ -51,22 +31,19 @@ async def notify_about_big_cost(cost: database.Cost):
         cost=cost
     )
 
-    async for _user in users:
-        user = domain.users.User.from_instance(_user)
-
-        asyncio.create_task(
-            domain.notifications.notify(
-                user_id=user.id,
-                topic="big_costs",
-                notification=domain.notifications.Notification(
-                    message=(
-                        f"{cost.name}: {pretty_money(cost.value)} "
-                        f"{cost.currency.sign}"
-                    ),
-                    level="📉",
+    asyncio.create_task(
+        domain.notifications.notify_many(
+            user_ids=[user.id async for user in users],
+            topic="big_costs",
+            notification=domain.notifications.Notification(
+                message=(
+                    f"{cost.name}: {pretty_money(cost.value)} "
+                    f"{cost.currency.sign}"
                 ),
-            )
+                level="📉",
+            ),
         )
+    )
 
 
 async def notify_about_income(income: database.Income):
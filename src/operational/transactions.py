@@ -1,12 +1,19 @@
 import asyncio
-from collections.abc import Coroutine
-from datetime import date
-from typing import cast
+from collections import defaultdict
+from datetime import date, timedelta
+from typing import Final, cast
 
 from src import domain
 from src.infrastructure import IncomeSource, database, errors
 from src.integrations import monobank
 
+from .analytics import invalidate_costs_analytics
+from .banks import bank_transactions
+from .equity import sync_equity_cache
+
+# days of costs that categories of missing transactions are learned from
+SUGGESTIONS_HISTORY_DAYS: Final = 365
+
 
 # ==================================================
 # COSTS SECTION
@@ -60,11 +67,32 @@ async def add_cost(
         instance, *_ = await asyncio.gather(*tasks)
         await session.flush()
 
+    await invalidate_costs_analytics()
+    await sync_equity_cache()
+
     return await domain.transactions.TransactionRepository().cost(
         id_=instance.id
     )
 
 
+def _equity_deltas(previous: dict, values: dict, sign: int) -> dict:
+    """move the transaction value from the previous currency to the new one.
+
+    params:
+        ``previous`` - previous values of the transaction
+        ``values`` - the update payload
+        ``sign`` - ``-1`` for costs and ``1`` for incomes
+    """
+
+    deltas: dict[int, int] = defaultdict(int)
+    deltas[previous["currency_id"]] -= sign * previous["value"]
+    deltas[values.get("currency_id", previous["currency_id"])] += sign * (
+        values.get("value", previous["value"])
+    )
+
+    return deltas
+
+
 async def update_cost(cost_id: int, **values) -> database.Cost:
     """update the cost with additional validations.
 
@@ -73,62 +101,34 @@ async def update_cost(cost_id: int, **values) -> database.Cost:
         ``values``  includes update payload candidate
 
     workflow:
-        get cost instance or 404
-        if value is the same - remove it from the payload.
-        update the ``cost``
-        update ``equity``
-    """
-
-    duplicates = set()
-    transaction_repository = domain.transactions.TransactionRepository()
-    equity_repository = domain.equity.EquityRepository()
-    cost: database.Cost = await transaction_repository.cost(id_=cost_id)
+        update the ``cost`` and get previous values or 404
+        update ``equity`` based on previous values. same transaction
+        if all values are the same - nothing to update
 
-    for attr, value in values.items():
-        try:
-            if getattr(cost, attr) == value:
-                duplicates.add(attr)
-        except AttributeError as error:
-            raise errors.DatabaseError(
-                f"'costs' table does not have '{attr}' column"
-            ) from error
-
-    for attr in duplicates:
-        del values[attr]
+    notes:
+        the cost is locked by the update statement, so concurrent
+        updates never calculate the equity from the stale value.
+    """
 
     if not values:
         raise errors.BadRequestError("nothing to update")
 
-    tasks: list[Coroutine] = [
-        transaction_repository.update_cost(cost, **values),
-    ]
-
-    # add tasks depending on ``currency_id`` and ``value`` input parameters
-    if (new_currency_id := values.get("currency_id")) is not None:
-        if (value := values.get("value")) is not None:
-            tasks.append(
-                equity_repository.increase_equity(cost.currency.id, cost.value)
-            )
-            tasks.append(
-                equity_repository.decrease_equity(new_currency_id, value)
-            )
-        else:
-            tasks.append(
-                equity_repository.increase_equity(cost.currency.id, cost.value)
-            )
-            tasks.append(
-                equity_repository.decrease_equity(new_currency_id, cost.value)
-            )
-    else:
-        if (value := values.get("value")) is not None:
-            tasks.append(
-                equity_repository.decrease_equity(
-                    cost.currency_id, value - cost.value
-                )
-            )
+    transaction_repository = domain.transactions.TransactionRepository()
 
     async with database.transaction():
-        await asyncio.gather(*tasks)
+        previous: dict = await transaction_repository.update_cost(
+            cost_id, **values
+        )
+        await domain.equity.EquityRepository().apply_equity_deltas(
+            _equity_deltas(previous, values, sign=-1)
+        )
+
+    # the same values are saved, so there is nothing to roll back
+    if all(previous[attr] == value for attr, value in values.items()):
+        raise errors.BadRequestError("nothing to update")
+
+    await invalidate_costs_analytics()
+    await sync_equity_cache()
 
     return await transaction_repository.cost(id_=cost_id)
 
@@ -159,6 +159,9 @@ async def delete_cost(cost_id: int) -> None:
     async with database.transaction():
         await asyncio.gather(*tasks)
 
+    await invalidate_costs_analytics()
+    await sync_equity_cache()
+
 
 # ==================================================
 # INCOMES SECTION
@@ -213,6 +216,8 @@ async def add_income(
         instance, *_ = await asyncio.gather(*tasks)
         await session.flush()
 
+    await sync_equity_cache()
+
     return await domain.transactions.TransactionRepository().income(
         id_=instance.id
     )
@@ -226,63 +231,31 @@ async def update_income(income_id: int, **values) -> database.Income:
         ``values``  includes update payload candidate
 
     workflow:
-        get income instance or 404
-        if value is the same - remove it from the payload.
-        update the ``income``
-        update ``equity``
+        update the ``income`` and get previous values or 404
+        update ``equity`` based on previous values. same transaction
+        if all values are the same - nothing to update
     """
 
-    duplicates = set()
-    transaction_repository = domain.transactions.TransactionRepository()
-    equity_repository = domain.equity.EquityRepository()
-    income = await transaction_repository.income(id_=income_id)
-
-    for attr, value in values.items():
-        try:
-            if getattr(income, attr) == value:
-                duplicates.add(attr)
-        except AttributeError as error:
-            raise errors.DatabaseError(
-                f"'incomes' table does not have '{attr}' column"
-            ) from error
-
-    for attr in duplicates:
-        del values[attr]
-
     if not values:
         raise errors.BadRequestError("nothing to update")
 
-    tasks: list[Coroutine] = [
-        transaction_repository.update_income(income, **values),
-    ]
+    transaction_repository = domain.transactions.TransactionRepository()
 
-    # add tasks depending on ``currency_id`` and ``value`` input parameters
-    if (new_currency_id := values.get("currency_id")) is not None:
-        tasks.append(
-            equity_repository.decrease_equity(income.currency.id, income.value)
+    async with database.transaction():
+        previous: dict = await transaction_repository.update_income(
+            income_id, **values
+        )
+        await domain.equity.EquityRepository().apply_equity_deltas(
+            _equity_deltas(previous, values, sign=1)
         )
-        if (value := values.get("value")) is not None:
-            tasks.append(
-                equity_repository.increase_equity(new_currency_id, value)
-            )
-        else:
-            tasks.append(
-                equity_repository.increase_equity(
-                    new_currency_id, income.value
-                )
-            )
-    else:
-        if (value := values.get("value")) is not None:
-            tasks.append(
-                equity_repository.increase_equity(
-                    income.currency_id, value - income.value
-                )
-            )
 
-    async with database.transaction():
-        await asyncio.gather(*tasks)
+    # the same values are saved, so there is nothing to roll back
+    if all(previous[attr] == value for attr, value in values.items()):
+        raise errors.BadRequestError("nothing to update")
 
-    return income
+    await sync_equity_cache()
+
+    return await transaction_repository.income(id_=income_id)
 
 
 async def delete_income(income_id: int):
@@ -313,6 +286,8 @@ async def delete_income(income_id: int):
     async with database.transaction():
         await asyncio.gather(*tasks)
 
+    await sync_equity_cache()
+
 
 # ==================================================
 # CURRENCY EXCHANGE SECTION
@@ -338,6 +313,18 @@ async def get_currency_exchanges(
     return items
 
 
+def _exchange_deltas(
+    from_currency_id: int, from_value: int, to_currency_id: int, to_value: int
+) -> dict[int, int]:
+    """equity changes of the exchange. currencies may be the same."""
+
+    deltas: dict[int, int] = defaultdict(int)
+    deltas[from_currency_id] -= from_value
+    deltas[to_currency_id] += to_value
+
+    return deltas
+
+
 async def currency_exchange(
     from_value: int,
     to_value: int,
@@ -371,17 +358,18 @@ async def currency_exchange(
                     user_id=user_id,
                 )
             ),
-            domain.equity.EquityRepository().decrease_equity(
-                currency_id=from_currency_id, value=from_value
-            ),
-            domain.equity.EquityRepository().increase_equity(
-                currency_id=to_currency_id, value=to_value
+            domain.equity.EquityRepository().apply_equity_deltas(
+                _exchange_deltas(
+                    from_currency_id, from_value, to_currency_id, to_value
+                )
             ),
         )
 
         instance, *_ = await asyncio.gather(*tasks)
         await session.flush()
 
+    await sync_equity_cache()
+
     return await domain.transactions.TransactionRepository().exchange(
         id_=instance.id
     )
@@ -407,17 +395,21 @@ async def delete_currency_exchange(item_id: int) -> None:
         domain.transactions.TransactionRepository().delete(
             database.Exchange, candidate_id=item_id
         ),
-        domain.equity.EquityRepository().increase_equity(
-            item.from_currency_id, item.from_value
-        ),
-        domain.equity.EquityRepository().decrease_equity(
-            item.to_currency_id, item.to_value
+        domain.equity.EquityRepository().apply_equity_deltas(
+            _exchange_deltas(
+                item.to_currency_id,
+                item.to_value,
+                item.from_currency_id,
+                item.from_value,
+            )
         ),
     )
 
     async with database.transaction():
         await asyncio.gather(*tasks)
 
+    await sync_equity_cache()
+
 
 # ==================================================
 # SHORTCUTS SECTION
@@ -525,28 +517,48 @@ async def apply_cost_shortcut(
 # ==================================================
 async def lookup_missing_transactions(
     user: domain.users.User, start_date: date, end_date: date
-):
-    # (1) get monobank transactions
-    if user.configuration.monobank_api_key is None:
-        raise errors.UnprocessableRequestError("No API Keys were found")
-
-    transactions: list[monobank.Transaction] = await monobank.get_transactions(
-        api_key=user.configuration.monobank_api_key,
-        start=start_date,
-        end=end_date,
+) -> list[domain.banks.MissingTransaction]:
+    """bank transactions of the period that are not recorded.
+
+    WORKFLOW
+        1. get bank transactions. only the new ones are fetched
+        2. get costs and incomes of the period with the tolerance
+        3. learn categories from costs of the last year
+        4. match transactions locally
+    """
+
+    repository = domain.banks.BankRepository()
+    tolerance = timedelta(days=domain.banks.TOLERANCE_DAYS)
+
+    transactions, entries, names, currencies = await asyncio.gather(
+        bank_transactions(user, start_date, end_date),
+        repository.ledger(
+            user.id, start_date - tolerance, end_date + tolerance
+        ),
+        repository.cost_names(
+            user.id, start_date - timedelta(days=SUGGESTIONS_HISTORY_DAYS)
+        ),
+        repository.currency_ids(),
     )
 
-    # Get simified Monobank transactions
-    _ = [
-        {
-            "currency_code": tx.currency_code,
-            "description": tx.description or "",
-            "amount": abs(tx.amount),  # positive value
-        }
-        for tx in transactions
-    ]
+    suggestions = domain.banks.CategorySuggestions()
+    for name, category_id, count in names:
+        suggestions.learn(name, category_id, weight=count)
+
+    missing = domain.banks.reconcile(
+        transactions,
+        entries,
+        currencies={
+            code: currencies[name]
+            for code, name in monobank.CURRENCY_CODES.items()
+            if name in currencies
+        },
+        suggestions=suggestions,
+    )
 
-    # Placeholder: you will implement the db comparison logic yourself
-    # missed = await op.find_missed_costs(user.id, simplified)
+    if (default := user.configuration.default_cost_category) is not None:
+        for item in missing:
+            if item.operation == "cost" and item.suggested_category_id is None:
+                item.suggested_category_id = default.id
 
-    return {"missed": {}}
+    return missing
@@ -1,7 +1,21 @@
-from typing import Any
+"""
+this module includes high-level operations to deal with users.
+
+the user is resolved on every authorized request, so it is cached
+for a short time. the entry is removed when the user is updated.
+secrets (the Monobank API key) are not cached.
+"""
+
+from typing import Any, Final
 
 from src.domain.users import User, UserRepository
-from src.infrastructure import database
+from src.infrastructure import Cache, database
+
+USERS_CACHE_NAMESPACE: Final = "fambb_users"
+
+# seconds the cached user is fresh. changes that are made bypassing
+# the ``user_update`` (scripts, other tables) are visible after that
+USERS_CACHE_TTL: Final = 60
 
 
 async def user_retrieve(id_: int) -> User:
@@ -11,12 +25,38 @@ async def user_retrieve(id_: int) -> User:
     return user
 
 
+async def user_retrieve_cached(id_: int) -> User:
+    """retrieve the user from the cache or from the database.
+
+    NOTES
+        concurrent requests of the same user make a single query.
+    """
+
+    async def producer() -> dict:
+        return (await user_retrieve(id_)).model_dump(
+            mode="json", exclude={"configuration": {"monobank_api_key"}}
+        )
+
+    async with Cache() as cache:
+        value: dict = await cache.get_or_set(
+            USERS_CACHE_NAMESPACE, str(id_), producer, ttl=USERS_CACHE_TTL
+        )
+
+    return User.model_validate(value)
+
+
+async def invalidate_user(id_: int) -> None:
+    async with Cache() as cache:
+        await cache.invalidate(USERS_CACHE_NAMESPACE, str(id_))
+
+
 async def user_update(user: User, **values: Any) -> User:
     repo = UserRepository()
 
     async with database.transaction():
         await repo.update_user(user.id, **values)
 
+    await invalidate_user(user.id)
     db_instance = await repo.user_by_id(user.id)
 
     return User.from_instance(db_instance)
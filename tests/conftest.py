@@ -1,7 +1,6 @@
 import logging
 import os
 from collections.abc import AsyncGenerator
-from unittest.mock import MagicMock
 
 import asyncpg
 import httpx
@@ -18,9 +17,9 @@ from sqlalchemy.sql import text
 from src import domain, http
 from src import operational as op
 from src.config import settings
-from src.infrastructure import Cache, database, errors, factories
+from src.infrastructure import Cache, database, errors, factories, rate_limiter
+from src.infrastructure.cache import MemoryBackend
 from src.operational.authentication import http_bearer
-from tests.mock import Cache as MockedCache
 
 
 def pytest_configure() -> None:
@@ -58,6 +57,7 @@ def app(john: domain.users.User, marry: domain.users.User) -> FastAPI:
             http.currencies_router,
             http.exchange_router,
             http.incomes_router,
+            http.metrics_router,
             http.notifications_router,
             http.transactions_router,
             http.users_router,
@@ -78,8 +78,8 @@ def app(john: domain.users.User, marry: domain.users.User) -> FastAPI:
     async def mock_authorize(creds=Depends(http_bearer)) -> domain.users.User:
         """Mock authorize that returns user based on token.
 
-        Fetches user from database with joined default_currency
-        and default_cost_category, matching real authorization behavior.
+        Resolves the user through the cache, matching real
+        authorization behavior.
         """
         if creds is None:
             raise errors.AuthenticationError(
@@ -96,10 +96,8 @@ def app(john: domain.users.User, marry: domain.users.User) -> FastAPI:
         if user_id not in valid_user_ids:
             raise errors.AuthenticationError("User not found")
 
-        # Fetch user from database with joined relationships
         # matches real authorize behavior in src/operational/authentication.py
-        user = await domain.users.UserRepository().user_by_id(user_id)
-        return domain.users.User.from_instance(user)
+        return await op.user_retrieve_cached(user_id)
 
     # Override the authorize dependency using FastAPI's mechanism
     app.dependency_overrides[op.authorize] = mock_authorize
@@ -263,18 +261,26 @@ async def test_database_engine(
 # CACHE SECTION
 # =====================================================================
 @pytest.fixture(autouse=True)
-def patch_cache_service(mocker) -> MagicMock:
-    """This fixture patches the cache service to use the in-memory
-    cache repository.
+def patch_cache_service(mocker) -> MemoryBackend:
+    """This fixture selects the in-memory cache backend.
+    the cache is cleaned for each test, as well as the rate limiter
+    state of the worker.
     """
 
-    return mocker.patch.object(Cache, "__new__", return_value=MockedCache())
+    backend = MemoryBackend(max_entries=10_000, max_bytes=16 * 1024 * 1024)
+    mocker.patch.object(settings.cache, "backend", "memory")
+    mocker.patch.object(Cache, "_memory", backend)
+    mocker.patch.object(rate_limiter, "limiter", rate_limiter.RateLimiter())
+
+    return backend
 
 
 @pytest.fixture(autouse=True)
-def _mock_httpx_requests():
-    with respx.mock(assert_all_mocked=True):
-        yield
+def mock_httpx():
+    """external requests are not sent. tests add routes to the router."""
+
+    with respx.mock(assert_all_mocked=True) as router:
+        yield router
 
 
 # ==================================================
@@ -6,12 +6,23 @@ import pytest
 from fastapi import status
 
 from src import domain
+from src.domain.transactions.analytics import RECURRING_HISTORY_DAYS
 from src.infrastructure import database
 from tests.integration.conftest import (
     CostCandidateFactory,
     ExchangeCandidateFactory,
     IncomeCandidateFactory,
 )
+from tests.mock import Cache
+
+
+def _analytics_cache() -> dict:
+    return {
+        key: value
+        for key, value in Cache._data.items()
+        if key.startswith("fambb_analytics:")
+        and not key.startswith("fambb_analytics:version:")
+    }
 
 
 @pytest.mark.use_db
@@ -220,3 +231,144 @@ async def test_basic_analytics_fetch(
             },
         ],
     }
+
+
+@pytest.mark.use_db
+async def test_recurring_costs_fetch(
+    john: domain.users.User,
+    client: httpx.AsyncClient,
+    currencies,
+    cost_categories,
+    today: date,
+):
+    """
+    WORKFLOW
+        1. create the same cost every week and some random costs
+        2. check only the weekly cost is detected
+        3. check costs that are older than the history are skipped
+        4. check the result is cached until the next cost is added
+    """
+
+    currency, *_ = currencies
+    category, *_ = cost_categories
+
+    async with database.transaction():
+        await asyncio.gather(
+            *(
+                domain.transactions.TransactionRepository().add_cost(
+                    CostCandidateFactory.build(
+                        name=f"Spotify #{weeks_ago}",
+                        user_id=john.id,
+                        currency_id=currency.id,
+                        category_id=category.id,
+                        value=10_00,
+                        timestamp=today - timedelta(weeks=weeks_ago),
+                    )
+                )
+                for weeks_ago in range(4)
+            ),
+            domain.transactions.TransactionRepository().add_cost(
+                CostCandidateFactory.build(
+                    name="Spotify #5",
+                    user_id=john.id,
+                    currency_id=currency.id,
+                    category_id=category.id,
+                    value=10_00,
+                    timestamp=today
+                    - timedelta(days=RECURRING_HISTORY_DAYS + 1),
+                )
+            ),
+            *(
+                domain.transactions.TransactionRepository().add_cost(
+                    CostCandidateFactory.build(
+                        user_id=john.id,
+                        currency_id=currency.id,
+                        category_id=category.id,
+                        timestamp=today - timedelta(days=days_ago),
+                    )
+                )
+                for days_ago in (1, 3, 17)
+            ),
+        )
+
+    response: httpx.Response = await client.get("/analytics/costs/recurring")
+    cached = _analytics_cache()
+
+    await client.post(
+        "/transactions/costs",
+        json={
+            "name": "PS5",
+            "value": 100,
+            "currencyId": currency.id,
+            "categoryId": category.id,
+        },
+    )
+
+    assert response.status_code == status.HTTP_200_OK, response.json()
+    assert len(cached) == 1, cached
+    assert _analytics_cache() == {}, "the cache is not invalidated"
+    assert response.json()["result"] == [
+        {
+            "name": "Spotify #0",
+            "value": 10.0,
+            "period": 7,
+            "occurrences": 4,
+            "lastDate": today.strftime("%Y-%m-%d"),
+            "nextDate": (today + timedelta(weeks=1)).strftime("%Y-%m-%d"),
+            "currency": {"id": currency.id, "name": "USD", "sign": "$"},
+            "category": {"id": category.id, "name": "Food"},
+        }
+    ]
+
+
+@pytest.mark.use_db
+async def test_costs_forecast_fetch(
+    john: domain.users.User,
+    client: httpx.AsyncClient,
+    currencies,
+    cost_categories,
+    today: date,
+):
+    """
+    WORKFLOW
+        1. create costs of the current month only
+        2. check the run-rate forecast is returned
+        3. check the result is cached until the next cost is added
+    """
+
+    currency, *_ = currencies
+    category, *_ = cost_categories
+
+    async with database.transaction():
+        await domain.transactions.TransactionRepository().add_cost(
+            CostCandidateFactory.build(
+                user_id=john.id,
+                currency_id=currency.id,
+                category_id=category.id,
+                value=10_00,
+                timestamp=today.replace(day=1),
+            )
+        )
+
+    response: httpx.Response = await client.get("/analytics/costs/forecast")
+    cached = _analytics_cache()
+
+    await client.post(
+        "/transactions/costs",
+        json={
+            "name": "PS5",
+            "value": 100,
+            "currencyId": currency.id,
+            "categoryId": category.id,
+        },
+    )
+
+    assert response.status_code == status.HTTP_200_OK, response.json()
+    assert len(cached) == 1, cached
+    assert _analytics_cache() == {}, "the cache is not invalidated"
+
+    (item,) = response.json()["result"]
+    assert item["spent"] == 10.0
+    assert item["forecast"] >= 10.0
+    assert item["historyAverage"] == 0.0
+    assert item["category"] == {"id": category.id, "name": "Food"}
@@ -0,0 +1,191 @@
+"""
+this module includes tests of sessions: login, refresh tokens rotation
+and revocation.
+"""
+
+import time
+
+import httpx
+import pytest
+from argon2 import PasswordHasher
+from fastapi import status
+from fastapi.security import HTTPAuthorizationCredentials
+
+from src import domain
+from src import operational as op
+from src.config import settings
+from src.domain.users import tokens
+from src.infrastructure import Cache, database, errors, security
+
+
+@pytest.fixture(autouse=True)
+def _revoked_sessions(mocker) -> tokens.RevokedSessions:
+    """the filter of the worker is not shared between tests."""
+
+    revoked_sessions = tokens.RevokedSessions()
+    mocker.patch.object(tokens, "revoked_sessions", revoked_sessions)
+
+    return revoked_sessions
+
+
+@pytest.fixture
+async def john_password(john: domain.users.User, mocker) -> str:
+    """set the password of 'John' hashed with the fast hasher."""
+
+    mocker.patch.object(
+        security,
+        "_password_hasher",
+        PasswordHasher(time_cost=1, memory_cost=1024, parallelism=1),
+    )
+    async with database.transaction():
+        await domain.users.UserRepository().update_user(
+            john.id, password_hash=security.hash_password("secret")
+        )
+
+    return "secret"
+
+
+def _creds(access_token: str) -> HTTPAuthorizationCredentials:
+    return HTTPAuthorizationCredentials(
+        scheme="Bearer", credentials=access_token
+    )
+
+
+@pytest.mark.use_db
+async def test_refresh_tokens_rotation(john, john_password):
+    """
+    WORKFLOW
+        1. login and refresh tokens
+        2. check new tokens belong to the same session
+        3. reuse the exchanged refresh token
+        4. check the session is revoked with all the tokens
+    """
+
+    pair = await op.get_tokens_pair(john.name, john_password)
+    rotated = await op.refresh_tokens(pair.refresh_token)
+
+    first = security.decode_token(pair.refresh_token)
+    second = security.decode_token(rotated.refresh_token)
+    assert rotated.refresh_token != pair.refresh_token
+    assert first["sid"] == second["sid"]
+    assert first["exp"] == second["exp"]
+    assert (await op.authorize(_creds(rotated.access_token))).id == john.id
+
+    with pytest.raises(errors.AuthenticationError):
+        await op.refresh_tokens(pair.refresh_token)
+
+    for token in (pair.access_token, rotated.access_token):
+        with pytest.raises(errors.AuthenticationError):
+            await op.authorize(_creds(token))
+    with pytest.raises(errors.AuthenticationError):
+        await op.refresh_tokens(rotated.refresh_token)
+
+
+@pytest.mark.use_db
+async def test_revoke_refresh_token(
+    john, john_password, anonymous: httpx.AsyncClient
+):
+    laptop = await op.get_tokens_pair(john.name, john_password)
+    phone = await op.get_tokens_pair(john.name, john_password)
+
+    response: httpx.Response = await anonymous.post(
+        "/identity/revoke-refresh",
+        json={"refreshToken": laptop.refresh_token},
+    )
+
+    assert response.status_code == status.HTTP_204_NO_CONTENT
+    with pytest.raises(errors.AuthenticationError):
+        await op.authorize(_creds(laptop.access_token))
+    with pytest.raises(errors.AuthenticationError):
+        await op.refresh_tokens(laptop.refresh_token)
+
+    # other sessions are not affected
+    assert (await op.authorize(_creds(phone.access_token))).id == john.id
+
+
+@pytest.mark.use_db
+async def test_revoked_session_other_worker(
+    john, john_password, _revoked_sessions, mocker
+):
+    """
+    WORKFLOW
+        1. check the session in the worker that has read the log
+        2. revoke the session by other worker
+        3. check the revocation is visible after the sync interval
+    """
+
+    mocker.patch.object(settings.auth, "revocation_sync_interval", 60)
+    pair = await op.get_tokens_pair(john.name, john_password)
+    session = security.decode_token(pair.refresh_token)["sid"]
+
+    assert not await domain.users.session_revoked(session)
+
+    mocker.patch.object(tokens, "revoked_sessions", tokens.RevokedSessions())
+    await op.revoke_refresh_token(pair.refresh_token)
+
+    assert not await _revoked_sessions.revoked(session)
+    mocker.patch.object(settings.auth, "revocation_sync_interval", 0)
+    assert await _revoked_sessions.revoked(session)
+
+
+@pytest.mark.use_db
+async def test_revoked_sessions_live_log(_revoked_sessions, mocker):
+    """
+    WORKFLOW
+        1. revoke sessions, expire the first one with its log entry
+        2. check the new worker starts from the first live entry
+        3. check the full filter is rebuilt from live entries
+    """
+
+    mocker.patch.object(settings.auth, "revocation_sync_interval", 0)
+    mocker.patch.object(settings.auth, "revocation_filter_capacity", 2)
+    expires_at = int(time.time()) + 60
+
+    await domain.users.revoke_session("expired", expires_at)
+    async with Cache() as cache:
+        await cache.delete(
+            tokens.REFRESH_TOKENS_CACHE_NAMESPACE, "revoked:log:1"
+        )
+        await cache.set(
+            tokens.REFRESH_TOKENS_CACHE_NAMESPACE,
+            f"revoked:log:day:{tokens._today().isoformat()}",
+            2,
+        )
+    for session in ("first", "second"):
+        await domain.users.revoke_session(session, expires_at)
+
+    worker = tokens.RevokedSessions()
+    get_many = mocker.spy(Cache, "get_many")
+
+    assert await worker.revoked("first")
+    assert not await worker.revoked("expired")
+    requested = {
+        key for call in get_many.call_args_list for key in call.args[2]
+    }
+    assert "revoked:log:1" not in requested
+
+    full = worker._filter
+    for session in ("third", "fourth"):
+        await domain.users.revoke_session(session, expires_at)
+    await worker.revoked("third")
+    await worker.revoked("third")
+
+    assert worker._filter is not full
+    assert worker._filter.count == 4
+
+
+@pytest.mark.use_db
+async def test_login_rate_limit(john, anonymous: httpx.AsyncClient):
+    """the limit is ``settings.rate_limit.login_per_minute``."""
+
+    payload = {"username": john.name, "password": "wrong"}
+
+    responses: list[httpx.Response] = [
+        await anonymous.post("/identity/tokens", json=payload)
+        for _ in range(6)
+    ]
+
+    assert {r.status_code for r in responses[:5]} == {
+        status.HTTP_401_UNAUTHORIZED
+    }
+    assert responses[5].status_code == status.HTTP_429_TOO_MANY_REQUESTS
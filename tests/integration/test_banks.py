@@ -0,0 +1,105 @@
+"""
+this module includes tests of importing bank statements incrementally.
+"""
+
+from datetime import date, datetime, timedelta
+
+import pytest
+import respx
+
+from src import domain
+from src import operational as op
+from src.config import settings
+from src.infrastructure import database
+from src.integrations import monobank
+
+START = date(2025, 1, 1)
+END = date(2025, 1, 31)
+
+
+def _transaction(id_: str, day: date) -> dict:
+    timestamp = datetime.combine(day, datetime.min.time()).timestamp()
+
+    return {
+        "id": id_,
+        "time": int(timestamp) + 12 * 60 * 60,
+        "description": "Silpo",
+        "amount": -95000,
+        "currencyCode": 980,
+    }
+
+
+@pytest.fixture(autouse=True)
+async def _monobank(mocker):
+    mocker.patch.multiple(
+        settings.monobank, retry_backoff=0, statement_rate=1000
+    )
+    mocker.patch.object(monobank, "_buckets", {})
+
+    yield
+
+    await monobank.MonobankClient.close()
+
+
+@pytest.fixture
+async def john_monobank(john) -> domain.users.User:
+    async with database.transaction():
+        await domain.users.UserRepository().update_user(
+            john.id, monobank_api_key="mock api key"
+        )
+
+    return await op.user_retrieve(john.id)
+
+
+@pytest.fixture
+def statement(mock_httpx: respx.MockRouter) -> respx.Route:
+    mock_httpx.get(monobank.PERSONAL_INFO_URL).respond(
+        json={"accounts": [{"id": "acc", "currencyCode": 980}]}
+    )
+
+    return mock_httpx.get(
+        url__startswith=f"{monobank.STATEMENTS_URL}/acc/"
+    ).respond(
+        json=[
+            _transaction("first", START),
+            _transaction("last", END),
+            _transaction("later", END + timedelta(days=5)),
+        ]
+    )
+
+
+@pytest.mark.use_db
+async def test_bank_transactions_imported_once(john_monobank, statement):
+    """
+    WORKFLOW
+        1. look up the period twice
+        2. check the statement is requested only once
+        3. check transactions are read from the local store
+    """
+
+    for _ in range(2):
+        transactions = await op.bank_transactions(john_monobank, START, END)
+
+    assert statement.call_count == 1
+    assert [item.id for item in transactions] == ["first", "last"]
+
+
+@pytest.mark.use_db
+async def test_bank_transactions_delta(john_monobank, statement):
+    """
+    WORKFLOW
+        1. import the period
+        2. look up the period that ends later
+        3. check only the rest of the period is requested
+    """
+
+    await op.bank_transactions(john_monobank, START, END)
+    await op.bank_transactions(john_monobank, START, END + timedelta(days=10))
+
+    syncs = await domain.banks.BankRepository().account_syncs(john_monobank.id)
+    _, _, _, _, start, end = statement.calls.last.request.url.path.split("/")
+    overlap = syncs["acc"].synced_until - int(start)
+
+    assert statement.call_count == 2
+    assert int(end) == syncs["acc"].synced_until
+    assert overlap == ((10 * 24 * 60 * 60) + settings.monobank.sync_overlap)
@@ -2,13 +2,18 @@
 test currencies.
 """
 
+import asyncio
+
 import httpx
 import pytest
 from fastapi import status
 
-from src import http
+from src import http, infrastructure
+from src import operational as op
+from src.config import settings
 from src.domain import equity as domain
 from src.infrastructure import database
+from tests.mock import Cache
 
 
 @pytest.mark.use_db
@@ -32,3 +37,206 @@ async def test_currency_creation(client: httpx.AsyncClient):
 
     assert response.status_code == status.HTTP_201_CREATED, response.json()
     assert total_currencies == 1
+
+
+@pytest.mark.use_db
+async def test_equity_compaction(currencies: list[database.Currency]):
+    """
+    WORKFLOW
+        1. add equity changes concurrently
+        2. check the equity includes pending changes
+        3. check compaction folds changes into the checkpoint
+    """
+
+    currency, *_ = currencies
+    repository = domain.EquityRepository()
+
+    async with database.transaction():
+        await asyncio.gather(
+            repository.increase_equity(currency.id, 100_00),
+            repository.increase_equity(currency.id, 50_00),
+            repository.decrease_equity(currency.id, 30_00),
+        )
+
+    pending: database.Currency = await repository.currency(id_=currency.id)
+    total = await op.compact_equity()
+    compacted: database.Currency = await repository.currency(id_=currency.id)
+
+    assert pending.equity == 120_00
+    assert total == 1
+    assert compacted.equity == 120_00
+    assert await repository.count(database.EquityChange) == 0
+    assert await op.compact_equity() == 0, "nothing to compact"
+
+
+@pytest.mark.use_db
+async def test_equity_reconciliation(
+    client: httpx.AsyncClient,
+    john,
+    currencies: list[database.Currency],
+    cost_factory,
+    income_factory,
+    exchange_factory,
+    mocker,
+):
+    """
+    WORKFLOW
+        1. add transactions without changing the equity (drift)
+        2. check the drift is reported by chunks
+        3. check the drift is not corrected by the user that is not allowed
+        4. check the drift is corrected
+    """
+
+    first, second = currencies
+    costs = await cost_factory(n=3)
+    incomes = await income_factory(n=2)
+    (exchange,) = await exchange_factory(n=1)
+
+    report = await op.reconcile_equity(chunk_size=1)
+    denied: httpx.Response = await client.post(
+        "/analytics/equity/reconciliation"
+    )
+    mocker.patch.object(settings.equity, "correction_user_ids", [john.id])
+    response: httpx.Response = await client.post(
+        "/analytics/equity/reconciliation"
+    )
+    after: httpx.Response = await client.get(
+        "/analytics/equity/reconciliation"
+    )
+    equity = {
+        item.id: item.equity
+        for item in await domain.EquityRepository().currencies()
+    }
+
+    expected = {
+        first.id: sum(item.value for item in incomes)
+        - sum(item.value for item in costs)
+        - exchange.from_value,
+        second.id: exchange.to_value,
+    }
+
+    assert {item.currency.id: item.expected for item in report} == expected
+    assert all(item.actual == 0 for item in report)
+    assert denied.status_code == status.HTTP_403_FORBIDDEN, denied.json()
+    assert response.status_code == status.HTTP_200_OK, response.json()
+    assert after.status_code == status.HTTP_200_OK, after.json()
+    assert all(item["difference"] == 0 for item in after.json()["result"])
+    assert equity == expected
+
+
+@pytest.mark.use_db
+async def test_equity_deltas_applied_at_once(
+    currencies: list[database.Currency],
+):
+    first, second = currencies
+    repository = domain.EquityRepository()
+
+    async with database.transaction():
+        await repository.apply_equity_deltas(
+            {second.id: 20_00, first.id: -10_00, 999: 0}
+        )
+
+    equity = {item.id: item.equity for item in await repository.currencies()}
+
+    assert equity == {first.id: -10_00, second.id: 20_00}
+    assert await repository.count(database.EquityChange) == 2, "zero skipped"
+
+
+@pytest.mark.use_db
+async def test_equity_cache_write_through(
+    client: httpx.AsyncClient,
+    currencies: list[database.Currency],
+    cost_categories,
+):
+    """
+    WORKFLOW
+        1. fetch the equity to populate the cache
+        2. add the cost
+        3. check the cache is updated with the greater version
+        4. check the equity is returned from the cache
+    """
+
+    currency, *_ = currencies
+    category, *_ = cost_categories
+    key = "fambb_equity:currencies"
+
+    await client.get("/analytics/equity")
+    cached = Cache._data[key]
+
+    await client.post(
+        "/transactions/costs",
+        json={
+            "name": "PS5",
+            "value": 100,
+            "currencyId": currency.id,
+            "categoryId": category.id,
+        },
+    )
+    updated = Cache._data[key]
+
+    # the database is not used for the steady state
+    async with database.transaction():
+        await domain.EquityRepository().decrease_equity(currency.id, 1)
+    response: httpx.Response = await client.get("/analytics/equity")
+
+    assert updated["version"] > cached["version"]
+    assert {item["id"]: item["equity"] for item in updated["items"]} == {
+        currency.id: -100_00,
+        currencies[1].id: 0,
+    }
+    assert response.status_code == status.HTTP_200_OK, response.json()
+    assert {
+        item["currency"]["id"]: item["amount"]
+        for item in response.json()["result"]
+    } == {currency.id: -100.0, currencies[1].id: 0.0}
+
+
+@pytest.mark.use_db
+async def test_equity_cache_stale_writer(
+    currencies: list[database.Currency], mocker
+):
+    """
+    WORKFLOW
+        1. read the equity before the change (the slow writer)
+        2. change the equity and save it while the slow writer is saving
+        3. check the slow writer does not overwrite the newer entry
+    """
+
+    currency, *_ = currencies
+    repository = domain.EquityRepository()
+    await op.currencies_equity()
+
+    stale = await repository.versioned_currencies()
+    async with database.transaction():
+        await repository.decrease_equity(currency.id, 1_00)
+
+    versioned_currencies = domain.EquityRepository.versioned_currencies
+    results = iter([stale])
+
+    async def versioned(self):
+        return next(results, None) or await versioned_currencies(self)
+
+    gets = infrastructure.Cache.gets
+    raced = False
+
+    async def gets_with_race(self, namespace, key):
+        nonlocal raced
+        result = await gets(self, namespace, key)
+        if not raced:
+            raced = True
+            await op.sync_equity_cache()
+
+        return result
+
+    mocker.patch.object(
+        domain.EquityRepository, "versioned_currencies", versioned
+    )
+    mocker.patch.object(infrastructure.Cache, "gets", gets_with_race)
+
+    await op.sync_equity_cache()
+
+    cached = Cache._data["fambb_equity:currencies"]
+    assert cached["version"] > stale[0]
+    assert {item["id"]: item["equity"] for item in cached["items"]}[
+        currency.id
+    ] == -1_00
@@ -0,0 +1,41 @@
+import httpx
+import pytest
+from fastapi import status
+
+from src.infrastructure import Cache, security
+from src.infrastructure.cache import CacheMetrics
+
+
+@pytest.mark.use_db
+async def test_cache_metrics_fetch(client: httpx.AsyncClient, mocker):
+    metrics = CacheMetrics()
+    metrics.hit("fambb_notifications", "1:big_costs:seq")
+    metrics.latency("fambb_notifications", 0.002)
+    mocker.patch.object(Cache, "_metrics", metrics)
+
+    response: httpx.Response = await client.get("/metrics/cache")
+
+    assert response.status_code == status.HTTP_200_OK, response.json()
+    (item,) = (
+        item
+        for item in response.json()["result"]
+        if item["namespace"] == "fambb_notifications"
+    )
+    assert item["namespace"] == "fambb_notifications"
+    assert item["hitRatio"] == 1.0
+    assert item["latency"]["0.0025"] == 1
+    assert item["hotKeys"] == [["1:big_costs:seq", 1]]
+
+
+@pytest.mark.use_db
+async def test_password_hashing_metrics_fetch(client: httpx.AsyncClient):
+    await security.verify_password_async(
+        "secret", security.hash_password("secret")
+    )
+
+    response: httpx.Response = await client.get("/metrics/password-hashing")
+
+    assert response.status_code == status.HTTP_200_OK, response.json()
+    result = response.json()["result"]
+    assert result["calls"] >= 1
+    assert result["inProgress"] == result["waiting"] == 0
@@ -8,11 +8,33 @@ import httpx
 import pytest
 from fastapi import status
 
+from src.domain.notifications import (
+    Notification,
+    Notifications,
+    notify,
+    notify_many,
+    pop_notifications,
+)
+from src.domain.notifications.services import NOTIFICATIONS_CACHE_NAMESPACE
 from src.domain.transactions import TransactionRepository
 from src.infrastructure import database
 from tests.mock import Cache
 
 
+def _unread(user_id: int, topic: str) -> list[dict]:
+    """notifications that are stored in the cache for the user."""
+
+    prefix = f"fambb_notifications:{user_id}:{topic}:"
+
+    return [
+        value
+        for key, value in Cache._data.items()
+        if key.startswith(prefix)
+        and key.removeprefix(prefix).isdigit()
+        and value
+    ]
+
+
 @pytest.mark.use_db
 async def test_user_NOTIFIED_about_big_cost(
     currencies, cost_categories, client, john, client_marry
@@ -40,9 +62,7 @@ async def test_user_NOTIFIED_about_big_cost(
     ), add_cost_response.json()
 
     await asyncio.sleep(0.1)
-    cache_len_after_creating_cost = len(
-        Cache._data[f"fambb_notifications:{john.id}"]["big_costs"]
-    )
+    cache_len_after_creating_cost = len(_unread(john.id, "big_costs"))
 
     notifications_response = await client.get("/notifications")
 
@@ -50,7 +70,9 @@ async def test_user_NOTIFIED_about_big_cost(
         notifications_response.status_code == status.HTTP_200_OK
     ), notifications_response.json()
     assert cache_len_after_creating_cost == 1, Cache._data
-    assert Cache._data == {}
+    assert len(notifications_response.json()["result"]) == 1
+    assert _unread(john.id, "big_costs") == []
+    assert _unread(john.id, "incomes") == []
 
 
 @pytest.mark.use_db
@@ -74,7 +96,7 @@ async def test_user_NOT_NOTIFIED_about_big_cost(
     )
 
     await asyncio.sleep(0.1)
-    john_notificaitons = Cache._data.get(f"fambb_notifications:{john.id}")
+    john_notificaitons = _unread(john.id, "big_costs")
 
     notifications_response = await client.get("/notifications")
 
@@ -84,8 +106,8 @@ async def test_user_NOT_NOTIFIED_about_big_cost(
     assert (
         notifications_response.status_code == status.HTTP_200_OK
     ), notifications_response.json()
-    assert john_notificaitons is None, john_notificaitons
-    assert Cache._data == {}
+    assert john_notificaitons == [], john_notificaitons
+    assert notifications_response.json()["result"] == []
 
 
 @pytest.mark.use_db
@@ -122,9 +144,7 @@ async def test_user_notified_about_big_cost_after_update(
     )
 
     await asyncio.sleep(0.1)
-    cache_len_after_creating_cost = len(
-        Cache._data[f"fambb_notifications:{john.id}"]["big_costs"]
-    )
+    cache_len_after_creating_cost = len(_unread(john.id, "big_costs"))
 
     notifications_response = await client.get("/notifications")
 
@@ -135,7 +155,9 @@ async def test_user_notified_about_big_cost_after_update(
         notifications_response.status_code == status.HTTP_200_OK
     ), notifications_response.json()
     assert cache_len_after_creating_cost == 1, Cache._data
-    assert Cache._data == {}
+    assert len(notifications_response.json()["result"]) == 1
+    assert _unread(john.id, "big_costs") == []
+    assert _unread(john.id, "incomes") == []
 
 
 @pytest.mark.use_db
@@ -155,9 +177,7 @@ async def test_user_notified_about_income(
     )
 
     await asyncio.sleep(0.1)
-    cache_len_after_creating_cost = len(
-        Cache._data[f"fambb_notifications:{john.id}"]["incomes"]
-    )
+    cache_len_after_creating_cost = len(_unread(john.id, "incomes"))
 
     notifications_response = await client.get("/notifications")
 
@@ -168,4 +188,89 @@ async def test_user_notified_about_income(
         notifications_response.status_code == status.HTTP_200_OK
     ), notifications_response.json()
     assert cache_len_after_creating_cost == 1, Cache._data
-    assert Cache._data == {}
+    assert len(notifications_response.json()["result"]) == 1
+    assert _unread(john.id, "big_costs") == []
+    assert _unread(john.id, "incomes") == []
+
+
+async def test_notifications_concurrent_append():
+    """
+    WORKFLOW
+        1. notify the user concurrently
+        2. check all the notifications are returned once
+    """
+
+    await asyncio.gather(
+        *(
+            notify(
+                user_id=1,
+                topic="worker",
+                notification=Notification(message=str(i), level="🤖"),
+            )
+            for i in range(10)
+        )
+    )
+
+    notifications = await pop_notifications(user_id=1)
+    again = await pop_notifications(user_id=1)
+
+    assert [item.message for item in notifications.worker] == [
+        str(i) for i in range(10)
+    ]
+    assert again == Notifications()
+
+
+async def test_notifications_counter_lost():
+    """
+    WORKFLOW
+        1. notify the user and read notifications
+        2. lose the counter (evicted)
+        3. check new notifications are returned anyway
+    """
+
+    for message in ("first", "second"):
+        await notify(
+            user_id=1,
+            topic="worker",
+            notification=Notification(message=message, level="🤖"),
+        )
+    await pop_notifications(user_id=1)
+
+    async with Cache() as cache:
+        await cache.delete(NOTIFICATIONS_CACHE_NAMESPACE, "1:worker:seq")
+    await notify(
+        user_id=1,
+        topic="worker",
+        notification=Notification(message="third", level="🤖"),
+    )
+
+    notifications = await pop_notifications(user_id=1)
+
+    assert [item.message for item in notifications.worker] == ["third"]
+
+
+async def test_notify_many_batched(mocker):
+    """counters and notifications of all the users take one request each."""
+
+    await notify_many(
+        [1, 2, 3],
+        "worker",
+        Notification(message="first", level="🤖"),
+    )
+    incr_many = mocker.spy(Cache.memory(), "incr_many")
+    add_many = mocker.spy(Cache.memory(), "add_many")
+
+    await notify_many(
+        [1, 2, 3],
+        "worker",
+        Notification(message="second", level="🤖"),
+    )
+
+    assert incr_many.await_count == 1
+    assert add_many.await_count == 1
+    for user_id in (1, 2, 3):
+        notifications = await pop_notifications(user_id=user_id)
+        assert [item.message for item in notifications.worker] == [
+            "first",
+            "second",
+        ]
@@ -5,8 +5,11 @@ this module includes tests related to the user and user configuration.
 import httpx
 import pytest
 from fastapi import status
+from fastapi.security import HTTPAuthorizationCredentials
 
+from src import operational as op
 from src.domain import users as domain
+from src.infrastructure import Cache, errors, security
 
 
 # ==================================================
@@ -191,3 +194,66 @@ async def test_user_update_monobank_api_key(john: domain.User, client):
     assert (
         configuration_raw_response.get("monobankApiKey") is None
     ), configuration_raw_response
+
+
+@pytest.mark.use_db
+async def test_authorize_cached_user(john: domain.User, mocker):
+    """
+    WORKFLOW
+        1. authorize with the access token twice
+        2. check the user is fetched from the database once
+        3. update the user and check the next authorization sees changes
+    """
+
+    spy = mocker.spy(domain.UserRepository, "user_by_id")
+    creds = HTTPAuthorizationCredentials(
+        scheme="Bearer", credentials=security.create_access_token(john.id)
+    )
+
+    first = await op.authorize(creds)
+    second = await op.authorize(creds)
+    await op.user_update(john, show_equity=True)
+    updated = await op.authorize(creds)
+
+    assert first == second == john
+    assert updated.configuration.show_equity is True
+    # the first authorization, ``user_update`` and the last authorization
+    assert spy.call_count == 3
+
+
+@pytest.mark.use_db
+async def test_authorize_missing_user():
+    creds = HTTPAuthorizationCredentials(
+        scheme="Bearer", credentials=security.create_access_token(1)
+    )
+
+    with pytest.raises(errors.AuthenticationError):
+        await op.authorize(creds)
+
+
+@pytest.mark.use_db
+async def test_authorize_cache_failure(john: domain.User, mocker):
+    """
+    WORKFLOW
+        1. set the Monobank API key and authorize
+        2. check the key is not cached, but the integration is active
+        3. break the cache and check the user is read from the database
+    """
+
+    creds = HTTPAuthorizationCredentials(
+        scheme="Bearer", credentials=security.create_access_token(john.id)
+    )
+    await op.user_update(john, monobank_api_key="secret key")
+
+    cached = await op.authorize(creds)
+
+    assert cached.configuration.monobank_api_key is None
+    assert cached.configuration.monobank_integration_active is True
+
+    mocker.patch.object(
+        Cache, "get_or_set", side_effect=ConnectionError("down")
+    )
+    user = await op.authorize(creds)
+
+    assert user.id == john.id
+    assert user.configuration.monobank_api_key == "secret key"
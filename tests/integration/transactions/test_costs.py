@@ -184,6 +184,53 @@ async def test_cost_update_only_value_increased(
     assert updated_instance.value == new_value
 
 
+@pytest.mark.use_db
+async def test_cost_update_concurrent(
+    client: httpx.AsyncClient, currencies, cost_factory
+):
+    """concurrent updates calculate the equity from the latest value."""
+
+    cost, *_ = await cost_factory(n=1)
+    responses = await asyncio.gather(
+        *(
+            client.patch(
+                f"/transactions/costs/{cost.id}", json={"value": value}
+            )
+            for value in (100, 200, 300)
+        )
+    )
+
+    currency: database.Currency = (
+        await domain.equity.EquityRepository().currency(id_=1)
+    )
+    updated_instance = await domain.transactions.TransactionRepository().cost(
+        id_=cost.id
+    )
+
+    assert all(
+        response.status_code == status.HTTP_200_OK for response in responses
+    ), [response.json() for response in responses]
+    assert currency.equity == cost.value - updated_instance.value
+
+
+@pytest.mark.use_db
+async def test_cost_update_nothing(
+    client: httpx.AsyncClient, currencies, cost_factory
+):
+    cost, *_ = await cost_factory(n=1)
+    response = await client.patch(
+        f"/transactions/costs/{cost.id}",
+        json={"name": cost.name, "value": cost.value / 100},
+    )
+
+    currency: database.Currency = (
+        await domain.equity.EquityRepository().currency(id_=1)
+    )
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST, response.json()
+    assert currency.equity == currencies[0].equity
+
+
 @pytest.mark.use_db
 async def test_cost_update_only_currency(
     client: httpx.AsyncClient, currencies, cost_factory
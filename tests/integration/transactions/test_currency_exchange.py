@@ -3,12 +3,14 @@ this package includes high-level tests for currency exchange operatinos
 """
 
 import asyncio
+from datetime import date
 
 import httpx
 import pytest
 from fastapi import status
 
 from src import domain
+from src import operational as op
 from src.infrastructure import database
 
 
@@ -99,6 +101,31 @@ async def test_exchange_add(client: httpx.AsyncClient, currencies):
     assert to_currency.equity == currencies[1].equity + 2000
 
 
+@pytest.mark.use_db
+async def test_exchange_same_currency(john, currencies):
+    """both sides of the exchange change the equity of the currency.
+
+    notes:
+        the HTTP contract rejects it, but the operation does not.
+    """
+
+    item = await op.currency_exchange(
+        from_value=10_00,
+        to_value=9_00,
+        timestamp=date.today(),
+        from_currency_id=1,
+        to_currency_id=1,
+        user_id=john.id,
+    )
+    added = await domain.equity.EquityRepository().currency(id_=1)
+
+    await op.delete_currency_exchange(item.id)
+    deleted = await domain.equity.EquityRepository().currency(id_=1)
+
+    assert added.equity == currencies[0].equity - 1_00
+    assert deleted.equity == currencies[0].equity
+
+
 @pytest.mark.use_db
 async def test_exchange_delete(
     client: httpx.AsyncClient, currencies, exchange_factory
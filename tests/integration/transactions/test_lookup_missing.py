@@ -1,3 +1,4 @@
+from datetime import date, datetime
 from typing import Final
 
 import httpx
@@ -6,65 +7,113 @@ import respx
 from fastapi import status
 
 from src import domain
+from src.config import settings
 from src.infrastructure import database
 from src.integrations import monobank
-from tests.utils import read_json
 
 BASE_URL: Final = "/transactions/lookup-missing"
+PARAMS: Final = {"startDate": "2025-01-01", "endDate": "2025-01-31"}
+
+
+def _bank_transaction(id_: str, day: date, amount: int, name: str) -> dict:
+    timestamp = datetime.combine(day, datetime.min.time()).timestamp()
+
+    return {
+        "id": id_,
+        "time": int(timestamp) + 12 * 60 * 60,
+        "description": name,
+        "amount": amount,
+        "currencyCode": 840,
+    }
+
+
+@pytest.fixture(autouse=True)
+async def _monobank(mocker):
+    mocker.patch.multiple(
+        settings.monobank, retry_backoff=0, statement_rate=1000
+    )
+    mocker.patch.object(monobank, "_buckets", {})
+
+    yield
+
+    await monobank.MonobankClient.close()
 
 
-@pytest.mark.skip("Monobank is not integrated yet")
 @pytest.mark.use_db
 async def test_lookup_missing_UNAUTHORIZED(anonymous):
-    response: httpx.Response = await anonymous.post(BASE_URL)
+    response: httpx.Response = await anonymous.post(BASE_URL, params=PARAMS)
     assert response.status_code == status.HTTP_401_UNAUTHORIZED
 
 
-@pytest.mark.skip("Monobank is not integrated yet")
 @pytest.mark.use_db
 async def test_lookup_missing_NO_API_KEY_IN_SETTINGS(
     client: httpx.AsyncClient,
 ):
-    response: httpx.Response = await client.post(BASE_URL)
+    response: httpx.Response = await client.post(BASE_URL, params=PARAMS)
     assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
 
 
-@pytest.mark.skip("Monobank is not integrated yet")
 @pytest.mark.use_db
-@respx.mock
-async def test_monobank_sync(john, client: httpx.AsyncClient):
-    mock_response_personal_info = read_json(
-        "response/monobank_personal_info.json"
-    )
-
-    personal_info_route = respx.get(monobank.PERSONAL_INFO_URL).mock(
-        return_value=httpx.Response(
-            status.HTTP_200_OK, json=mock_response_personal_info
-        )
-    )
-
-    mock_response_statement = read_json("response/monobank_statement.json")
-    statement_route = respx.route(
-        url__regex=rf"{monobank.STATEMENTS_URL}/[\w+]"
-    ).mock(
-        return_value=httpx.Response(
-            status.HTTP_200_OK, json=mock_response_statement
-        )
-    )
-
-    # patch cache ``get`` method to make sure that
-    # it must be check before saving transactions to prevent duplicates
-    await domain.users.UserRepository().update_user(
-        id_=john.id, monobank_api_key="mock api key"
-    )
+async def test_lookup_missing(
+    john,
+    client: httpx.AsyncClient,
+    currencies,
+    cost_categories,
+    mock_httpx: respx.MockRouter,
+):
+    """
+    WORKFLOW
+        1. record the cost that the bank has 2 days later
+        2. look up missing transactions
+        3. check only not recorded ones are returned with categories
+    """
 
+    usd, food = currencies[0], cost_categories[0]
     async with database.transaction():
         await domain.users.UserRepository().update_user(
             id_=john.id, monobank_api_key="mock api key"
         )
+        await domain.transactions.TransactionRepository().add_cost(
+            database.Cost(
+                name="Groceries",
+                value=1050,
+                timestamp=date(2025, 1, 10),
+                user_id=john.id,
+                currency_id=usd.id,
+                category_id=food.id,
+            )
+        )
+    mock_httpx.get(monobank.PERSONAL_INFO_URL).respond(
+        json={"accounts": [{"id": "acc", "currencyCode": 840}]}
+    )
+    mock_httpx.get(url__startswith=f"{monobank.STATEMENTS_URL}/acc/").respond(
+        json=[
+            _bank_transaction("matched", date(2025, 1, 12), -1050, "Silpo"),
+            _bank_transaction("cost", date(2025, 1, 20), -700, "Silpo"),
+            _bank_transaction("income", date(2025, 1, 25), 5000, "Salary"),
+        ]
+    )
 
-    response: httpx.Response = await client.post(f"{BASE_URL}/sync")
+    response: httpx.Response = await client.post(BASE_URL, params=PARAMS)
 
-    assert response.status_code == status.HTTP_204_NO_CONTENT, response.json()
-    assert personal_info_route.call_count == 1
-    assert statement_route.call_count == 1
+    assert response.status_code == status.HTTP_200_OK, response.json()
+    assert response.json()["result"] == [
+        {
+            "id": "cost",
+            "operation": "cost",
+            "name": "Silpo",
+            "value": 7.0,
+            "timestamp": "2025-01-20",
+            "currencyId": usd.id,
+            "suggestedCategoryId": food.id,
+        },
+        {
+            "id": "income",
+            "operation": "income",
+            "name": "Salary",
+            "value": 50.0,
+            "timestamp": "2025-01-25",
+            "currencyId": usd.id,
+            "suggestedCategoryId": None,
+        },
+    ]
@@ -1,48 +1,41 @@
-from typing import Self
+from collections.abc import Iterator, Mapping
+from typing import Any, ClassVar
 
-from src.infrastructure import Cache as MemcachedCache
-from src.infrastructure import errors
+from src.infrastructure import Cache as BaseCache
+from src.infrastructure.cache import codecs
 
 
-class Cache(MemcachedCache):
-    """dict replacement for existing cache.
+class _MemoryView(Mapping[str, Any]):
+    """decoded values of the in-memory cache backend by full keys."""
 
-    ARGS
-    ``_data`` - set for 'DEV purposes'. check this variable in test
+    def __getitem__(self, key: str) -> Any:
+        if (result := BaseCache.memory().storage.peek(key)) is None:
+            raise KeyError(key)
+        else:
+            return codecs.decode(*result)
 
-    TODO
-    instead of having the whole Cache class updated for the same purposes
-    it is better to create a mocked full-Descriptor class to make it work
-    with regular Python dictionary instead of speaking to separate service
+    def __iter__(self) -> Iterator[str]:
+        return BaseCache.memory().storage.keys()
 
-    NOTES
-    this class just mockes the inherited class
-    """
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
 
-    _data: dict[str, dict] = {}
+    def copy(self) -> dict[str, Any]:
+        return dict(self.items())
 
-    def __init__(self) -> None:
-        pass
+    def clear(self) -> None:
+        BaseCache.memory().storage.clear()
 
-    async def __aenter__(self) -> Self:
-        return self
 
-    async def __aexit__(self, *args, **kwargs) -> None:
-        pass
+class Cache(BaseCache):
+    """the cache with the in-memory backend that is used in tests.
 
-    async def set(self, namespace: str, key: str, value: dict) -> bool | None:
-        Cache._data[f"{namespace}:{key}"] = value
-        return True
+    ARGS
+    ``_data`` - set for 'DEV purposes'. check this variable in test
 
-    async def get(self, namespace: str, key: str) -> dict:
-        if (result := Cache._data.get(f"{namespace}:{key}")) is None:
-            raise errors.NotFoundError
-        else:
-            return result
+    NOTES
+    the ``memory`` backend is selected for all the tests, so the cache
+    is tested by the same code path that is used in production
+    """
 
-    async def delete(self, namespace: str, key: str) -> bool:
-        if Cache._data.get(f"{namespace}:{key}"):
-            del Cache._data[f"{namespace}:{key}"]
-            return True
-        else:
-            return False
+    _data: ClassVar[_MemoryView] = _MemoryView()
@@ -0,0 +1,156 @@
+from datetime import date, timedelta
+
+from src import domain
+from src.domain.transactions.analytics import normalize_cost_name
+
+CURRENCY = domain.equity.Currency(id=1, name="USD", sign="$")
+CATEGORY = domain.transactions.CostCategory(id=1, name="Services")
+
+
+def _cost(id_: int, name: str, value: int, timestamp: date):
+    return domain.transactions.Cost(
+        id=id_,
+        name=name,
+        value=value,
+        timestamp=timestamp,
+        user_id=1,
+        currency=CURRENCY,
+        category=CATEGORY,
+    )
+
+
+def test_normalize_cost_name():
+    assert normalize_cost_name("Netflix #1234") == "netflix"
+    assert normalize_cost_name("  Rent (March) ") == "rent march"
+
+
+def test_recurring_costs_detected_monthly():
+    today = date(2025, 4, 20)
+    costs = [
+        _cost(1, "Netflix #1", 1500, date(2025, 1, 5)),
+        _cost(2, "Netflix #2", 1500, date(2025, 2, 5)),
+        _cost(3, "Groceries", 4000, date(2025, 2, 11)),
+        _cost(4, "Netflix #3", 1600, date(2025, 3, 5)),
+        _cost(5, "Netflix #4", 1600, date(2025, 4, 5)),
+    ]
+
+    results = domain.transactions.detect_recurring_costs(costs, today=today)
+
+    assert len(results) == 1, results
+    (item,) = results
+    assert item.name == "Netflix #4"
+    assert item.occurrences == 4
+    assert item.last_date == date(2025, 4, 5)
+    assert item.next_date == date(2025, 5, 5)
+
+
+def test_recurring_costs_split_by_value_band():
+    """the same name with different values are different subscriptions."""
+
+    start = date(2025, 1, 1)
+    today = start + timedelta(weeks=11)
+    costs = [
+        _cost(i, "Google", value, start + timedelta(days=7 * i))
+        for i in range(1, 11)
+        for value in (100, 10000)
+    ]
+
+    results = domain.transactions.detect_recurring_costs(costs, today=today)
+
+    assert sorted(item.value for item in results) == [100, 10000]
+    assert all(item.period == 7 for item in results)
+
+
+def test_recurring_costs_skip_irregular_and_inactive():
+    today = date(2025, 12, 1)
+    costs = [
+        # irregular gaps
+        _cost(1, "Taxi", 500, date(2025, 11, 1)),
+        _cost(2, "Taxi", 500, date(2025, 11, 9)),
+        _cost(3, "Taxi", 500, date(2025, 11, 29)),
+        _cost(4, "Taxi", 500, date(2025, 11, 30)),
+        # was cancelled a long time ago
+        _cost(5, "Gym", 3000, date(2025, 1, 10)),
+        _cost(6, "Gym", 3000, date(2025, 2, 10)),
+        _cost(7, "Gym", 3000, date(2025, 3, 10)),
+    ]
+
+    assert domain.transactions.detect_recurring_costs(costs, today=today) == ()
+
+
+def test_costs_forecast_seasonality():
+    """rent paid at the end of previous months is expected again.
+
+    notes:
+        150 + 0.8 * 1000 (seasonality) + 0.2 * 150 (run-rate)
+    """
+
+    today = date(2025, 4, 15)
+    daily = [
+        domain.transactions.CostsByDay(
+            timestamp=timestamp,
+            total=total,
+            currency=CURRENCY,
+            category=CATEGORY,
+        )
+        for timestamp, total in (
+            (date(2025, 1, 31), 1000),
+            (date(2025, 2, 28), 1000),
+            (date(2025, 3, 31), 1000),
+            (date(2025, 4, 10), 150),
+            (date(2025, 4, 20), 999),  # the future is skipped
+        )
+    ]
+
+    (item,) = domain.transactions.forecast_costs(daily, today=today)
+
+    assert item.spent == 150
+    assert item.history_average == 1000
+    assert item.forecast == 980
+
+
+def test_costs_forecast_run_rate_without_history():
+    today = date(2025, 4, 10)
+    daily = [
+        domain.transactions.CostsByDay(
+            timestamp=date(2025, 4, day),
+            total=100,
+            currency=CURRENCY,
+            category=CATEGORY,
+        )
+        for day in range(1, 11)
+    ]
+
+    (item,) = domain.transactions.forecast_costs(daily, today=today)
+
+    assert item.spent == 1000
+    assert item.history_average == 0
+    assert item.forecast == 3000
+
+
+def test_costs_forecast_partial_history():
+    """the single previous month has the third of the full weight.
+
+    notes:
+        1000 + 0.8 / 3 * 2100 (seasonality) + (1 - 0.8 / 3) * 2000 (run-rate)
+    """
+
+    today = date(2025, 4, 10)
+    daily = [
+        domain.transactions.CostsByDay(
+            timestamp=timestamp,
+            total=100,
+            currency=CURRENCY,
+            category=CATEGORY,
+        )
+        for timestamp in (
+            *(date(2025, 3, day) for day in range(1, 32)),
+            *(date(2025, 4, day) for day in range(1, 11)),
+        )
+    ]
+
+    (item,) = domain.transactions.forecast_costs(daily, today=today)
+
+    assert item.spent == 1000
+    assert item.history_average == 3100
+    assert item.forecast == 3027
@@ -0,0 +1,20 @@
+import pytest
+
+from src.domain.banks import AccountSync
+
+
+@pytest.mark.parametrize(
+    "start,end,expected",
+    [
+        (200, 300, []),
+        (100, 300, [(100, 200)]),
+        (300, 500, [(350, 500)]),
+        (50, 500, [(50, 200), (350, 500)]),
+        # the gap between the imported range and the requested one
+        (500, 600, [(350, 600)]),
+    ],
+)
+def test_account_sync_missing(start, end, expected):
+    sync = AccountSync(account_id="acc", synced_from=200, synced_until=400)
+
+    assert sync.missing(start, end, overlap=50) == expected
@@ -0,0 +1,30 @@
+import pytest
+
+from src.infrastructure import BloomFilter
+
+
+def test_bloom_filter_sizing():
+    bloom = BloomFilter(capacity=100_000, error_rate=0.01)
+
+    assert bloom.hashes == 7
+    assert 115_000 < len(bloom._bits) < 125_000
+
+
+def test_bloom_filter_membership():
+    bloom = BloomFilter(capacity=1000, error_rate=0.01)
+    items = [f"session-{i}" for i in range(1000)]
+
+    for item in items:
+        bloom.add(item)
+
+    false_positives = sum(f"other-{i}" in bloom for i in range(10_000))
+
+    assert all(item in bloom for item in items)
+    assert bloom.count == 1000
+    assert false_positives < 300
+
+
+@pytest.mark.parametrize("capacity,error_rate", [(0, 0.01), (10, 1.0)])
+def test_bloom_filter_wrong_parameters(capacity, error_rate):
+    with pytest.raises(ValueError):
+        BloomFilter(capacity=capacity, error_rate=error_rate)
@@ -0,0 +1,442 @@
+import asyncio
+
+import pytest
+
+from src.config import settings
+from src.infrastructure import Cache, errors
+from src.infrastructure.cache import (
+    CacheMetrics,
+    LocalCache,
+    MemcachedBackend,
+    MemoryBackend,
+    codecs,
+)
+
+
+async def _fake_memcached(reader, writer):
+    """respond to the ``version`` command slowly."""
+
+    while await reader.readline():
+        await asyncio.sleep(0.05)
+        writer.write(b"VERSION 1.6.0\r\n")
+        await writer.drain()
+
+    writer.close()
+
+
+async def test_cache_shared_pool_stats(mocker):
+    """
+    WORKFLOW
+        1. start the fake memcached server
+        2. run more concurrent commands than the pool size
+        3. check the pool is shared and waits are reported
+    """
+
+    server = await asyncio.start_server(_fake_memcached, "127.0.0.1", 0)
+    _, port = server.sockets[0].getsockname()
+    mocker.patch.multiple(
+        settings.cache,
+        backend="memcached",
+        host="127.0.0.1",
+        port=port,
+        pool=2,
+    )
+
+    await Cache.connect()
+    try:
+        backend = Cache._shared_backend
+        assert isinstance(backend, MemcachedBackend)
+
+        await asyncio.gather(*(backend.client.version() for _ in range(6)))
+        stats = Cache.pool_stats()
+    finally:
+        await Cache.disconnect()
+        server.close()
+        await server.wait_closed()
+
+    assert stats is not None
+    assert stats.size == 2
+    assert stats.in_use == 0
+    assert stats.acquisitions == 6
+    assert stats.waits == 4
+    assert stats.wait_max > 0
+    assert Cache.pool_stats() is None, "the pool is not closed"
+
+
+def test_cache_codec_compression(mocker):
+    """
+    WORKFLOW
+        1. encode small and large values
+        2. check only the large value is compressed
+        3. check both values are decoded back
+    """
+
+    mocker.patch.object(settings.cache, "compression_threshold", 128)
+    small = {"name": "Bob's coffee", "value": 100, "paid": None}
+    large = {"items": [{"name": "rent", "value": 1000}] * 100}
+
+    small_data, small_flags = codecs.encode(small)
+    large_data, large_flags = codecs.encode(large)
+
+    assert not small_flags & codecs.COMPRESSED
+    assert large_flags & codecs.COMPRESSED
+    assert len(large_data) < 128
+    assert codecs.decode(small_data, small_flags) == small
+    assert codecs.decode(large_data, large_flags) == large
+
+
+def test_cache_codec_errors():
+    assert codecs.decode_legacy(b"{'value': 1}") == {"value": 1}
+
+    with pytest.raises(ValueError):
+        codecs.decode(b"{}", 0xFF)
+    with pytest.raises(ValueError):
+        codecs.decode(b"broken", codecs.DEFAULT_CODEC.flag | codecs.COMPRESSED)
+    with pytest.raises(ValueError):
+        codecs.encode(object())
+
+
+def test_local_cache_limits(mocker):
+    """
+    WORKFLOW
+        1. overflow the local cache by entries and by bytes
+        2. check least recently used entries are evicted
+        3. check expired entries are missed
+    """
+
+    now = mocker.patch("time.monotonic", return_value=100.0)
+    local = LocalCache(max_entries=2, max_bytes=10)
+
+    local.set("a", b"1234", 1, ttl=5)
+    local.set("b", b"1234", 1, ttl=5)
+    assert local.get("a") == (b"1234", 1)
+
+    local.set("c", b"12", 1, ttl=5)  # entries limit: "b" is evicted
+    assert local.get("b") is None
+
+    local.set("d", b"123456789", 1, ttl=5)  # bytes limit: "a" and "c"
+    assert local.get("a") is None
+    assert local.get("c") is None
+
+    local.set("e", b"x" * 11, 1, ttl=5)  # too large to be stored
+    assert local.get("e") is None
+
+    now.return_value = 105.0
+    assert local.get("d") is None, "the entry is not expired"
+
+    stats = local.stats()
+    assert stats.hits == 1
+    assert stats.misses == 5
+    assert stats.evictions == 3
+    assert stats.entries == 0
+    assert stats.size == 0
+
+
+async def test_cache_local_tier(mocker):
+    """
+    WORKFLOW
+        1. read the value of the namespace with the local policy twice
+        2. check memcached is requested only once
+        3. check the deleted value is not served by the local tier
+    """
+
+    mocker.patch.object(settings.cache.local, "policies", {"local": 60})
+    mocker.patch.object(Cache, "_local", LocalCache(10, 1024))
+    mocker.patch.multiple(Cache, _remote_hits=0, _remote_misses=0)
+
+    cache = Cache()
+    cache._backend = backend = mocker.AsyncMock()
+    backend.get_many.return_value = [codecs.encode({"value": 1})]
+    backend.delete_many.return_value = [True]
+
+    assert await cache.get("local", "key") == {"value": 1}
+    assert await cache.get("local", "key") == {"value": 1}
+    assert await cache.get("remote", "key") == {"value": 1}
+    assert backend.get_many.await_count == 2
+
+    await cache.delete("local", "key")
+    backend.get_many.return_value = [None]
+    with pytest.raises(errors.NotFoundError):
+        await cache.get("local", "key")
+
+    stats = Cache.tier_stats()
+    assert stats["local"].hits == 1
+    assert stats["local"].misses == 2
+    assert stats["remote"].hits == 2
+    assert stats["remote"].misses == 1
+
+
+async def test_cache_get_or_set_single_flight():
+    """
+    WORKFLOW
+        1. request the missing value concurrently
+        2. check the producer is called once
+        3. expire the value while another worker holds the lease
+        4. check the stale value is returned without producing
+        5. release the lease and check the value is produced again
+    """
+
+    calls = 0
+
+    async def producer() -> dict:
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.05)
+        return {"calls": calls}
+
+    async with Cache() as cache:
+        results = await asyncio.gather(
+            *(
+                cache.get_or_set("ns", "key", producer, ttl=60)
+                for _ in range(5)
+            )
+        )
+        assert results == [{"calls": 1}] * 5
+        assert calls == 1
+
+        entry = await cache.get("ns", "key")
+        await cache.set("ns", "key", {**entry, "fresh_until": 0})
+        await cache.add("ns:lease", "key", True)
+
+        assert await cache.get_or_set("ns", "key", producer, ttl=60) == {
+            "calls": 1
+        }
+        assert calls == 1
+
+        await cache.delete("ns:lease", "key")
+
+        assert await cache.get_or_set("ns", "key", producer, ttl=60) == {
+            "calls": 2
+        }
+        assert not Cache._inflight
+
+
+async def test_cache_get_or_set_first_caller_cancelled():
+    """the waiting caller gets the value if the first one is cancelled."""
+
+    started = asyncio.Event()
+    release = asyncio.Event()
+
+    async def producer() -> dict:
+        started.set()
+        await release.wait()
+        return {"value": 1}
+
+    async def call() -> dict:
+        async with Cache() as cache:
+            return await cache.get_or_set("ns", "key", producer, ttl=60)
+
+    first = asyncio.create_task(call())
+    await started.wait()
+    second = asyncio.create_task(call())
+    await asyncio.sleep(0)
+
+    first.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await first
+    release.set()
+
+    assert await second == {"value": 1}
+
+
+async def test_cache_get_or_set_invalidated_while_producing():
+    """the value that is produced before the invalidation is not kept."""
+
+    calls = 0
+
+    async def producer() -> dict:
+        nonlocal calls
+        calls += 1
+        if calls == 1:
+            async with Cache() as other:
+                await other.invalidate("ns", "key")
+        return {"calls": calls}
+
+    async with Cache() as cache:
+        assert await cache.get_or_set("ns", "key", producer, ttl=60) == {
+            "calls": 1
+        }
+        with pytest.raises(errors.NotFoundError):
+            await cache.get("ns", "key")
+
+        assert await cache.get_or_set("ns", "key", producer, ttl=60) == {
+            "calls": 2
+        }
+        assert (await cache.get("ns", "key"))["value"] == {"calls": 2}
+
+
+_storage: dict[bytes, tuple[bytes, bytes]] = {}
+_tokens: dict[bytes, int] = {}
+
+
+def _fake_retrieve(command: bytes, keys: list[bytes]) -> bytes:
+    reply = b""
+    for key in keys:
+        if key in _storage:
+            flags, data = _storage[key]
+            cas = b" %d" % _tokens[key] if command == b"gets" else b""
+            reply += b"VALUE %b %b %d%b\r\n%b\r\n" % (
+                key,
+                flags,
+                len(data),
+                cas,
+                data,
+            )
+
+    return reply + b"END\r\n"
+
+
+def _fake_store(command: bytes, args: list[bytes], data: bytes) -> bytes:
+    key, flags, _, length, *token = args
+
+    if command == b"add" and key in _storage:
+        return b"NOT_STORED\r\n"
+    elif command == b"cas" and key not in _storage:
+        return b"NOT_FOUND\r\n"
+    elif command == b"cas" and _tokens[key] != int(*token):
+        return b"EXISTS\r\n"
+
+    _storage[key] = (flags, data[: int(length)])
+    _tokens[key] = _tokens.get(key, 0) + 1
+    return b"STORED\r\n"
+
+
+def _fake_incr(key: bytes, delta: bytes) -> bytes:
+    if (item := _storage.get(key)) is None:
+        return b"NOT_FOUND\r\n"
+
+    value = b"%d" % (int(item[1]) + int(delta))
+    _storage[key] = (item[0], value)
+
+    return value + b"\r\n"
+
+
+async def _fake_memcached_storage(reader, writer):
+    """support storage, retrieval and ``incr`` commands in memory."""
+
+    while line := await reader.readline():
+        command, *args = line.split()
+
+        if command in (b"get", b"gets"):
+            writer.write(_fake_retrieve(command, args))
+        elif command in (b"set", b"add", b"cas"):
+            writer.write(_fake_store(command, args, await reader.readline()))
+        elif command == b"incr":
+            writer.write(_fake_incr(*args))
+        elif command == b"delete":
+            deleted = _storage.pop(args[0], None) is not None
+            writer.write(b"DELETED\r\n" if deleted else b"NOT_FOUND\r\n")
+
+        await writer.drain()
+
+    writer.close()
+
+
+async def test_cache_batch_operations(mocker):
+    """
+    WORKFLOW
+        1. save many values with a single request
+        2. get them back including a missing key
+        3. delete many values and check deleted keys
+        4. increase the missing counter
+        5. replace the value with ``cas`` once
+    """
+
+    _storage.clear()
+    _tokens.clear()
+    server = await asyncio.start_server(
+        _fake_memcached_storage, "127.0.0.1", 0
+    )
+    _, port = server.sockets[0].getsockname()
+    mocker.patch.multiple(
+        settings.cache, backend="memcached", host="127.0.0.1", port=port
+    )
+    mocker.patch.object(settings.cache.local, "policies", {})
+
+    cache = Cache()
+
+    try:
+        async with cache:
+            assert await cache.set_many(
+                "ns", {"1": {"value": 1}, "2": ["a", "b"], "3": "Bob's"}
+            )
+            results = await cache.get_many("ns", ["1", "2", "3", "4"])
+            deleted = await cache.delete_many("ns", ["1", "2", "4"])
+            left = await cache.get_many("ns", ["1", "2", "3"])
+            counters = [await cache.incr("ns", "counter") for _ in range(3)]
+            counter = await cache.get("ns", "counter")
+
+            _, token = await cache.gets("ns", "3")
+            swapped = await cache.cas("ns", "3", "Alice", token)
+            stale = await cache.cas("ns", "3", "Bob", token)
+            swapped_value = await cache.get("ns", "3")
+    finally:
+        server.close()
+        await server.wait_closed()
+
+    assert results == {"1": {"value": 1}, "2": ["a", "b"], "3": "Bob's"}
+    assert deleted == {"1", "2"}
+    assert left == {"3": "Bob's"}
+    assert counters == [1, 2, 3]
+    assert counter == 3
+    assert (swapped, stale, swapped_value) == (True, False, "Alice")
+
+
+def test_cache_metrics():
+    metrics = CacheMetrics()
+
+    for key in ("a", "a", "b"):
+        metrics.hit("ns", key)
+    metrics.miss("ns", "c")
+    metrics.error("ns")
+    for seconds in (0.0005, 0.0005, 0.003, 2.0):
+        metrics.latency("ns", seconds)
+    metrics.size("ns", 100)
+    metrics.size("ns", 2000)
+
+    (stats,) = metrics.stats()
+
+    assert stats.namespace == "ns"
+    assert stats.hit_ratio == 0.75
+    assert stats.errors == 1
+    assert stats.requests == 4
+    assert stats.latency["0.001"] == 2
+    assert stats.latency["0.005"] == 1
+    assert stats.latency["+Inf"] == 1
+    assert stats.latency_p50 == 0.001
+    assert stats.latency_p99 == float("inf")
+    assert stats.sizes["128"] == 1
+    assert stats.sizes["4096"] == 1
+    assert stats.size_total == 2100
+    assert stats.hot_keys[0] == ("a", 2)
+
+
+async def test_cache_memory_backend(mocker):
+    """
+    WORKFLOW
+        1. use the in-memory backend that is selected for tests
+        2. check ``add``, ``incr`` and ``cas`` semantics match memcached
+        3. check values expire by TTL
+    """
+
+    now = mocker.patch("time.monotonic", return_value=100.0)
+
+    async with Cache() as cache:
+        assert isinstance(cache.backend, MemoryBackend)
+
+        assert await cache.add("ns", "lock", True, ttl=10)
+        assert not await cache.add("ns", "lock", True, ttl=10)
+        assert await cache.incr("ns", "counter", ttl=10) == 1
+        assert await cache.incr("ns", "counter", delta=5) == 6
+        await cache.set("ns", "forever", {"value": 1})
+        _, token = await cache.gets("ns", "forever")
+        await cache.incr("ns", "counter")
+        assert not await cache.cas("ns", "missing", 1, token)
+        assert await cache.cas("ns", "forever", {"value": 2}, token)
+        assert not await cache.cas("ns", "forever", {"value": 3}, token)
+
+        now.return_value = 110.0
+
+        assert await cache.add("ns", "lock", True)
+        assert await cache.incr("ns", "counter") == 1
+        assert await cache.get("ns", "forever") == {"value": 2}
@@ -3,9 +3,12 @@ import random
 import string
 
 import pytest
+from sqlalchemy import func, select
 
 from src import domain
+from src.config import settings
 from src.infrastructure import database, errors
+from src.infrastructure.database.cqs import Query
 
 
 @pytest.mark.use_db
@@ -76,3 +79,61 @@ async def test_database_transactions_rollback():
     john = await domain.users.UserRepository().user_by_id(1)
 
     assert john.name == "john"
+
+
+@pytest.mark.use_db
+async def test_database_query_execute_concurrently_snapshot():
+    """all the statements see the same snapshot of data.
+
+    notes:
+        the user is added while statements are executed, but it is
+        not visible for any of them since the snapshot is exported before.
+    """
+
+    repository = domain.users.UserRepository()
+    statement = select(func.count(database.User.id)).select_from(
+        func.pg_sleep(0.2)
+    )
+
+    async def add_user():
+        await asyncio.sleep(0.1)
+        async with database.transaction():
+            await repository.add_user(candidate=database.User(name="john"))
+
+    results, _ = await asyncio.gather(
+        repository.query.execute_concurrently(*(statement for _ in range(3))),
+        add_user(),
+    )
+
+    assert [result.scalar_one() for result in results] == [0, 0, 0]
+    assert await repository.count(database.User) == 1
+
+
+@pytest.mark.use_db
+async def test_database_query_execute_concurrently_budget(mocker):
+    """
+    WORKFLOW
+        1. run 2 groups of statements that do not fit the budget together
+        2. check the second one is executed by its leader alone
+        3. check all the connections are returned
+    """
+
+    mocker.patch.object(settings.database, "concurrent_connections", 2)
+    execute = mocker.spy(Query, "_execute_in_snapshot")
+    query = domain.users.UserRepository().query
+    statement = select(func.count(database.User.id)).select_from(
+        func.pg_sleep(0.1)
+    )
+
+    results = await asyncio.gather(
+        *(
+            query.execute_concurrently(statement, statement, statement)
+            for _ in range(2)
+        )
+    )
+
+    assert [
+        [result.scalar_one() for result in group] for group in results
+    ] == [[0, 0, 0], [0, 0, 0]]
+    assert execute.call_count == 2
+    assert Query._reserved == 0
@@ -0,0 +1,177 @@
+import asyncio
+import time
+from datetime import date
+
+import httpx
+import pytest
+import respx
+
+from src.config import settings
+from src.infrastructure import errors
+from src.integrations import monobank
+
+TRANSACTION = {
+    "id": "ZuHWzqkKGVo=",
+    "time": 1554466347,
+    "description": "Some name",
+    "amount": -95000,
+    "currencyCode": 980,
+}
+
+
+@pytest.fixture(autouse=True)
+async def _monobank_client(mocker):
+    mocker.patch.multiple(
+        settings.monobank,
+        retry_backoff=0,
+        statement_rate=1000,
+        statement_burst=10,
+    )
+    mocker.patch.object(monobank, "_buckets", {})
+
+    yield
+
+    await monobank.MonobankClient.close()
+
+
+@pytest.fixture
+def client_info(mock_httpx: respx.MockRouter) -> respx.Route:
+    return mock_httpx.get(monobank.PERSONAL_INFO_URL).respond(
+        json={"accounts": [{"id": "acc", "currencyCode": 980}]}
+    )
+
+
+async def test_monobank_client_reused(client_info, mock_httpx, mocker):
+    """
+    WORKFLOW
+        1. get transactions twice
+        2. check the single client is created for all the requests
+        3. check the client is closed by the lifespan
+    """
+
+    statement = mock_httpx.get(
+        url__startswith=f"{monobank.STATEMENTS_URL}/acc/"
+    ).respond(json=[TRANSACTION])
+    new_client = mocker.spy(monobank, "_new_client")
+
+    for _ in range(2):
+        transactions = await monobank.get_transactions(
+            "key", date(2025, 1, 1), date(2025, 1, 2)
+        )
+    client = monobank.MonobankClient.get()
+    await monobank.MonobankClient.close()
+
+    assert [tx.id for tx in transactions] == [TRANSACTION["id"]]
+    assert new_client.call_count == 1
+    assert client_info.call_count == statement.call_count == 2
+    assert statement.calls.last.request.headers["X-Token"] == "key"
+    assert client.is_closed
+
+
+async def test_monobank_retry(client_info, mock_httpx):
+    statement = mock_httpx.get(
+        url__startswith=f"{monobank.STATEMENTS_URL}/acc/"
+    )
+    statement.side_effect = [
+        httpx.Response(503),
+        httpx.Response(429, headers={"Retry-After": "0"}),
+        httpx.Response(200, json=[TRANSACTION]),
+    ]
+
+    transactions = await monobank.get_transactions(
+        "key", date(2025, 1, 1), date(2025, 1, 2)
+    )
+
+    assert len(transactions) == 1
+    assert statement.call_count == 3
+
+
+async def test_monobank_not_available(mock_httpx):
+    client_info = mock_httpx.get(monobank.PERSONAL_INFO_URL).mock(
+        side_effect=httpx.ConnectTimeout
+    )
+
+    with pytest.raises(errors.IntegrationError):
+        await monobank.get_transactions(
+            "key", date(2025, 1, 1), date(2025, 1, 2)
+        )
+
+    assert client_info.call_count == settings.monobank.retries + 1
+
+
+def test_statement_windows():
+    start = 1_700_000_000
+    end = start + 70 * 24 * 60 * 60
+
+    windows = list(monobank.statement_windows(start, end))
+
+    assert len(windows) == 3
+    assert windows[0][0] == start and windows[-1][1] == end
+    assert all(
+        right - left <= monobank.MAX_STATEMENT_PERIOD
+        for left, right in windows
+    )
+    assert all(
+        previous[1] == current[0]
+        for previous, current in zip(windows, windows[1:])
+    )
+
+
+async def test_token_bucket():
+    bucket = monobank.TokenBucket(rate=50, capacity=2)
+
+    started = time.monotonic()
+    for _ in range(4):
+        await bucket.acquire()
+
+    # 2 tokens of the burst and 2 refilled ones
+    assert time.monotonic() - started >= 2 / 50 * 0.9
+
+
+async def test_monobank_statements_concurrent(mock_httpx, mocker):
+    """
+    WORKFLOW
+        1. request 2 accounts for 40 days with the burst of 4 requests
+        2. check all the windows are requested concurrently
+        3. check the full page is requested again before its oldest item
+    """
+
+    mocker.patch.object(settings.monobank, "statement_burst", 4)
+    mocker.patch.object(monobank, "STATEMENT_LIMIT", 2)
+    in_flight = peak = 0
+
+    async def respond(request: httpx.Request, account: str, end: str):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+
+        if account == "first" and int(end) > 10_000:
+            transactions = [
+                {**TRANSACTION, "id": f"{end}-{n}", "time": 10_000 + n}
+                for n in range(2)
+            ]
+        else:
+            transactions = []
+
+        return httpx.Response(200, json=transactions)
+
+    pattern = r"/(?P<account>\w+)/\d+/(?P<end>\d+)"
+    route = mock_httpx.get(
+        url__regex=f"{monobank.STATEMENTS_URL}{pattern}"
+    ).mock(side_effect=respond)
+    start = 0
+    end = 40 * 24 * 60 * 60
+
+    results = [
+        transactions
+        async for _, transactions in monobank.statements(
+            "key", ["first", "second"], start, end
+        )
+    ]
+
+    assert route.call_count == 6
+    assert peak == 4
+    assert len(results) == 4
+    assert sum(len(transactions) for transactions in results) == 4
@@ -0,0 +1,70 @@
+import pytest
+
+from src.infrastructure import Cache, RateLimit, rate_limiter
+from src.infrastructure.rate_limiter import RateLimiter
+
+
+@pytest.fixture
+def clock(mocker):
+    """the time of the rate limiter. seconds since the epoch."""
+
+    return mocker.patch.object(rate_limiter, "time").time
+
+
+async def test_rate_limit_reached(clock):
+    clock.return_value = 600.0
+    rate = RateLimit(limit=3, period=60)
+    limiter = RateLimiter()
+
+    results = [await limiter.hit("login:1.1.1.1", rate) for _ in range(4)]
+
+    assert results == [True, True, True, False]
+    assert await limiter.hit("login:2.2.2.2", rate) is True
+
+
+async def test_rate_limit_sliding_window(clock, mocker):
+    """
+    WORKFLOW
+        1. exhaust the limit in the previous window
+        2. check the half of the previous window is counted
+        3. check the rejected client waits without the cache
+        4. check the client is allowed once the estimation fits the limit
+    """
+
+    rate = RateLimit(limit=5, period=60)
+    limiter = RateLimiter()
+    clock.return_value = 540.0
+    for _ in range(5):
+        await limiter.hit("login:1.1.1.1", rate)
+
+    clock.return_value = 630.0
+    results = [await limiter.hit("login:1.1.1.1", rate) for _ in range(3)]
+    incr = mocker.spy(Cache, "incr")
+    clock.return_value = 647.0
+    blocked = await limiter.hit("login:1.1.1.1", rate)
+    clock.return_value = 648.0
+    allowed = await limiter.hit("login:1.1.1.1", rate)
+
+    assert results == [True, True, False]
+    assert blocked is False
+    assert allowed is True
+    assert incr.call_count == 1
+
+
+async def test_rate_limit_shared_by_workers(clock):
+    clock.return_value = 600.0
+    rate = RateLimit(limit=2, period=60)
+    first, second = RateLimiter(), RateLimiter()
+
+    assert await first.hit("refresh:1.1.1.1", rate) is True
+    assert await second.hit("refresh:1.1.1.1", rate) is True
+    assert await first.hit("refresh:1.1.1.1", rate) is False
+
+
+async def test_rate_limit_cache_unavailable(clock, mocker):
+    clock.return_value = 600.0
+    mocker.patch.object(Cache, "incr", side_effect=ConnectionError)
+
+    assert await RateLimiter().hit(
+        "login:1.1.1.1", RateLimit(limit=1, period=60)
+    )
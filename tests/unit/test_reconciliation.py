@@ -0,0 +1,135 @@
+from datetime import date, datetime
+
+from src.domain.banks import (
+    BankTransaction,
+    CategorySuggestions,
+    LedgerEntry,
+    reconcile,
+)
+
+UAH = 980
+
+
+def _bank(id_: str, day: date, amount: int, name: str = "") -> BankTransaction:
+    return BankTransaction(
+        id=id_,
+        account_id="acc",
+        time=int(datetime.combine(day, datetime.min.time()).timestamp()),
+        amount=amount,
+        currency_code=UAH,
+        description=name,
+    )
+
+
+def _cost(id_: int, day: date, value: int, name: str = "", category=1):
+    return LedgerEntry(
+        id=id_,
+        operation="cost",
+        name=name,
+        value=value,
+        currency_id=1,
+        timestamp=day,
+        category_id=category,
+    )
+
+
+def test_reconcile_tolerance():
+    transactions = [
+        _bank("matched", date(2025, 1, 10), -1000),
+        _bank("late", date(2025, 1, 20), -1000),
+        _bank("income", date(2025, 1, 10), 1000),
+        _bank("unknown currency", date(2025, 1, 10), -1000),
+    ]
+    transactions[-1].currency_code = 840
+
+    missing = reconcile(
+        transactions,
+        [_cost(1, date(2025, 1, 12), 1000), _cost(2, date(2025, 1, 30), 1000)],
+        currencies={UAH: 1},
+        suggestions=CategorySuggestions(),
+    )
+
+    assert [item.id for item in missing] == [
+        "income",
+        "unknown currency",
+        "late",
+    ]
+    assert missing[1].currency_id is None
+
+
+def test_reconcile_matched_once():
+    """the entry of the same value is matched with the closest
+    bank transaction only, others are missing.
+    """
+
+    missing = reconcile(
+        [
+            _bank("first", date(2025, 1, 10), -1000, "Silpo"),
+            _bank("second", date(2025, 1, 11), -1000, "Silpo"),
+        ],
+        [_cost(1, date(2025, 1, 10), 1000, "silpo")],
+        currencies={UAH: 1},
+        suggestions=CategorySuggestions(),
+    )
+
+    assert [item.id for item in missing] == ["second"]
+
+
+def test_reconcile_names_break_ties():
+    """
+    WORKFLOW
+        1. record 2 costs of the same value and date
+        2. check the bank transaction takes the cost with the similar name,
+           so its category is suggested for the next taxi
+    """
+
+    coffee, taxi = 1, 2
+
+    missing = reconcile(
+        [
+            _bank("matched", date(2025, 1, 10), -1000, "Uklon taxi"),
+            _bank("next", date(2025, 1, 20), -700, "Uklon taxi"),
+        ],
+        [
+            _cost(1, date(2025, 1, 10), 1000, "Coffee", category=coffee),
+            _cost(2, date(2025, 1, 10), 1000, "uklon", category=taxi),
+        ],
+        currencies={UAH: 1},
+        suggestions=CategorySuggestions(),
+    )
+
+    assert [(item.id, item.suggested_category_id) for item in missing] == [
+        ("next", taxi)
+    ]
+
+
+def test_reconcile_suggestions():
+    """
+    WORKFLOW
+        1. learn categories from costs history
+        2. match the bank transaction with the 'Food' cost
+        3. check missing costs get categories of similar names
+    """
+
+    food, transport = 1, 2
+    suggestions = CategorySuggestions()
+    suggestions.learn("Bus ticket", transport, weight=3)
+    suggestions.learn("Groceries", food, weight=3)
+
+    missing = reconcile(
+        [
+            _bank("matched", date(2025, 1, 10), -1000, "SILPO Kyiv"),
+            _bank("silpo", date(2025, 1, 15), -2000, "SILPO Lviv"),
+            _bank("bus", date(2025, 1, 15), -800, "Bus ticket"),
+            _bank("unknown", date(2025, 1, 15), -900, "???"),
+        ],
+        [_cost(1, date(2025, 1, 10), 1000, "Groceries", category=food)],
+        currencies={UAH: 1},
+        suggestions=suggestions,
+    )
+
+    assert {item.id: item.suggested_category_id for item in missing} == {
+        "silpo": food,
+        "bus": transport,
+        "unknown": None,
+    }
@@ -0,0 +1,147 @@
+import asyncio
+import threading
+import time
+from collections import OrderedDict
+
+import jwt
+import pytest
+
+from src.config import settings
+from src.infrastructure import security
+
+
+async def test_password_hashing_offloaded(mocker):
+    mocker.patch.object(
+        security, "_hashing_pool", security._PasswordHashingPool()
+    )
+    loop_thread = threading.get_ident()
+    threads: set[int] = set()
+    verify = security.verify_password
+
+    def spy(password: str, password_hash: str) -> bool:
+        threads.add(threading.get_ident())
+        return verify(password, password_hash)
+
+    mocker.patch.object(security, "verify_password", spy)
+
+    password_hash = await security.hash_password_async("secret")
+
+    assert await security.verify_password_async("secret", password_hash)
+    assert not await security.verify_password_async("wrong", password_hash)
+    assert threads and loop_thread not in threads
+
+    stats = security.password_hashing_stats()
+    assert stats.calls == 3
+    assert stats.in_progress == stats.waiting == 0
+
+    security.shutdown_password_hashing()
+
+
+async def test_password_hashing_concurrency(mocker):
+    """
+    WORKFLOW
+        1. allow the single concurrent call for 2 threads
+        2. verify passwords concurrently with the slow hasher
+        3. check calls are not overlapped and the waiting is measured
+    """
+
+    mocker.patch.object(settings.auth, "hashing_workers", 2)
+    mocker.patch.object(settings.auth, "hashing_concurrency", 1)
+    mocker.patch.object(
+        security, "_hashing_pool", security._PasswordHashingPool()
+    )
+    running = 0
+    overlapped = False
+    lock = threading.Lock()
+
+    def slow(password: str, password_hash: str) -> bool:
+        nonlocal running, overlapped
+        with lock:
+            running += 1
+            overlapped = overlapped or running > 1
+        time.sleep(0.02)
+        with lock:
+            running -= 1
+        return True
+
+    mocker.patch.object(security, "verify_password", slow)
+
+    results = await asyncio.gather(
+        *(security.verify_password_async("secret", "hash") for _ in range(4))
+    )
+
+    stats = security.password_hashing_stats()
+    assert results == [True] * 4
+    assert overlapped is False
+    assert stats.calls == 4
+    # the last call has waited for 3 others
+    assert stats.queue_time_max >= 0.06
+
+    security.shutdown_password_hashing()
+
+
+async def test_password_hashing_executor_shut_down(mocker):
+    """the slot is returned if the call can not be scheduled."""
+
+    mocker.patch.object(settings.auth, "hashing_concurrency", 1)
+    pool = security._PasswordHashingPool()
+    executor = pool._get_executor()
+    executor.shutdown()
+
+    with pytest.raises(RuntimeError):
+        await pool.run(security.verify_password, "secret", "hash")
+
+    assert pool.stats().in_progress == 0
+    pool._executor = None
+    assert await pool.run(lambda: True) is True
+
+    pool.shutdown()
+
+
+def test_decode_token_cached(mocker):
+    mocker.patch.object(security, "_claims_cache", OrderedDict())
+    decode = mocker.spy(jwt, "decode")
+    token = security.create_access_token(1)
+
+    first = security.decode_token(token)
+    first["sub"] = "2"
+    second = security.decode_token(token)
+
+    assert decode.call_count == 1
+    assert second["sub"] == "1"
+    assert second["type"] == "access"
+
+    # any other byte means other token that is verified again
+    with pytest.raises(jwt.InvalidTokenError):
+        security.decode_token(token[:-2] + ("A" if token[-2] != "A" else "B"))
+
+
+def test_decode_token_cached_expiration(mocker):
+    mocker.patch.object(security, "_claims_cache", OrderedDict())
+    token = security.create_access_token(1)
+    security.decode_token(token)
+
+    mocker.patch(
+        "time.time",
+        return_value=time.time()
+        + settings.auth.access_token_expire_minutes * 60
+        + 1,
+    )
+
+    with pytest.raises(jwt.ExpiredSignatureError):
+        security.decode_token(token)
+    assert not security._claims_cache
+
+
+def test_decode_token_cache_size(mocker):
+    mocker.patch.object(security, "_claims_cache", OrderedDict())
+    mocker.patch.object(settings.auth, "claims_cache_size", 2)
+    tokens = [security.create_access_token(user_id) for user_id in (1, 2, 3)]
+
+    for token in tokens:
+        security.decode_token(token)
+    security.decode_token(tokens[1])
+
+    assert len(security._claims_cache) == 2
+    # the least recently used is evicted
+    assert list(security._claims_cache.values())[-1]["sub"] == "2"